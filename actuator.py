@@ -0,0 +1,180 @@
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from pipeline import LatestQueue
+
+# -------------------- Constants --------------------
+KEY_STEP_PCT = 2        # OS volume change per volumeup/volumedown press
+DEADBAND_PCT = 5        # ignore target changes this small (matches the old >5% check)
+MIN_INTERVAL_S = 0.03   # minimum time between two OS volume calls
+
+
+# -------------------- Backends --------------------
+class KeyStepBackend:
+    """Relative control through pyautogui "volumeup"/"volumedown" key presses."""
+
+    absolute = False
+
+    def __init__(self, step_pct=KEY_STEP_PCT):
+        import pyautogui
+        self._press = pyautogui.press
+        self.step_pct = step_pct
+
+    def step(self, up):
+        self._press("volumeup" if up else "volumedown")
+
+
+class AbsoluteBackend:
+    """Sets the output volume directly through the platform mixer (pactl/amixer/osascript)."""
+
+    absolute = True
+    step_pct = 1
+
+    def __init__(self, command):
+        self.command = command
+
+    @classmethod
+    def detect(cls):
+        if sys.platform == "darwin" and shutil.which("osascript"):
+            return cls(["osascript", "-e", "set volume output volume {level}"])
+        if shutil.which("pactl"):
+            return cls(["pactl", "set-sink-volume", "@DEFAULT_SINK@", "{level}%"])
+        if shutil.which("amixer"):
+            return cls(["amixer", "-q", "sset", "Master", "{level}%"])
+        return None
+
+    def set_level(self, level):
+        subprocess.run([arg.format(level=level) for arg in self.command], check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class MockBackend:
+    """In-memory backend for tests and benchmarks; records every call instead of touching the OS."""
+
+    def __init__(self, absolute=False, step_pct=KEY_STEP_PCT):
+        self.absolute = absolute
+        self.step_pct = 1 if absolute else step_pct
+        self.calls = []
+
+    def step(self, up):
+        self.calls.append(("volumeup" if up else "volumedown", time.perf_counter()))
+
+    def set_level(self, level):
+        self.calls.append(("set", level, time.perf_counter()))
+
+
+def default_backend(prefer_absolute=False):
+    if prefer_absolute:
+        backend = AbsoluteBackend.detect()
+        if backend is not None:
+            return backend
+    return KeyStepBackend()
+
+
+# -------------------- Coalescing Actuator --------------------
+class VolumeActuator:
+    """
+    Moves the OS volume toward the latest requested target on its own thread.
+
+    set_target() never blocks: targets land in a size-1 drop-oldest queue, so a burst of
+    hand movement collapses into one move toward the newest value. Output is rate-limited
+    to one OS call per `min_interval` seconds, and a newer target interrupts a multi-step move.
+    With `metrics` (a LatencyTracker), every backend call is timed as the "actuation_os" stage,
+    on the thread that makes it; the engine's "actuation" stage only covers set_target().
+    """
+
+    def __init__(self, backend, deadband=DEADBAND_PCT, min_interval=MIN_INTERVAL_S, metrics=None):
+        self.backend = backend
+        self.deadband = deadband
+        self.min_interval = min_interval
+        self.metrics = metrics
+        self.level = None
+        self.target = None
+        self.os_calls = 0
+        self._commands = LatestQueue("actuator", 1)
+        self._stop = threading.Event()
+        self._last_call = 0.0
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="actuator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._commands.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def set_target(self, level):
+        self._commands.put(int(level))
+
+    def drive(self, level):
+        """Moves to `level` on the caller's thread, without queueing or coalescing. Deterministic; for benchmarks."""
+        self._move_to(int(level))
+
+    def cancel(self):
+        """Drops a target that was queued but not started yet."""
+        self._commands.clear()
+
+    def reset(self):
+        self.level = None
+        self.target = None
+
+    def stats(self):
+        return {"targets": self._commands.put_count, "coalesced": self._commands.dropped,
+                "os_calls": self.os_calls, "level": self.level}
+
+    def _run(self):
+        while not self._stop.is_set():
+            target = self._commands.get(timeout=0.5)
+            if target is None:
+                continue
+            self._move_to(target)
+
+    def _move_to(self, target):
+        self.target = target
+        if self.level is None:
+            # First reading only sets the baseline, like the old prev_level logic
+            self.level = target
+            return
+        if abs(target - self.level) <= self.deadband:
+            return
+
+        if self.backend.absolute:
+            self._call(self.backend.set_level, target)
+            self.level = target
+            return
+
+        step = self.backend.step_pct
+        while abs(target - self.level) >= step and not self._stop.is_set():
+            newer = self._commands.get(timeout=0)
+            if newer is not None:
+                self.target = target = newer
+                continue
+            up = target > self.level
+            self._call(self.backend.step, up)
+            self.level += step if up else -step
+
+    def _call(self, fn, arg):
+        self._wait_turn()
+        t0 = time.perf_counter()
+        fn(arg)
+        t1 = time.perf_counter()
+        self.os_calls += 1
+        if self.metrics is not None:
+            self.metrics.record("actuation_os", (t1 - t0) * 1000.0, t1)
+
+    def _wait_turn(self):
+        delay = self._last_call + self.min_interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._last_call = time.perf_counter()
@@ -0,0 +1,45 @@
+"""
+Engine settings for the dashboard (milestone4.py). They live here rather than in the page so
+frontpage.py can pre-warm an identical engine without importing the page.
+"""
+
+# -------------------- Engine Settings --------------------
+CAPTURE_WIDTH = 640      # requested camera mode; `python capture.py probe 0` finds the best one
+CAPTURE_HEIGHT = 480
+CAPTURE_FPS = 30
+CAPTURE_FOURCC = "MJPG"  # "MJPG" or "YUYV"
+CAPTURE_BUFFER_SIZE = 1  # driver-side frame queue; 1 = freshest frame, least latency
+MAX_NUM_HANDS = 2
+LATENCY_SLO_MS = 33.0    # per-frame budget (30 FPS); the governor trades model size/input scale to hold it
+CONTROL_POLICY = "first"  # which hand drives the volume: "first", "right", "left" or "largest"
+INFERENCE_MODE = "full"  # "full" = whole frame every time, "roi" = crop around the last hand
+INFERENCE_SCALE = 1.0    # < 1.0 downscales full-frame detection passes
+DETECT_MAX_INTERVAL = 4  # run MediaPipe at least every N frames, optical flow in between
+FRAME_BUDGET_MS = 25.0   # detection interval adapts to keep average processing under this (only without an SLO)
+SMOOTHING_FILTER = "one_euro"  # "one_euro", "kalman" or "none"
+VOLUME_BAND = 5          # % hysteresis before a new volume level is committed
+GESTURE_BAND = 5.0       # px hysteresis around the Pinch/Open/Closed cut-offs
+GESTURE_MODEL_PATH = "gesture_model.npz"  # from gesture_train.py; distance cut-offs if missing
+OVERLAY_LEVEL = "full"   # "none", "fingertips" or "full" skeleton on the preview
+TRACE_PATH = None        # directory to record a landmark trace into (replay with landmark_trace.py)
+
+ENGINE_CONFIG = {
+    "capture_width": CAPTURE_WIDTH,
+    "capture_height": CAPTURE_HEIGHT,
+    "capture_fps": CAPTURE_FPS,
+    "capture_fourcc": CAPTURE_FOURCC,
+    "capture_buffer_size": CAPTURE_BUFFER_SIZE,
+    "max_num_hands": MAX_NUM_HANDS,
+    "latency_slo_ms": LATENCY_SLO_MS,
+    "control_policy": CONTROL_POLICY,
+    "inference_mode": INFERENCE_MODE,
+    "inference_scale": INFERENCE_SCALE,
+    "detect_max_interval": DETECT_MAX_INTERVAL,
+    "frame_budget_ms": FRAME_BUDGET_MS,
+    "smoothing_filter": SMOOTHING_FILTER,
+    "volume_band": VOLUME_BAND,
+    "gesture_band": GESTURE_BAND,
+    "gesture_model": GESTURE_MODEL_PATH,
+    "trace_path": TRACE_PATH,
+    "overlay_level": OVERLAY_LEVEL,
+}
@@ -0,0 +1,225 @@
+"""
+Offline batch analysis of recorded session video.
+
+Splits a video (or image directory) into segments, runs the detection -> hand tracking ->
+distance -> volume/gesture logic on each segment in its own worker process (own Hands instance),
+and merges the per-frame results, in frame order, into one table (.csv or .npz).
+
+Each segment starts `--overlap` frames early; those warm-up frames prime MediaPipe's tracking,
+the hand tracker and the smoothing filters and are then dropped, so results at segment
+boundaries match a sequential pass once the filters have settled.
+
+    python batch_analysis.py session.mp4 --workers 8 --output session.csv
+    python batch_analysis.py session.mp4 --pinch-range 20 60 --smoothing kalman --output tuned.npz
+"""
+import argparse
+import multiprocessing as mp_proc
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from capture import ImageSequence
+from gesture_core import GESTURES, PINCH_RANGE
+from hand_tracker import CONTROL_POLICIES
+from smoothing import SMOOTHING_FILTERS
+
+# -------------------- Constants --------------------
+DEFAULT_OVERLAP = 30          # warm-up frames before each segment (~1 s at 30 FPS)
+SEGMENTS_PER_WORKER = 4       # more, smaller segments balance uneven decode/inference cost
+MIN_SEGMENT_FRAMES = 300
+COLUMNS = ("frame", "t", "hands", "hand_id", "raw_distance", "distance", "volume", "gesture")
+
+
+# -------------------- Segmenting --------------------
+def count_frames(path):
+    if os.path.isdir(path):
+        return len(ImageSequence(path).paths), None
+    cap = cv2.VideoCapture(path)
+    n, fps = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS) or None
+    cap.release()
+    return n, fps
+
+
+def plan_segments(n_frames, workers, overlap=DEFAULT_OVERLAP, per_worker=SEGMENTS_PER_WORKER,
+                  min_frames=MIN_SEGMENT_FRAMES):
+    """[(warm_start, start, end)] covering 0..n_frames; each segment decodes from warm_start."""
+    count = max(1, min(workers * per_worker, n_frames // min_frames or 1))
+    edges = np.linspace(0, n_frames, count + 1).astype(int)
+    return [(max(0, int(a) - overlap), int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def _open_at(path, frame):
+    if os.path.isdir(path):
+        source = ImageSequence(path)
+        source.position = frame
+        return source
+    cap = cv2.VideoCapture(path)
+    if frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        # Some containers seek to the nearest keyframe only; decode forward from the start instead
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            for _ in range(frame):
+                if not cap.grab():
+                    break
+    return cap
+
+
+# -------------------- Worker Process --------------------
+def analyze_segment(job):
+    """Processes frames warm_start..end of one source; returns result columns for start..end only."""
+    path, (warm_start, start, end), settings = job
+    import mediapipe as mp
+    from gesture_core import hand_metrics, handedness_arrays, landmarks_to_array
+    from hand_tracker import HandTracker
+    from smoothing import DistanceSmoother, make_filter
+
+    hands = mp.solutions.hands.Hands(
+        model_complexity=settings["model_complexity"],
+        max_num_hands=settings["max_num_hands"],
+        min_detection_confidence=settings["min_detection_confidence"],
+        min_tracking_confidence=settings["min_tracking_confidence"],
+    )
+    pinch_range = settings["pinch_range"]
+    tracker = HandTracker(lambda: DistanceSmoother(make_filter(settings["smoothing"]), pinch_range=pinch_range),
+                          policy=settings["policy"])
+    classifier = None
+    if settings["gesture_model"]:
+        from gesture_classifier import MIN_CONFIDENCE, GestureClassifier
+        classifier = GestureClassifier.load(settings["gesture_model"])
+
+    n = end - start
+    out = {name: np.full(n, -1, dtype=np.float64 if name in ("t", "raw_distance", "distance") else np.int32)
+           for name in COLUMNS}
+    out["frame"][:] = np.arange(start, end)
+    frame_dt = 1.0 / settings["fps"]
+    source = _open_at(path, warm_start)
+    try:
+        for index in range(warm_start, end):
+            ok, frame = source.read()
+            if not ok:
+                break
+            if settings["flip"]:
+                frame = cv2.flip(frame, 1)
+            h, w = frame.shape[:2]
+            result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            landmarks = landmarks_to_array(result.multi_hand_landmarks)
+            hm = hand_metrics(landmarks, w, h, pinch_range)
+            tracks = tracker.update(landmarks, handedness_arrays(result)[0])
+            t = index * frame_dt  # video time, so filters see the recorded frame rate
+            if classifier is not None and len(landmarks):
+                codes, confidence = classifier.predict(landmarks)
+                for track, code, conf in zip(tracks, codes, confidence):
+                    track.classify(code, conf, MIN_CONFIDENCE)
+            for track, raw in zip(tracks, hm.distance):
+                track.update(raw, t)
+            if index < start:
+                continue  # warm-up overlap: state only, no output
+
+            row = index - start
+            out["t"][row] = t
+            out["hands"][row] = len(tracks)
+            control = tracker.controller
+            if control is not None:
+                out["hand_id"][row] = control.id
+                out["raw_distance"][row] = hm.distance[tracks.index(control)]
+                out["distance"][row] = control.distance
+                out["volume"][row] = control.volume
+                out["gesture"][row] = control.classified if classifier is not None else control.gesture
+    finally:
+        source.release()
+        hands.close()
+    return start, out
+
+
+# -------------------- Merge / Output --------------------
+def merge(parts):
+    """
+    Concatenates segment tables in frame order. Tracker IDs restart at 0 in every segment, so
+    each segment's IDs are shifted past the largest ID merged so far to keep them unique.
+    """
+    parts = sorted(parts, key=lambda p: p[0])
+    table = {name: np.concatenate([p[1][name] for p in parts]) for name in COLUMNS}
+    offset = 0
+    for ids in np.split(table["hand_id"], np.cumsum([len(p[1]["hand_id"]) for p in parts])[:-1]):
+        known = ids >= 0
+        if known.any():
+            ids[known] += offset  # a view into the merged column
+            offset = int(ids[known].max()) + 1
+    return table
+
+
+def write_table(table, path):
+    if path.endswith(".npz"):
+        np.savez_compressed(path, gestures=np.array(GESTURES), **table)
+        return
+    data = np.column_stack([table[name] for name in COLUMNS])
+    fmt = ["%d", "%.4f", "%d", "%d", "%.2f", "%.2f", "%d", "%d"]
+    np.savetxt(path, data, fmt=fmt, delimiter=",", header=",".join(COLUMNS), comments="")
+
+
+def run_batch(path, workers=None, overlap=DEFAULT_OVERLAP, **settings):
+    n_frames, fps = count_frames(path)
+    if n_frames <= 0:
+        raise SystemExit(f"cannot determine the frame count of {path!r}")
+    settings["fps"] = settings.get("fps") or fps or 30.0
+    workers = workers or os.cpu_count() or 1
+    segments = plan_segments(n_frames, workers, overlap)
+    jobs = [(path, segment, settings) for segment in segments]
+
+    t0 = time.perf_counter()
+    ctx = mp_proc.get_context("spawn")
+    with ctx.Pool(min(workers, len(jobs))) as pool:
+        # imap keeps segment order, so results arrive ready to merge
+        parts = list(pool.imap(analyze_segment, jobs))
+    elapsed = time.perf_counter() - t0
+    table = merge(parts)
+    return table, {"frames": n_frames, "segments": len(segments), "workers": min(workers, len(jobs)),
+                   "elapsed_s": elapsed, "frames_per_s": n_frames / elapsed if elapsed > 0 else 0.0,
+                   "video_fps": settings["fps"]}
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-analyse recorded gesture video across worker processes")
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="warm-up frames before each segment")
+    parser.add_argument("--fps", type=float, default=None, help="frame rate for image directories / broken headers")
+    parser.add_argument("--no-flip", action="store_true", help="skip the mirror flip done for webcams")
+    parser.add_argument("--model-complexity", type=int, default=1, choices=(0, 1))
+    parser.add_argument("--max-num-hands", type=int, default=2)
+    parser.add_argument("--min-detection-confidence", type=float, default=0.7)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.7)
+    parser.add_argument("--pinch-range", type=int, nargs=2, default=PINCH_RANGE, metavar=("LOW", "HIGH"))
+    parser.add_argument("--smoothing", default="one_euro", choices=SMOOTHING_FILTERS)
+    parser.add_argument("--policy", default="first", choices=CONTROL_POLICIES, help="which hand drives the volume")
+    parser.add_argument("--gesture-model", default=None, help="classify gestures with this gesture_train.py model")
+    parser.add_argument("--output", default="batch_results.csv", help=".csv or .npz table")
+    args = parser.parse_args(argv)
+
+    table, report = run_batch(
+        args.source, args.workers, args.overlap,
+        fps=args.fps, flip=not args.no_flip, model_complexity=args.model_complexity,
+        max_num_hands=args.max_num_hands, min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence, pinch_range=tuple(args.pinch_range),
+        smoothing=args.smoothing, policy=args.policy, gesture_model=args.gesture_model,
+    )
+    write_table(table, args.output)
+
+    realtime = report["frames_per_s"] / report["video_fps"]
+    print(f"{report['frames']} frames in {report['segments']} segments on {report['workers']} workers: "
+          f"{report['elapsed_s']:.1f}s, {report['frames_per_s']:.0f} frames/s ({realtime:.1f}x real time)")
+    with_hand = table["gesture"] >= 0
+    print(f"Frames with a controlling hand: {int(with_hand.sum())}")
+    for code, name in enumerate(GESTURES):
+        print(f"  {name:<12} {int((table['gesture'] == code).sum())}")
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
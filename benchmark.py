@@ -0,0 +1,234 @@
+"""
+Headless replay benchmark for the gesture volume pipeline.
+
+Feeds a recorded video file (or a directory of frames) through GestureEngine.process_frame,
+the same detection -> distance -> volume mapping -> gesture path the dashboard runs, without
+Streamlit and without pressing any volume keys. Peak memory is measured in a second, untimed
+pass, so tracemalloc never slows the timed one.
+
+    python benchmark.py recording.mp4 --output results.json
+    python benchmark.py frames_dir/ --max-frames 500 --label laptop-i5
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from actuator import MockBackend
+from capture import open_capture
+from gesture_core import GESTURES, PINCH_RANGE
+from perf_metrics import LatencyTracker
+from roi_inference import INFERENCE_MODES
+from smoothing import SMOOTHING_FILTERS
+
+
+# -------------------- Benchmark --------------------
+def build_engine(backend, **config):
+    """
+    The GestureEngine the pages use, so every measured frame goes through the same
+    GestureEngine.process_frame. Actuation runs inline ("sync"), so the volume keys are
+    deterministic and comparable across commits; no camera or threads are started.
+    """
+    from engine import GestureEngine
+    return GestureEngine(backend=backend, actuation="sync", overlay_level="none", trace_path=None, **config)
+
+
+def run_benchmark(source, engine, max_frames=None, warmup=10):
+    """Timed pass: capture + engine.process_frame per frame, with per-stage timings from the engine."""
+    metrics = engine.metrics = engine.actuator.metrics = LatencyTracker(window=None)
+    gesture_counts = dict.fromkeys(GESTURES + ("None",), 0)
+    frames = 0
+    frames_with_hands = 0
+
+    start = time.perf_counter() if warmup == 0 else None
+    while max_frames is None or frames < max_frames + warmup:
+        t0 = time.perf_counter()
+        ret, frame = source.read()
+        t1 = time.perf_counter()
+        if not ret:
+            break
+        out = engine.process_frame(frame)
+        engine.release_output(out)
+        t2 = time.perf_counter()
+
+        frames += 1
+        if frames == warmup:
+            # Discard warm-up frames (model lazy init, first-frame allocation)
+            metrics = engine.metrics = engine.actuator.metrics = LatencyTracker(window=None)
+            start = time.perf_counter()
+        if frames <= warmup:
+            continue
+
+        gesture = out["gesture"] or "None"
+        frames_with_hands += gesture != "None"
+        gesture_counts[gesture] += 1
+        metrics.record("capture", (t1 - t0) * 1000.0)
+        metrics.record("frame", (t2 - t1) * 1000.0)
+        metrics.frame_done()
+
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+    key_counts = {"volumeup": 0, "volumedown": 0, "set": 0}
+    for call in engine.actuator.backend.calls:
+        key_counts[call[0]] += 1
+
+    measured = max(frames - warmup, 0)
+    summary = metrics.summary()
+    return {
+        "frames": measured,
+        "warmup_frames": min(frames, warmup),
+        "elapsed_s": elapsed,
+        "throughput_fps": measured / elapsed if elapsed > 0 else 0.0,
+        "stages": summary["stages"],
+        "frames_with_hands": frames_with_hands,
+        "gestures": gesture_counts,
+        "volume_keys": key_counts,
+        "actuator": engine.actuator.stats(),
+        "smoothing": {"filter": engine.config["smoothing_filter"], "suppressed": engine.tracker.suppressed},
+        "tracking": engine.tracker.stats(),
+    }
+
+
+def measure_memory(source, engine, max_frames=None, warmup=10):
+    """Separate untimed pass under tracemalloc, so its overhead never reaches the latency numbers."""
+    frames = 0
+    tracemalloc.start()
+    try:
+        while max_frames is None or frames < max_frames + warmup:
+            ret, frame = source.read()
+            if not ret:
+                break
+            engine.release_output(engine.process_frame(frame))
+            frames += 1
+            if frames == warmup:
+                tracemalloc.reset_peak()
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_traced / 1e6
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# -------------------- CLI --------------------
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless replay benchmark for gesture volume control")
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--max-frames", type=int, default=None, help="stop after N measured frames")
+    parser.add_argument("--warmup", type=int, default=10, help="frames excluded from measurements")
+    parser.add_argument("--no-flip", action="store_true", help="skip the mirror flip done for webcams")
+    parser.add_argument("--max-num-hands", type=int, default=2)
+    parser.add_argument("--model-complexity", type=int, default=1, choices=(0, 1))
+    parser.add_argument("--min-detection-confidence", type=float, default=0.7)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.7)
+    parser.add_argument("--inference-mode", default="full", choices=INFERENCE_MODES)
+    parser.add_argument("--inference-scale", type=float, default=1.0, help="downscale factor for full-frame passes")
+    parser.add_argument("--detect-interval", type=int, default=1, help="run MediaPipe every N frames, optical flow between")
+    parser.add_argument("--frame-budget-ms", type=float, default=None, help="adapt the detect interval to this budget")
+    parser.add_argument("--latency-slo-ms", type=float, default=None, help="let the governor hold this per-frame time")
+    parser.add_argument("--smoothing", default="one_euro", choices=SMOOTHING_FILTERS)
+    parser.add_argument("--gesture-model", default=None, help="classify gestures with this gesture_train.py model")
+    parser.add_argument("--pinch-range", type=int, nargs=2, default=PINCH_RANGE, metavar=("LOW", "HIGH"))
+    parser.add_argument("--label", default=None, help="free-form tag stored with the results")
+    parser.add_argument("--output", default=None, help="write JSON results to this file")
+    parser.add_argument("--no-memory-pass", action="store_true", help="skip the separate tracemalloc pass")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source = open_capture(args.source)
+    if not source.isOpened():
+        sys.exit(f"Cannot open source: {args.source}")
+
+    config = {
+        "source": args.source,
+        "max_num_hands": args.max_num_hands,
+        "model_complexity": args.model_complexity,
+        "min_detection_confidence": args.min_detection_confidence,
+        "min_tracking_confidence": args.min_tracking_confidence,
+        "pinch_range": list(args.pinch_range),
+        "inference_mode": args.inference_mode,
+        "inference_scale": args.inference_scale,
+        "detect_interval": args.detect_interval,
+        "frame_budget_ms": args.frame_budget_ms,
+        "latency_slo_ms": args.latency_slo_ms,
+        "flip": not args.no_flip,
+        "warmup": args.warmup,
+        "smoothing": args.smoothing,
+        "gesture_model": args.gesture_model,
+    }
+    engine = build_engine(
+        MockBackend(),
+        flip=not args.no_flip,
+        max_num_hands=args.max_num_hands,
+        model_complexity=args.model_complexity,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        pinch_range=tuple(args.pinch_range),
+        inference_mode=args.inference_mode,
+        inference_scale=args.inference_scale,
+        detect_interval=args.detect_interval,
+        detect_max_interval=max(args.detect_interval, 8),
+        frame_budget_ms=args.frame_budget_ms,
+        latency_slo_ms=args.latency_slo_ms,
+        smoothing_filter=args.smoothing,
+        gesture_model=args.gesture_model,
+    )
+    try:
+        results = run_benchmark(source, engine, args.max_frames, args.warmup)
+        results["inference"] = dict(engine.detector.stats(), roi=engine.detector.detector.stats())
+        peak_traced = None
+        if not args.no_memory_pass:
+            source.release()
+            source = open_capture(args.source)
+            engine.tracker.reset()
+            peak_traced = measure_memory(source, engine, args.max_frames, args.warmup)
+        results["memory"] = {"peak_python_alloc_mb": peak_traced, "peak_rss_mb": _peak_rss_mb()}
+    finally:
+        engine.close()
+        source.release()
+
+    report = {
+        "label": args.label,
+        "commit": _git_commit(),
+        "timestamp": time.time(),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "config": config,
+        "results": results,
+    }
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def print_report(report):
+    r = report["results"]
+    print(f"Frames: {r['frames']} in {r['elapsed_s']:.2f}s -> {r['throughput_fps']:.1f} FPS")
+    for stage, s in r["stages"].items():
+        print(f"  {stage:<11} p50 {s['p50_ms']:7.2f} ms  p95 {s['p95_ms']:7.2f} ms  p99 {s['p99_ms']:7.2f} ms")
+    peak = r["memory"]["peak_python_alloc_mb"]
+    print(f"Peak memory: {'--' if peak is None else f'{peak:.1f}'} MB (Python), {r['memory']['peak_rss_mb']:.1f} MB (RSS)")
+    print(f"Gestures: {r['gestures']}  Volume keys: {r['volume_keys']}")
+
+
+if __name__ == "__main__":
+    main()
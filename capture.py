@@ -0,0 +1,223 @@
+"""
+Capture layer: cameras, video files and image directories behind one read()/release() interface.
+
+Cameras are opened with an explicit mode (fourcc, resolution, FPS, driver buffer depth) instead
+of driver defaults, and info() reports what the driver actually granted.
+
+    python capture.py info 0 --width 1280 --height 720 --fourcc MJPG
+    python capture.py probe 0 --target-fps 30 --output camera_mode.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+
+# -------------------- Constants --------------------
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+DEFAULT_MODE = {
+    "width": 640,
+    "height": 480,
+    "fps": 30,
+    "fourcc": "MJPG",    # compressed over USB: higher FPS at a given resolution than raw YUYV
+    "buffer_size": 1,    # driver-side queue depth; 1 = always the freshest frame
+}
+PROBE_RESOLUTIONS = ((320, 240), (640, 480), (960, 540), (1280, 720))
+PROBE_FOURCCS = ("MJPG", "YUYV")
+PROBE_FRAMES = 60
+PROBE_WARMUP = 10
+
+
+def fourcc_to_str(code):
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00") or None
+
+
+# -------------------- Sources --------------------
+class ImageSequence:
+    """cv2.VideoCapture-like reader over a directory of image files (sorted by name)."""
+
+    def __init__(self, directory):
+        self.paths = sorted(
+            p for p in glob.glob(os.path.join(directory, "*")) if p.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.position = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self, image=None):
+        # imread always decodes into a new array; `image` is accepted for VideoCapture compatibility
+        if self.position >= len(self.paths):
+            return False, None
+        frame = cv2.imread(self.paths[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+    def release(self):
+        self.paths = []
+
+
+class Capture:
+    """
+    Wraps a cv2.VideoCapture (camera or file) or an ImageSequence. Camera modes are negotiated on
+    open: fourcc first (V4L2 only honours it before the size), then size, FPS and buffer depth.
+    """
+
+    def __init__(self, source, width=None, height=None, fps=None, fourcc=None, buffer_size=None):
+        self.source = source
+        self.kind = _source_kind(source)
+        self.requested = {"width": width, "height": height, "fps": fps, "fourcc": fourcc, "buffer_size": buffer_size}
+        if self.kind == "images":
+            self.cap = ImageSequence(source)
+        elif self.kind == "camera":
+            self.cap = cv2.VideoCapture(int(source))
+            self._negotiate()
+        else:
+            self.cap = cv2.VideoCapture(source)
+
+    def _negotiate(self):
+        r = self.requested
+        if r["fourcc"]:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*r["fourcc"]))
+        if r["width"]:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, r["width"])
+        if r["height"]:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, r["height"])
+        if r["fps"]:
+            self.cap.set(cv2.CAP_PROP_FPS, r["fps"])
+        if r["buffer_size"]:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, r["buffer_size"])
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        """Like cv2.VideoCapture.read; pass a preallocated `image` of the frame's shape to decode into it."""
+        return self.cap.read(image)
+
+    def release(self):
+        self.cap.release()
+
+    def info(self):
+        """What the source actually delivers (drivers silently fall back to modes they support)."""
+        report = {"source": str(self.source), "kind": self.kind, "requested": self.requested}
+        if self.kind == "images":
+            return dict(report, frames=len(self.cap.paths))
+        cap = self.cap
+        report.update(
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=cap.get(cv2.CAP_PROP_FPS),
+            fourcc=fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            buffer_size=int(cap.get(cv2.CAP_PROP_BUFFERSIZE)) or None,  # 0 = backend cannot report it
+            backend=cap.getBackendName() if cap.isOpened() else None,
+        )
+        return report
+
+
+def _source_kind(source):
+    if isinstance(source, int) or str(source).isdigit():
+        return "camera"
+    return "images" if os.path.isdir(source) else "file"
+
+
+def open_capture(source, width=DEFAULT_MODE["width"], height=DEFAULT_MODE["height"], fps=DEFAULT_MODE["fps"],
+                 fourcc=DEFAULT_MODE["fourcc"], buffer_size=DEFAULT_MODE["buffer_size"]):
+    """Camera index (int or digit string), video file or image directory -> Capture. Pass None to keep a driver default."""
+    return Capture(source, width, height, fps, fourcc, buffer_size)
+
+
+# -------------------- Probe --------------------
+def measure_mode(index, width, height, fps, fourcc, buffer_size=1, frames=PROBE_FRAMES, warmup=PROBE_WARMUP):
+    """
+    Opens the camera in one mode and reads `frames` frames. Estimated latency is the mean time
+    blocked in read() (grab + decode) plus the frames that can sit in the driver buffer.
+    """
+    cap = open_capture(index, width, height, fps, fourcc, buffer_size)
+    try:
+        info = cap.info()
+        if not cap.isOpened():
+            return dict(info, ok=False)
+        for _ in range(warmup):
+            cap.read()
+        read_ms = []
+        t_start = time.perf_counter()
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            ok, _ = cap.read()
+            if not ok:
+                return dict(info, ok=False)
+            read_ms.append((time.perf_counter() - t0) * 1000.0)
+        elapsed = time.perf_counter() - t_start
+    finally:
+        cap.release()
+    achieved_fps = frames / elapsed if elapsed > 0 else 0.0
+    interval_ms = 1000.0 / achieved_fps if achieved_fps else float("inf")
+    mean_read = sum(read_ms) / len(read_ms)
+    return dict(info, ok=True, achieved_fps=achieved_fps, read_ms=mean_read,
+                latency_ms=mean_read + (info["buffer_size"] or buffer_size) * interval_ms)
+
+
+def probe(index, target_fps=30, resolutions=PROBE_RESOLUTIONS, fourccs=PROBE_FOURCCS, frames=PROBE_FRAMES):
+    """Measures every (fourcc, resolution) mode; returns (results, best) where best is the lowest-latency mode reaching target_fps."""
+    results = []
+    for fourcc in fourccs:
+        for width, height in resolutions:
+            r = measure_mode(index, width, height, target_fps, fourcc, frames=frames)
+            # Drivers substitute modes they do not support; skip duplicates of a mode already measured
+            if r["ok"] and any(p["ok"] and (p["width"], p["height"], p["fourcc"]) == (r["width"], r["height"], r["fourcc"])
+                               for p in results):
+                continue
+            results.append(r)
+    eligible = [r for r in results if r["ok"] and r["achieved_fps"] >= 0.95 * target_fps]
+    best = min(eligible, key=lambda r: r["latency_ms"]) if eligible else None
+    return results, best
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and probe capture sources")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info = sub.add_parser("info", help="open a source and report the negotiated mode")
+    info.add_argument("source", help="camera index, video file or image directory")
+    for key, value in DEFAULT_MODE.items():
+        info.add_argument("--" + key.replace("_", "-"), type=type(value), default=value)
+
+    pr = sub.add_parser("probe", help="benchmark camera modes and pick the lowest-latency one")
+    pr.add_argument("index", type=int)
+    pr.add_argument("--target-fps", type=float, default=30)
+    pr.add_argument("--frames", type=int, default=PROBE_FRAMES)
+    pr.add_argument("--output", default=None, help="write the chosen mode and all measurements here")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        cap = open_capture(args.source, args.width, args.height, args.fps, args.fourcc, args.buffer_size)
+        print(json.dumps(cap.info(), indent=2))
+        ok = cap.isOpened()
+        cap.release()
+        return 0 if ok else 1
+
+    results, best = probe(args.index, args.target_fps, frames=args.frames)
+    print(f"{'fourcc':<6} {'size':>10} {'fps':>6} {'read':>7} {'latency':>8}")
+    for r in results:
+        if not r["ok"]:
+            print(f"{r['requested']['fourcc']:<6} {r['requested']['width']:>4}x{r['requested']['height']:<5} failed")
+            continue
+        mark = "  <- best" if r is best else ""
+        print(f"{r['fourcc'] or '?':<6} {r['width']:>4}x{r['height']:<5} {r['achieved_fps']:6.1f} "
+              f"{r['read_ms']:6.1f}ms {r['latency_ms']:7.1f}ms{mark}")
+    if best is None:
+        print(f"No mode reached {args.target_fps} FPS")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"target_fps": args.target_fps, "best": best, "modes": results}, f, indent=2)
+    return 0 if best else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+import os
+import threading
+import time
+
+import mediapipe as mp
+import numpy as np
+
+from actuator import MIN_INTERVAL_S, VolumeActuator, default_backend
+from capture import DEFAULT_MODE, open_capture
+from flow_tracking import FlowTrackedHands
+from frame_pool import Preprocessor
+from gesture_classifier import DEFAULT_MODEL_PATH, MIN_CONFIDENCE, GestureClassifier
+from gesture_core import GESTURES, PINCH_RANGE, gesture_flags, hand_metrics, handedness_arrays, landmarks_to_array
+from governor import LatencyGovernor
+from hand_tracker import HandTracker
+from landmark_trace import TraceWriter
+from overlay import OverlayStyle, draw_overlay, to_rgb
+from perf_metrics import LatencyTracker
+from pipeline import FramePipeline
+from profiler import PROFILE_DIR, FrameProfiler, ProfiledHands, arm_from_env
+from roi_inference import ROI_MIN_SIZE, RoiHands
+from smoothing import DistanceSmoother, make_filter
+
+# -------------------- Default Configuration --------------------
+DEFAULT_CONFIG = {
+    "camera_index": 0,           # camera index, video file or image directory
+    "capture_width": DEFAULT_MODE["width"],    # requested camera mode (None = driver default);
+    "capture_height": DEFAULT_MODE["height"],  # `python capture.py probe 0` finds the best one
+    "capture_fps": DEFAULT_MODE["fps"],
+    "capture_fourcc": DEFAULT_MODE["fourcc"],
+    "capture_buffer_size": DEFAULT_MODE["buffer_size"],
+    "flip": True,                # mirror frames like a webcam preview
+    "min_detection_confidence": 0.7,
+    "min_tracking_confidence": 0.7,
+    "max_num_hands": 2,
+    "model_complexity": 1,
+    "latency_slo_ms": None,      # per-frame time target; set to let the governor trade quality for speed (owns the budget)
+    "control_policy": "first",   # which hand drives the volume: "first", "right", "left" or "largest"
+    "inference_mode": "full",    # "full" = whole frame every time, "roi" = crop around the last hand
+    "inference_scale": 1.0,      # < 1.0 downscales full-frame detection passes
+    "detect_interval": 1,        # initial MediaPipe interval; adapted by frame_budget_ms, or set by the governor
+    "detect_max_interval": 4,    # run MediaPipe at least every N frames, optical flow in between
+    "frame_budget_ms": 25.0,     # detection interval adapts to keep average processing under this (ignored with an SLO)
+    "pinch_range": PINCH_RANGE,  # px cut-offs between Closed/Pinch/Open
+    "smoothing_filter": "one_euro",
+    "volume_band": 5,            # % hysteresis before a new volume level is committed
+    "gesture_band": 5.0,         # px hysteresis around the Pinch/Open/Closed cut-offs
+    "actuation": "thread",       # "thread" = coalescing actuator thread, "sync" = inline, no rate limit (benchmarks)
+    "overlay_level": "full",     # "none", "fingertips" or "full" skeleton on the preview frame
+    "gesture_model": DEFAULT_MODEL_PATH,  # trained landmark classifier; distance cut-offs if missing
+    "gesture_min_confidence": MIN_CONFIDENCE,  # classifier must be this sure to switch gesture
+    "trace_path": None,          # directory to record a landmark trace into (see landmark_trace.py)
+    "profile_dir": PROFILE_DIR,  # where on-demand Chrome-trace profiles are written (see profiler.py)
+}
+
+WARMUP_FRAMES = 2             # blank frames run through the model by warm_up()
+PREVIEW_ATTACH_TIMEOUT = 1.0  # s; overlays are only drawn while a preview consumer polled this recently
+# Colors written as BGR like the other pages; engine frames are RGB
+OVERLAY_STYLE = to_rgb(OverlayStyle(joint=(255, 0, 255), bone=(0, 255, 0), thumb=(10, 215, 255), index=(255, 87, 51),
+                                    pinch_line=(255, 0, 255), thickness=2, joint_radius=2, tip_radius=10,
+                                    line_thickness=4))
+
+mp_hands = mp.solutions.hands
+
+
+# -------------------- Long-Lived Gesture Engine --------------------
+class GestureEngine:
+    """
+    Owns the MediaPipe model, the camera, the capture/inference pipeline, the actuator and
+    all control state. Build it once per process (e.g. with st.cache_resource) and drive it
+    with pause()/resume(); script reruns then only re-attach the UI instead of cold-starting.
+    """
+
+    def __init__(self, backend=None, **config):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.metrics = LatencyTracker()
+        # Armed on demand (UI button / GESTURE_PROFILE=<frames>); otherwise one attribute check per stage
+        self.profiler = self.metrics.profiler = FrameProfiler(self.config["profile_dir"])
+        arm_from_env(self.profiler)
+        slo = self.config["latency_slo_ms"]
+        self.governor = LatencyGovernor(slo) if slo else None
+        if self.governor is not None:
+            self.config.update(self.governor.point)
+        self.hands = self._build_hands()
+        self.crop_hands = self._build_hands() if self.config["inference_mode"] == "roi" else None
+        # One owner for the frame budget: with an SLO the governor holds it, and an adaptive detect
+        # interval underneath would change the frame times it is judging
+        self.detector = FlowTrackedHands(
+            RoiHands(self.hands, mode=self.config["inference_mode"], scale=self.config["inference_scale"],
+                     crop_hands=self.crop_hands),
+            interval=self.config["detect_interval"],
+            max_interval=max(self.config["detect_max_interval"], self.config["detect_interval"]),
+            frame_budget_ms=None if self.governor is not None else self.config["frame_budget_ms"],
+        )
+        # Every tracked hand gets its own smoother; only the controlling hand actuates
+        self.tracker = HandTracker(
+            lambda: DistanceSmoother(
+                make_filter(self.config["smoothing_filter"]),
+                volume_band=self.config["volume_band"],
+                gesture_band=self.config["gesture_band"],
+                pinch_range=self.config["pinch_range"],
+            ),
+            policy=self.config["control_policy"],
+        )
+        model_path = self.config["gesture_model"]
+        self.classifier = GestureClassifier.load(model_path) if model_path and os.path.exists(model_path) else None
+        self.trace = None
+        self.preprocess = Preprocessor(flip=self.config["flip"])
+        backend = backend if backend is not None else default_backend()
+        sync = self.config["actuation"] == "sync"
+        self.actuator = VolumeActuator(backend, min_interval=0.0 if sync else MIN_INTERVAL_S, metrics=self.metrics)
+        self._preview_until = 0.0
+        self._reset_pending = threading.Event()  # set by pause(), served by the inference thread
+        self._rebuild = None   # thread building Hands for a new operating point
+        self._rebuilt = None   # (point, hands, crop_hands) ready to swap in
+        self.cap = None
+        self.pipeline = None
+        self._lock = threading.Lock()
+
+    # -------------------- Lifecycle / Commands --------------------
+    def open(self):
+        """Opens the camera and starts the worker threads paused. Returns False if the camera is unavailable."""
+        with self._lock:
+            if self.pipeline is not None and self.pipeline.running:
+                return True
+            if self.cap is None or not self.cap.isOpened():
+                c = self.config
+                self.cap = open_capture(c["camera_index"], c["capture_width"], c["capture_height"],
+                                        c["capture_fps"], c["capture_fourcc"], c["capture_buffer_size"])
+                if not self.cap.isOpened():
+                    return False
+            self.pipeline = FramePipeline(self.cap, self.process_frame, metrics=self.metrics,
+                                          recycle_frames=True, release=self.release)
+            self.pipeline.pause()
+            self.pipeline.start()
+            self.actuator.start()
+            return True
+
+    def warm_up(self, frames=WARMUP_FRAMES):
+        """
+        Runs blank frames (at the camera's negotiated size, if open) through preprocessing and
+        the model, so MediaPipe's lazy graph and model initialization happen now rather than on
+        the first real frame. Call before resume(), never while the pipeline is running.
+        """
+        info = self.capture_info() or {}
+        w = info.get("width") or self.config["capture_width"] or DEFAULT_MODE["width"]
+        h = info.get("height") or self.config["capture_height"] or DEFAULT_MODE["height"]
+        blank = np.zeros((h, w, 3), dtype=np.uint8)
+        # ROI crops go to their own model, which would otherwise initialize on the first crop
+        crop = np.zeros((min(h, ROI_MIN_SIZE), min(w, ROI_MIN_SIZE), 3), dtype=np.uint8)
+        for _ in range(frames):
+            rgb = self.preprocess(blank)
+            self.hands.process(rgb)
+            self.preprocess.release(rgb)
+            if self.crop_hands is not None:
+                self.crop_hands.process(crop)
+        self.detector.reset()
+
+    def resume(self):
+        if self.open():
+            self.pipeline.resume()
+            return True
+        return False
+
+    def pause(self):
+        """
+        Stops processing and drops queued frames and volume targets. The tracker is reset on the
+        inference thread before its next frame, never here, since a frame may be mid-update.
+        """
+        self._reset_pending.set()
+        if self.pipeline is not None:
+            self.pipeline.pause()
+        self.actuator.cancel()
+        # The cached engine is rarely closed; make what was recorded so far readable now
+        if self.trace is not None:
+            self.trace.flush()
+
+    def command(self, name):
+        if name == "start":
+            return self.resume()
+        if name == "pause":
+            self.pause()
+            return True
+        raise ValueError(f"unknown engine command {name!r}")
+
+    @property
+    def active(self):
+        return self.pipeline is not None and self.pipeline.running and not self.pipeline.paused
+
+    @property
+    def model_accuracy(self):
+        """Held-out accuracy measured when the gesture model was trained, or None (distance rules)."""
+        return self.classifier.accuracy if self.classifier is not None else None
+
+    @property
+    def error(self):
+        return self.pipeline.error if self.pipeline is not None else None
+
+    @property
+    def exhausted(self):
+        """True once a video file / frame directory source has delivered its last frame."""
+        return self.pipeline is not None and self.pipeline.exhausted
+
+    def get(self, timeout=None, preview=False):
+        """Next processed packet. preview=True marks the caller as showing frames, which enables overlays."""
+        if preview:
+            self._preview_until = time.perf_counter() + PREVIEW_ATTACH_TIMEOUT
+        if self.pipeline is None:
+            return None
+        return self.pipeline.get(timeout)
+
+    def release(self, packet):
+        """Hands a packet's RGB frame back to the pool once the caller is done with it (optional, saves allocations)."""
+        if packet is not None:
+            self.release_output(packet.output)
+
+    def release_output(self, output):
+        """Same for a process_frame() result used directly, without the pipeline."""
+        if output is not None:
+            self.preprocess.release(output.pop("frame", None))
+
+    def stats(self):
+        return self.pipeline.stats() if self.pipeline is not None else {}
+
+    def capture_info(self):
+        """Negotiated capture mode (resolution, FPS, fourcc, buffer depth), or None before open()."""
+        return self.cap.info() if self.cap is not None else None
+
+    def close(self):
+        with self._lock:
+            if self.pipeline is not None:
+                self.pipeline.stop()
+                self.pipeline = None
+            self.actuator.stop()
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            if self._rebuild is not None:
+                self._rebuild.join()
+            if self._rebuilt is not None:
+                _close_all(self._rebuilt[1:])
+                self._rebuilt = None
+            self.detector.close()
+            if self.trace is not None:
+                self.trace.close()
+                self.trace = None
+
+    # -------------------- Operating Point --------------------
+    def _build_hands(self, config=None):
+        config = config or self.config
+        return ProfiledHands(mp_hands.Hands(
+            static_image_mode=False,
+            model_complexity=config["model_complexity"],
+            min_detection_confidence=config["min_detection_confidence"],
+            min_tracking_confidence=config["min_tracking_confidence"],
+            max_num_hands=config["max_num_hands"],
+        ), self.profiler)
+
+    def _apply_operating_point(self):
+        """
+        Builds Hands for the governor's current point on a background thread, so the inference
+        thread keeps running the old ones meanwhile; _swap_operating_point() installs them.
+        """
+        if self._rebuild is not None:
+            return  # _swap_operating_point() catches up with the newest point once this one lands
+        point = dict(self.governor.point)
+        self._rebuild = threading.Thread(target=self._build_operating_point, args=(point,),
+                                         name="hands-rebuild", daemon=True)
+        self._rebuild.start()
+
+    def _build_operating_point(self, point):
+        config = dict(self.config, **point)
+        hands = self._build_hands(config=config)
+        crop_hands = self._build_hands(config=config) if self.crop_hands is not None else None
+        self._rebuilt = (point, hands, crop_hands)
+
+    def _swap_operating_point(self):
+        """Installs Hands built by _apply_operating_point(). Runs on the inference thread, between frames."""
+        point, hands, crop_hands = self._rebuilt
+        self._rebuilt = None
+        self._rebuild = None
+        self.config.update(point)
+        roi = self.detector.detector
+        old = [roi.hands, roi.crop_hands]
+        self.hands = roi.hands = hands
+        if crop_hands is not None:
+            self.crop_hands = roi.crop_hands = crop_hands
+        roi.scale = self.config["inference_scale"]
+        self.detector.interval = self.config["detect_interval"]
+        self.detector.max_interval = max(self.detector.max_interval, self.detector.interval)
+        self.detector.reset()
+        # Graph teardown is not free either; keep it off this thread too
+        threading.Thread(target=_close_all, args=(old,), name="hands-close", daemon=True).start()
+        if self.governor.point != point:
+            self._apply_operating_point()
+
+    def operating_point(self):
+        """Current model complexity / inference scale / tracking confidence, with governor state if enabled."""
+        if self.governor is not None:
+            return self.governor.stats()
+        return {k: self.config[k] for k in ("model_complexity", "inference_scale", "min_tracking_confidence",
+                                            "detect_interval")}
+
+    # -------------------- Frame Processing (Inference Worker) --------------------
+    def process_frame(self, frame):
+        metrics = self.metrics
+        t_frame = time.perf_counter()
+        if self._reset_pending.is_set() and (self.pipeline is None or not self.pipeline.paused):
+            self._reset_pending.clear()
+            self.tracker.reset()
+        # New Hands (governor change) go in between frames; this frame re-detects on a fresh
+        # graph, so its time says nothing about the new point and is kept from the governor
+        swapped = self._rebuilt is not None
+        if swapped:
+            self._swap_operating_point()
+        # One pooled, mirrored RGB frame serves inference, the overlay and the preview
+        with metrics.span("preprocess"):
+            rgb = self.preprocess(frame)
+            h, w, _ = rgb.shape
+
+        with metrics.span("inference"):
+            result = self.detector.process(rgb)
+
+        volume_level = 0
+        dist_val = 0
+        gesture = None
+        gesture_name = None
+        gesture_state = gesture_flags(None)
+
+        # Distance, volume mapping and gesture detection for all hands in one batch,
+        # then stable per-hand IDs so each hand keeps its own filter state
+        with metrics.span("landmarks"):
+            landmarks = landmarks_to_array(result.multi_hand_landmarks)
+            hm = hand_metrics(landmarks, w, h, self.config["pinch_range"])
+            handedness, scores = handedness_arrays(result)
+            tracks = self.tracker.update(landmarks, handedness)
+            control = self.tracker.controller
+
+        # Learned gesture over all 21 landmarks, one batched pass for every hand
+        with metrics.span("classify"):
+            if self.classifier is not None and len(landmarks):
+                codes, confidence = self.classifier.predict(landmarks)
+                for track, code, conf in zip(tracks, codes, confidence):
+                    track.classify(code, conf, self.config["gesture_min_confidence"])
+
+        # Jitter filter + hysteresis between the raw distance and the volume/gesture decision
+        with metrics.span("smoothing"):
+            now = time.perf_counter()
+            for track, raw in zip(tracks, hm.distance):
+                track.update(raw, now)
+            if control is not None:
+                dist_val = int(control.distance)
+                volume_level = control.volume
+                gesture = control.classified if self.classifier is not None else control.gesture
+                gesture_name = GESTURES[gesture]
+                gesture_state = gesture_flags(gesture_name)
+
+        # Volume control: only the controlling hand hands its target to the actuator thread
+        with metrics.span("actuation"):
+            # A frame that was in flight when pause() ran must not move the volume
+            if control is not None and not self._reset_pending.is_set():
+                if self.config["actuation"] == "sync":
+                    self.actuator.drive(volume_level)
+                else:
+                    self.actuator.set_target(volume_level)
+
+        # Overlay only serves the preview: skipped when nobody is watching
+        with metrics.span("drawing"):
+            if time.perf_counter() < self._preview_until:
+                draw_overlay(rgb, hm.points, self.config["overlay_level"], OVERLAY_STYLE)
+
+        if self.config["trace_path"]:
+            if self.trace is None:
+                self.trace = TraceWriter(self.config["trace_path"], w, h, **{
+                    k: self.config[k] for k in ("inference_mode", "smoothing_filter", "volume_band", "gesture_band")})
+            self.trace.record(time.perf_counter(), landmarks, handedness, scores,
+                              volume_level if control is not None else -1, gesture, dist_val)
+
+        # Latency SLO: adjust model/input size for the next frames if this build is too slow (or has headroom)
+        if self.governor is not None and not swapped:
+            now = time.perf_counter()
+            if self.governor.observe((now - t_frame) * 1000.0, now):
+                self._apply_operating_point()
+
+        return {
+            "frame": rgb,
+            "volume_level": volume_level,
+            "dist_val": dist_val,
+            "gesture_state": gesture_state,
+            "gesture": gesture_name,
+            "hands": len(hm.distance),
+            "hand_id": None if control is None else control.id,
+        }
+
+
+def _close_all(hands):
+    for h in hands:
+        if h is not None:
+            h.close()
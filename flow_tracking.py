@@ -0,0 +1,162 @@
+import math
+import time
+
+import cv2
+import numpy as np
+
+# -------------------- Constants --------------------
+LK_PARAMS = dict(
+    winSize=(21, 21),
+    maxLevel=3,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+)
+MIN_TRACKED_FRACTION = 0.7  # re-detect when fewer landmarks than this survive the flow step
+MAX_FLOW_ERROR = 25.0       # per-point LK error above which a point counts as lost
+MIN_HAND_SCORE = 0.8        # handedness score below which the next frame is re-detected
+EMA_ALPHA = 0.1
+
+
+# -------------------- Detect-Every-N + Optical Flow --------------------
+class FlowTrackedHands:
+    """
+    Drop-in wrapper around a hands detector (mp_hands.Hands or RoiHands).
+
+    The detector runs every `interval` frames, or sooner when the hand score drops or flow
+    tracking loses points. In between, the 21 landmarks of every hand are carried forward
+    with cv2.calcOpticalFlowPyrLK and written back into the last MediaPipe result.
+
+    With `frame_budget_ms` set, the interval adapts so the average per-frame cost
+    (one detection plus interval-1 flow steps) stays within the budget; otherwise `interval`
+    can be set from outside (the latency governor does). Frames are only converted to gray
+    when flow may track from them, so interval=1 costs nothing over the bare detector.
+    """
+
+    def __init__(self, detector, interval=1, max_interval=8, frame_budget_ms=None,
+                 min_hand_score=MIN_HAND_SCORE):
+        self.detector = detector
+        self.interval = max(1, int(interval))
+        self.max_interval = max(self.interval, int(max_interval))
+        self.frame_budget_ms = frame_budget_ms
+        self.min_hand_score = min_hand_score
+        self.detect_ms = None
+        self.track_ms = None
+        self.detections = 0
+        self.tracked = 0
+        self.forced_detections = 0
+        self._since_detect = 0
+        self._force = True
+        self._prev_gray = None
+        self._spare_gray = None  # the frame before _prev_gray, reused as the next conversion target
+        self._points = None
+        self._result = None
+
+    def _keep_gray(self, gray):
+        self._spare_gray, self._prev_gray = self._prev_gray, gray
+
+    def _gray(self, rgb):
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY, dst=self._spare_gray)
+
+    def process(self, rgb):
+        H, W = rgb.shape[:2]
+        gray = None
+        if not self._force and self._result is not None and self._since_detect < self.interval:
+            t0 = time.perf_counter()
+            gray = self._gray(rgb)
+            if self._track(gray, W, H):
+                self.track_ms = _ema(self.track_ms, (time.perf_counter() - t0) * 1000.0)
+                self.tracked += 1
+                self._since_detect += 1
+                self._keep_gray(gray)
+                return self._result
+            self.forced_detections += 1
+
+        t0 = time.perf_counter()
+        result = self.detector.process(rgb)
+        self.detect_ms = _ema(self.detect_ms, (time.perf_counter() - t0) * 1000.0)
+        self.detections += 1
+        self._since_detect = 1
+        self._adapt_interval()
+
+        if result.multi_hand_landmarks:
+            self._result = result
+            self._points = np.array(
+                [(lm.x * W, lm.y * H) for hand in result.multi_hand_landmarks for lm in hand.landmark],
+                dtype=np.float32,
+            ).reshape(-1, 1, 2)
+            self._force = _min_hand_score(result) < self.min_hand_score
+        else:
+            self._result = None
+            self._points = None
+            self._force = True
+        # The next frame can only be tracked from this one if flow runs before the next detection
+        if self._result is not None and not self._force and self.interval > 1:
+            self._keep_gray(gray if gray is not None else self._gray(rgb))
+        else:
+            self._keep_gray(None)
+        return result
+
+    def reset(self):
+        self._force = True
+        self._result = None
+        self._points = None
+        self._prev_gray = None
+        if hasattr(self.detector, "reset"):
+            self.detector.reset()
+
+    def stats(self):
+        return {"interval": self.interval, "detections": self.detections, "tracked": self.tracked,
+                "forced_detections": self.forced_detections, "detect_ms": self.detect_ms,
+                "track_ms": self.track_ms}
+
+    def close(self):
+        self.detector.close()
+
+    def _track(self, gray, W, H):
+        if self._prev_gray is None or self._prev_gray.shape != gray.shape:
+            return False
+        points, status, err = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, self._points, None, **LK_PARAMS)
+        ok = (status.ravel() == 1) & (err.ravel() < MAX_FLOW_ERROR)
+        if ok.mean() < MIN_TRACKED_FRACTION:
+            return False
+
+        # Points the flow lost follow their hand's median motion
+        motion = (points - self._points).reshape(-1, 21, 2)
+        ok_hands = ok.reshape(-1, 21)
+        for i in range(motion.shape[0]):
+            if not ok_hands[i].all():
+                good = motion[i][ok_hands[i]]
+                shift = np.median(good, axis=0) if len(good) else np.zeros(2, dtype=np.float32)
+                motion[i][~ok_hands[i]] = shift
+        self._points = self._points + motion.reshape(-1, 1, 2)
+
+        coords = self._points.reshape(-1, 21, 2) / np.array((W, H), dtype=np.float32)
+        for hand, hand_xy in zip(self._result.multi_hand_landmarks, coords.tolist()):
+            for lm, (x, y) in zip(hand.landmark, hand_xy):
+                lm.x = x
+                lm.y = y
+        if hasattr(self.detector, "update_box"):
+            self.detector.update_box(self._result, W, H)
+        return True
+
+    def _adapt_interval(self):
+        if self.frame_budget_ms is None or self.detect_ms is None:
+            return
+        track_ms = self.track_ms if self.track_ms is not None else 0.0
+        if self.detect_ms <= self.frame_budget_ms:
+            self.interval = 1
+        elif self.frame_budget_ms <= track_ms:
+            self.interval = self.max_interval
+        else:
+            # (detect + (N - 1) * track) / N <= budget
+            n = math.ceil((self.detect_ms - track_ms) / (self.frame_budget_ms - track_ms))
+            self.interval = int(min(max(n, 1), self.max_interval))
+
+
+def _min_hand_score(result):
+    if not result.multi_handedness:
+        return 1.0
+    return min(h.classification[0].score for h in result.multi_handedness)
+
+
+def _ema(prev, value):
+    return value if prev is None else prev + EMA_ALPHA * (value - prev)
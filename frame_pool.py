@@ -0,0 +1,194 @@
+"""
+Reusable frame buffers for the capture -> preprocess -> preview path.
+
+Capture reads into pooled BGR buffers (cap.read(image=...)), preprocessing converts each one
+into a pooled RGB buffer and mirrors it in place, and that single RGB frame is shared by
+inference, the overlay and the preview. Buffers go back to their pool when a queue drops a
+packet or the consumer releases it, so the steady state allocates no full-frame arrays.
+
+    python frame_pool.py check --width 1280 --height 720 --frames 300
+    python frame_pool.py check 0   # against a camera instead of synthetic frames
+"""
+import argparse
+import sys
+import threading
+import tracemalloc
+
+import cv2
+import numpy as np
+
+# -------------------- Constants --------------------
+POOL_SIZE = 4            # buffers in flight: one being filled, one queued, one being consumed, one spare
+CHECK_FRAMES = 300
+CHECK_WARMUP = 30
+
+
+# -------------------- Buffer Pool --------------------
+class BufferPool:
+    """
+    Free list of same-shape arrays. acquire() hands out a pooled buffer, or a new one when the
+    pool is empty (counted in `allocated`); release() keeps at most `size` buffers. The shape
+    follows the frames: when it changes (new camera mode) the old buffers are dropped.
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self.shape = None
+        self.dtype = None
+        self.allocated = 0
+        self.reused = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def learn(self, shape, dtype=np.uint8):
+        with self._lock:
+            self._learn(tuple(shape), np.dtype(dtype))
+
+    def _learn(self, shape, dtype):
+        if (shape, dtype) != (self.shape, self.dtype):
+            self.shape, self.dtype = shape, dtype
+            self._free = []
+
+    def acquire(self, shape=None, dtype=np.uint8):
+        """A buffer of `shape` (default: the learned shape), or None while no shape is known yet."""
+        with self._lock:
+            if shape is not None:
+                self._learn(tuple(shape), np.dtype(dtype))
+            if self._free:
+                self.reused += 1
+                return self._free.pop()
+            if self.shape is None:
+                return None
+            self.allocated += 1
+            shape, dtype = self.shape, self.dtype
+        return np.empty(shape, dtype)
+
+    def release(self, buf):
+        if buf is None:
+            return
+        with self._lock:
+            if (buf.shape, buf.dtype) != (self.shape, self.dtype) or len(self._free) >= self.size:
+                return
+            if any(b is buf for b in self._free):
+                return
+            self._free.append(buf)
+
+    def stats(self):
+        return {"size": self.size, "free": len(self._free), "allocated": self.allocated, "reused": self.reused}
+
+
+# -------------------- Preprocessing --------------------
+class Preprocessor:
+    """Raw BGR frame -> mirrored RGB frame in a pooled buffer: one cvtColor into it, then an in-place flip."""
+
+    def __init__(self, pool_size=POOL_SIZE, flip=True):
+        self.pool = BufferPool(pool_size)
+        self.flip = flip
+
+    def __call__(self, frame):
+        rgb = self.pool.acquire(frame.shape, frame.dtype)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        if self.flip:
+            cv2.flip(rgb, 1, dst=rgb)
+        return rgb
+
+    def release(self, rgb):
+        self.pool.release(rgb)
+
+
+# -------------------- Allocation Check --------------------
+class SyntheticSource:
+    """Camera stand-in that fills the caller's buffer when given one, like cv2.VideoCapture.read(image)."""
+
+    def __init__(self, width, height):
+        self.template = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    def read(self, image=None):
+        if image is None or image.shape != self.template.shape:
+            return True, self.template.copy()
+        np.copyto(image, self.template)
+        return True, image
+
+    def release(self):
+        pass
+
+
+def naive_step(source):
+    """The per-frame path before pooling: a fresh frame, a flipped copy and an RGB copy."""
+    def step():
+        ok, frame = source.read()
+        frame = cv2.flip(frame, 1)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return step
+
+
+def pooled_step(source, frame_pool, preprocessor):
+    """The pooled path as FramePipeline + GestureEngine run it, including both releases."""
+    def step():
+        buf = frame_pool.acquire()
+        ok, frame = source.read(buf)
+        if frame is not buf:
+            frame_pool.learn(frame.shape, frame.dtype)
+        rgb = preprocessor(frame)
+        frame_pool.release(frame)
+        preprocessor.release(rgb)
+        return rgb
+    return step
+
+
+def measure_allocations(step, frames=CHECK_FRAMES, warmup=CHECK_WARMUP):
+    """
+    Runs `step` under tracemalloc after a warm-up. Returns (bytes, growth): the mean per-frame
+    peak above the memory in use before the frame (what the frame allocated, even if it was freed
+    again) and the mean per-frame growth of memory still held afterwards (leaks).
+    """
+    for _ in range(warmup):
+        step()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        transient = 0
+        for _ in range(frames):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step()
+            transient += tracemalloc.get_traced_memory()[1] - current
+        growth = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return transient / frames, growth / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frame buffer pool tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="compare per-frame allocations of the naive and pooled preprocessing")
+    check.add_argument("source", nargs="?", default=None, help="camera index or video file (default: synthetic frames)")
+    check.add_argument("--width", type=int, default=1280)
+    check.add_argument("--height", type=int, default=720)
+    check.add_argument("--frames", type=int, default=CHECK_FRAMES)
+    check.add_argument("--max-bytes", type=int, default=4096, help="fail if the pooled path allocates more per frame")
+    args = parser.parse_args(argv)
+
+    if args.source is None:
+        source = SyntheticSource(args.width, args.height)
+    else:
+        from capture import open_capture
+        source = open_capture(args.source, args.width, args.height)
+    try:
+        naive = measure_allocations(naive_step(source), args.frames)
+        pooled = measure_allocations(pooled_step(source, BufferPool(), Preprocessor()), args.frames)
+    finally:
+        source.release()
+    frame_kib = args.width * args.height * 3 / 1024
+    print(f"Frame size: {frame_kib:.0f} KiB")
+    print(f"naive:  {naive[0] / 1024:10.1f} KiB allocated/frame, {naive[1]:8.1f} B/frame retained")
+    print(f"pooled: {pooled[0] / 1024:10.1f} KiB allocated/frame, {pooled[1]:8.1f} B/frame retained")
+    ok = pooled[0] <= args.max_bytes
+    print("OK: steady-state preprocessing is allocation-free" if ok
+          else f"FAIL: pooled path allocates more than {args.max_bytes} bytes/frame")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import streamlit as st
 import base64
+import os
 
 # ---- PAGE CONFIG ----
 st.set_page_config(
@@ -104,6 +105,14 @@ body {
 </style>
 """, unsafe_allow_html=True)
 
+# ---- BACKGROUND WARM-UP ----
+# Model, camera and first inference get ready while the user is on this page; the control
+# page takes the warmed engine. Skipped in thin-client mode, where the daemon owns the camera.
+if not os.environ.get("GESTURE_DAEMON_SOCKET"):
+    import prewarm
+    from app_settings import ENGINE_CONFIG
+    prewarm.start(ENGINE_CONFIG)
+
 # ---- MAIN CONTENT ----
 st.markdown('<div class="main">', unsafe_allow_html=True)
 
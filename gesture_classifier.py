@@ -0,0 +1,135 @@
+import numpy as np
+
+from gesture_core import GESTURES, NUM_LANDMARKS
+
+# -------------------- Constants --------------------
+WRIST = 0
+MIDDLE_MCP = 9
+NUM_FEATURES = NUM_LANDMARKS * 3
+CLASSIFIER_KINDS = ("centroid", "mlp")
+DEFAULT_MODEL_PATH = "gesture_model.npz"
+MIN_CONFIDENCE = 0.6  # below this a hand keeps its previous classified gesture
+
+
+# -------------------- Features --------------------
+def landmark_features(landmarks):
+    """
+    (hands, 21, 3) normalized landmarks -> (hands, 63) float32 features.
+    Wrist-relative and divided by the wrist -> middle-knuckle length, so the vector does not
+    depend on where the hand is in the frame or how far it is from the camera.
+    """
+    rel = landmarks - landmarks[:, WRIST:WRIST + 1]
+    scale = np.maximum(np.linalg.norm(rel[:, MIDDLE_MCP, :2], axis=1), 1e-6)
+    return (rel / scale[:, None, None]).reshape(len(landmarks), NUM_FEATURES).astype(np.float32)
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(logits)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+# -------------------- Classifier --------------------
+class GestureClassifier:
+    """
+    Gesture model over all 21 landmarks, stored as plain NumPy arrays in one .npz file.
+
+    kind="centroid": one standardized centroid per gesture, scored by squared distance.
+    kind="mlp":      63 -> hidden (ReLU) -> 3.
+    Either way predict() is a couple of matrix products for every hand in the frame at once.
+    `accuracy` is the held-out accuracy measured by gesture_train.py when the model was saved.
+    """
+
+    def __init__(self, kind, params, mean, std, accuracy=None, n_eval=0):
+        if kind not in CLASSIFIER_KINDS:
+            raise ValueError(f"kind must be one of {CLASSIFIER_KINDS}, got {kind!r}")
+        self.kind = kind
+        self.params = {k: np.asarray(v, dtype=np.float32) for k, v in params.items()}
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        self.accuracy = accuracy
+        self.n_eval = n_eval
+
+    def predict_proba(self, landmarks):
+        """(hands, 21, 3) landmarks -> (hands, 3) class probabilities in GESTURES order."""
+        if not len(landmarks):
+            return np.empty((0, len(GESTURES)), dtype=np.float32)
+        return self._proba((landmark_features(landmarks) - self.mean) / self.std)
+
+    def predict(self, landmarks):
+        """Returns (gesture codes as int8, confidence of each) for every hand."""
+        proba = self.predict_proba(landmarks)
+        codes = proba.argmax(axis=1)
+        return codes.astype(np.int8), proba[np.arange(len(codes)), codes]
+
+    def _proba(self, x):
+        p = self.params
+        if self.kind == "centroid":
+            c = p["centroids"]
+            d2 = (x * x).sum(axis=1, keepdims=True) - 2.0 * x @ c.T + (c * c).sum(axis=1)
+            return _softmax(-d2)
+        hidden = np.maximum(x @ p["w1"] + p["b1"], 0.0)
+        return _softmax(hidden @ p["w2"] + p["b2"])
+
+    def evaluate(self, landmarks, labels):
+        codes, _ = self.predict(landmarks)
+        labels = np.asarray(labels)
+        confusion = np.zeros((len(GESTURES), len(GESTURES)), dtype=np.int64)
+        np.add.at(confusion, (labels, codes), 1)
+        accuracy = float((codes == labels).mean()) if len(labels) else None
+        return {"accuracy": accuracy, "n": int(len(labels)), "confusion": confusion.tolist()}
+
+    # -------------------- Persistence --------------------
+    def save(self, path):
+        np.savez(path, kind=self.kind, mean=self.mean, std=self.std,
+                 accuracy=np.nan if self.accuracy is None else self.accuracy, n_eval=self.n_eval,
+                 **{f"param_{k}": v for k, v in self.params.items()})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            params = {k[len("param_"):]: data[k] for k in data.files if k.startswith("param_")}
+            accuracy = float(data["accuracy"])
+            return cls(str(data["kind"]), params, data["mean"], data["std"],
+                       None if np.isnan(accuracy) else accuracy, int(data["n_eval"]))
+
+
+# -------------------- Training --------------------
+def train_classifier(landmarks, labels, kind="mlp", hidden=32, epochs=300, lr=0.05, seed=0):
+    """Fits a GestureClassifier on (N, 21, 3) landmarks and (N,) gesture codes."""
+    features = landmark_features(landmarks)
+    labels = np.asarray(labels, dtype=np.int64)
+    mean = features.mean(axis=0)
+    std = features.std(axis=0) + 1e-6
+    x = (features - mean) / std
+
+    if kind == "centroid":
+        centroids = np.zeros((len(GESTURES), NUM_FEATURES), dtype=np.float32)
+        for code in range(len(GESTURES)):
+            if np.any(labels == code):
+                centroids[code] = x[labels == code].mean(axis=0)
+        return GestureClassifier(kind, {"centroids": centroids}, mean, std)
+    if kind != "mlp":
+        raise ValueError(f"kind must be one of {CLASSIFIER_KINDS}, got {kind!r}")
+
+    # Full-batch gradient descent with momentum on softmax cross-entropy; the data sets are small
+    rng = np.random.default_rng(seed)
+    w1 = rng.normal(0.0, np.sqrt(2.0 / NUM_FEATURES), (NUM_FEATURES, hidden)).astype(np.float32)
+    b1 = np.zeros(hidden, dtype=np.float32)
+    w2 = rng.normal(0.0, np.sqrt(2.0 / hidden), (hidden, len(GESTURES))).astype(np.float32)
+    b2 = np.zeros(len(GESTURES), dtype=np.float32)
+    params = [w1, b1, w2, b2]
+    velocity = [np.zeros_like(p) for p in params]
+    onehot = np.eye(len(GESTURES), dtype=np.float32)[labels]
+    n = len(x)
+    for _ in range(epochs):
+        pre = x @ w1 + b1
+        h = np.maximum(pre, 0.0)
+        grad_logits = (_softmax(h @ w2 + b2) - onehot) / n
+        grad_h = (grad_logits @ w2.T) * (pre > 0)
+        grads = [x.T @ grad_h, grad_h.sum(axis=0), h.T @ grad_logits, grad_logits.sum(axis=0)]
+        for p, v, g in zip(params, velocity, grads):
+            v *= 0.9
+            v -= lr * g
+            p += v
+    return GestureClassifier(kind, {"w1": w1, "b1": b1, "w2": w2, "b2": b2}, mean, std)
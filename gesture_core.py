@@ -0,0 +1,62 @@
+from collections import namedtuple
+
+import numpy as np
+
+# -------------------- Constants --------------------
+THUMB_TIP = 4
+INDEX_TIP = 8
+NUM_LANDMARKS = 21
+
+# Distance range (px) mapped onto 0-100% volume
+MIN_DISTANCE = 20
+MAX_DISTANCE = 200
+
+# Gesture cut-offs (px): below the range = Closed, inside = Pinch, above = Open
+PINCH_RANGE = (20, 80)
+GESTURES = ("Open Hand", "Pinch", "Closed Hand")
+OPEN, PINCH, CLOSED = range(3)
+HANDEDNESS = ("Left", "Right")  # codes 0/1, -1 = unknown
+
+
+# -------------------- Gesture Display --------------------
+def gesture_flags(gesture):
+    return {g: g == gesture for g in GESTURES}
+
+
+# -------------------- Batched Landmark Math --------------------
+HandMetrics = namedtuple("HandMetrics", ["points", "thumb", "index", "distance", "volume", "gesture"])
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """All hands' landmarks as one (hands, 21, 3) float32 array of normalized x, y, z."""
+    if not multi_hand_landmarks:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+        dtype=np.float32,
+    )
+
+
+def handedness_arrays(result):
+    """(codes, scores) arrays for every hand in a MediaPipe result, or (None, None)."""
+    multi = getattr(result, "multi_handedness", None)
+    if not multi:
+        return None, None
+    top = [h.classification[0] for h in multi]
+    codes = np.array([HANDEDNESS.index(c.label) if c.label in HANDEDNESS else -1 for c in top], dtype=np.int8)
+    return codes, np.array([c.score for c in top], dtype=np.float32)
+
+
+def hand_metrics(landmarks, w, h, pinch_range=PINCH_RANGE, min_dist=MIN_DISTANCE, max_dist=MAX_DISTANCE):
+    """
+    Pixel points, thumb-index distance, volume level and gesture code for every hand at once.
+    Matches the scalar maths the pages used: pixels truncated to int, volume truncated then clipped.
+    """
+    points = (landmarks[..., :2] * np.array((w, h), dtype=np.float32)).astype(np.int32)
+    thumb = points[:, THUMB_TIP]
+    index = points[:, INDEX_TIP]
+    delta = (index - thumb).astype(np.float32)
+    distance = np.hypot(delta[:, 0], delta[:, 1])
+    volume = np.clip(np.trunc((distance - min_dist) / (max_dist - min_dist) * 100), 0, 100).astype(np.int32)
+    gesture = np.where(distance > pinch_range[1], OPEN, np.where(distance >= pinch_range[0], PINCH, CLOSED))
+    return HandMetrics(points, thumb, index, distance, volume, gesture.astype(np.int8))
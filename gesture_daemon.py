@@ -0,0 +1,210 @@
+"""
+Headless gesture volume controller.
+
+Runs the same capture -> MediaPipe -> distance -> volume/gesture pipeline as the
+Streamlit app (via GestureEngine), without a web server or browser, and publishes
+compact JSON lines:
+
+    {"type": "state", "seq": 812, "t": 1718.204, "hands": 1, "hand": 0, "volume": 42, "distance": 95, "gesture": "Open Hand"}
+    {"type": "gesture", "seq": 815, "t": 1718.305, "from": "Open Hand", "to": "Pinch"}
+
+to stdout / a file (--jsonl) and to any number of local clients on a Unix socket (--socket).
+While no hand is in view, state messages carry "volume": null and "distance": null. With a
+video file as --source the daemon exits (status 0) after its last frame.
+
+    python gesture_daemon.py --socket /tmp/gesture.sock
+    python gesture_daemon.py --jsonl - --state-hz 5
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+
+from ui_refresh import RateLimiter
+
+# -------------------- Constants --------------------
+DEFAULT_SOCKET = "/tmp/gesture-volume.sock"
+DEFAULT_STATE_HZ = 30
+CLIENT_SEND_TIMEOUT = 0.05  # s; clients slower than this are dropped rather than stalling the loop
+
+
+# -------------------- Event Sinks --------------------
+class JsonLinesSink:
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, "a", encoding="utf-8", buffering=1)
+
+    def publish(self, line):
+        self.file.write(line)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class UnixSocketSink:
+    """Broadcasts each line to every connected client; accepts clients on a background thread."""
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        self.path = path
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+        self.server.settimeout(0.5)
+        self.clients = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._accept_loop, name="socket-accept", daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(CLIENT_SEND_TIMEOUT)
+            with self._lock:
+                self.clients.append(conn)
+
+    def publish(self, line):
+        data = line.encode("utf-8")
+        with self._lock:
+            alive = []
+            for conn in self.clients:
+                try:
+                    conn.sendall(data)
+                    alive.append(conn)
+                except OSError:
+                    conn.close()
+            self.clients = alive
+
+    def close(self):
+        self._stop.set()
+        self.server.close()
+        with self._lock:
+            for conn in self.clients:
+                conn.close()
+            self.clients = []
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+# -------------------- Thin Client --------------------
+class DaemonClient:
+    """Reads the daemon's JSON lines from its Unix socket (used by the Streamlit thin-client mode)."""
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=1.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self._buffer = b""
+
+    def read(self):
+        """Returns the next message dict, or None on timeout. Raises ConnectionError if the daemon went away."""
+        while b"\n" not in self._buffer:
+            try:
+                chunk = self.sock.recv(65536)
+            except socket.timeout:
+                return None
+            if not chunk:
+                raise ConnectionError("gesture daemon closed the connection")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def close(self):
+        self.sock.close()
+
+
+# -------------------- Daemon --------------------
+def run_daemon(engine, sinks, state_hz=DEFAULT_STATE_HZ, stop_event=None):
+    """Publishes until stopped or a file source runs out; raises RuntimeError if capture fails."""
+    stop_event = stop_event or threading.Event()
+    if not engine.resume():
+        raise RuntimeError("Cannot open camera")
+    limiter = RateLimiter(state_hz)
+    last_gesture = None
+    while not stop_event.is_set():
+        packet = engine.get(timeout=1.0)
+        if packet is None:
+            if not engine.active:
+                if engine.exhausted and engine.error is None:
+                    return
+                raise RuntimeError(engine.error or "capture stopped")
+            continue
+        out = packet.output
+        t = round(packet.t_capture, 4)
+        lines = []
+        if out["gesture"] != last_gesture:
+            lines.append({"type": "gesture", "seq": packet.seq, "t": t, "from": last_gesture, "to": out["gesture"]})
+            last_gesture = out["gesture"]
+        if limiter.ready():
+            # No controlling hand: the engine's 0 placeholders are not readings
+            tracked = out["hand_id"] is not None
+            lines.append({"type": "state", "seq": packet.seq, "t": t, "hands": out["hands"], "hand": out["hand_id"],
+                          "volume": out["volume_level"] if tracked else None,
+                          "distance": out["dist_val"] if tracked else None, "gesture": out["gesture"]})
+        if lines:
+            payload = "".join(json.dumps(m, separators=(",", ":")) + "\n" for m in lines)
+            for sink in sinks:
+                sink.publish(payload)
+        engine.release(packet)
+        engine.metrics.frame_done(packet.t_capture)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless gesture volume controller")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--socket", default=None, help=f"Unix socket to publish on (e.g. {DEFAULT_SOCKET})")
+    parser.add_argument("--jsonl", default=None, help="append JSON lines to this file ('-' for stdout)")
+    parser.add_argument("--state-hz", type=float, default=DEFAULT_STATE_HZ, help="max per-frame state messages per second")
+    parser.add_argument("--no-actuate", action="store_true", help="publish events only, never change the OS volume")
+    parser.add_argument("--latency-slo-ms", type=float, default=None, help="per-frame time target for the governor")
+    parser.add_argument("--record-trace", default=None, help="record a landmark trace into this directory")
+    parser.add_argument("--metrics", default=None, help="write latency metrics JSON here on exit")
+    args = parser.parse_args(argv)
+
+    if args.socket is None and args.jsonl is None:
+        args.socket = DEFAULT_SOCKET
+
+    from actuator import MockBackend
+    from engine import GestureEngine
+
+    engine = GestureEngine(
+        backend=MockBackend() if args.no_actuate else None,
+        camera_index=int(args.source) if args.source.isdigit() else args.source,
+        overlay_level="none",
+        trace_path=args.record_trace,
+        latency_slo_ms=args.latency_slo_ms,
+    )
+    sinks = []
+    if args.socket:
+        sinks.append(UnixSocketSink(args.socket))
+    if args.jsonl:
+        sinks.append(JsonLinesSink(args.jsonl))
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        run_daemon(engine, sinks, args.state_hz, stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+        for sink in sinks:
+            sink.close()
+        if args.metrics:
+            engine.metrics.write(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Offline training and evaluation for the landmark gesture classifier.
+
+Recorded data is one or more .npz files holding `landmarks` (N, 21, 3) normalized MediaPipe
+landmarks and `labels` (N,) gesture codes (0 = Open Hand, 1 = Pinch, 2 = Closed Hand).
+Each file is one recording. Consecutive frames of a recording are near-duplicates, so the
+held-out set is made of whole recordings rather than random frames.
+
+    python gesture_train.py record --label Pinch --seconds 20 --output data/pinch.npz
+    python gesture_train.py record --label "Open Hand" --source open.mp4 --output data/open.npz
+    python gesture_train.py train data/*.npz --kind mlp --output gesture_model.npz
+    python gesture_train.py eval gesture_model.npz data/holdout.npz
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from gesture_classifier import CLASSIFIER_KINDS, DEFAULT_MODEL_PATH, GestureClassifier, train_classifier
+from gesture_core import GESTURES, NUM_LANDMARKS
+
+# -------------------- Constants --------------------
+DEFAULT_HOLDOUT = 0.2
+LATENCY_HANDS = 2        # batch size for the inference timing (hands per frame)
+LATENCY_REPEATS = 2000
+
+
+# -------------------- Data --------------------
+def load_dataset(paths):
+    """
+    Concatenates every .npz given (directories are searched for .npz files). Returns
+    (landmarks, labels, groups), where groups[i] is the index of the file sample i came from.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".npz")))
+        else:
+            files.append(path)
+    landmarks, labels, groups = [], [], []
+    for i, f in enumerate(files):
+        with np.load(f) as data:
+            landmarks.append(data["landmarks"].astype(np.float32))
+            labels.append(data["labels"].astype(np.int64))
+        groups.append(np.full(len(labels[-1]), i, dtype=np.int64))
+    if not landmarks:
+        raise SystemExit("no landmark data found")
+    return np.concatenate(landmarks), np.concatenate(labels), np.concatenate(groups)
+
+
+def split_holdout(labels, groups, fraction, seed):
+    """
+    (train_idx, eval_idx) holding out whole recordings: for every gesture, round(fraction * n)
+    of its recordings (at least one, never all) go to evaluation. A recording counts toward
+    the gesture most of its frames are labelled with.
+    """
+    rng = np.random.default_rng(seed)
+    recordings = np.unique(groups)
+    majority = np.array([np.bincount(labels[groups == g]).argmax() for g in recordings])
+    held = []
+    for code in np.unique(majority):
+        candidates = rng.permutation(recordings[majority == code])
+        if len(candidates) < 2:
+            continue  # a gesture's only recording has to stay in training
+        held.extend(candidates[:min(len(candidates) - 1, max(1, int(round(len(candidates) * fraction))))])
+    if not held:
+        raise SystemExit("holding out whole recordings needs at least two recordings of a gesture")
+    eval_mask = np.isin(groups, held)
+    return np.flatnonzero(~eval_mask), np.flatnonzero(eval_mask)
+
+
+def measure_latency(model, hands=LATENCY_HANDS, repeats=LATENCY_REPEATS):
+    """Mean predict() time in ms for one frame with `hands` hands."""
+    batch = np.random.default_rng(0).random((hands, NUM_LANDMARKS, 3), dtype=np.float32)
+    model.predict(batch)
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(batch)
+    return (time.perf_counter() - t0) * 1000.0 / repeats
+
+
+# -------------------- Commands --------------------
+def cmd_record(args):
+    import cv2
+    import mediapipe as mp
+    from capture import open_capture
+    from gesture_core import landmarks_to_array
+
+    code = GESTURES.index(args.label)
+    cap = open_capture(args.source)
+    hands = mp.solutions.hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+    samples = []
+    deadline = time.perf_counter() + args.seconds
+    try:
+        while time.perf_counter() < deadline:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.flip(frame, 1)
+            result = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            samples.extend(landmarks_to_array(result.multi_hand_landmarks))
+    finally:
+        cap.release()
+        hands.close()
+    if not samples:
+        raise SystemExit("no hands detected; nothing recorded")
+    landmarks = np.stack(samples)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    np.savez_compressed(args.output, landmarks=landmarks, labels=np.full(len(landmarks), code, dtype=np.int8))
+    print(f"Recorded {len(landmarks)} '{args.label}' samples to {args.output}")
+    return 0
+
+
+def cmd_train(args):
+    landmarks, labels, groups = load_dataset(args.data)
+    train_idx, eval_idx = split_holdout(labels, groups, args.holdout, args.seed)
+    model = train_classifier(landmarks[train_idx], labels[train_idx], args.kind, args.hidden, args.epochs, args.lr, args.seed)
+    report = model.evaluate(landmarks[eval_idx], labels[eval_idx])
+    model.accuracy = report["accuracy"]
+    model.n_eval = report["n"]
+    model.save(args.output)
+    report.update(kind=args.kind, train=int(len(train_idx)), latency_ms=measure_latency(model),
+                  eval_recordings=int(len(np.unique(groups[eval_idx]))))
+    _print_report(report)
+    print(f"Saved {args.output}")
+    return 0
+
+
+def cmd_eval(args):
+    model = GestureClassifier.load(args.model)
+    landmarks, labels, _ = load_dataset(args.data)
+    report = model.evaluate(landmarks, labels)
+    report.update(kind=model.kind, latency_ms=measure_latency(model))
+    _print_report(report)
+    if args.update:
+        # Record this measurement as the accuracy the dashboard shows
+        model.accuracy = report["accuracy"]
+        model.n_eval = report["n"]
+        model.save(args.model)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def _print_report(report):
+    accuracy = report["accuracy"]
+    print(f"{report['kind']}: accuracy {'n/a' if accuracy is None else f'{accuracy * 100:.1f}%'} "
+          f"on {report['n']} samples" + (f" from {report['eval_recordings']} held-out recordings"
+                                        if "eval_recordings" in report else "")
+          + f", predict {report['latency_ms'] * 1000:.0f} us / frame")
+    print(f"{'':<12}" + "".join(f"{g:>12}" for g in GESTURES))
+    for g, row in zip(GESTURES, report["confusion"]):
+        print(f"{g:<12}" + "".join(f"{v:>12}" for v in row))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and evaluate the landmark gesture classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="record labelled landmarks from a camera or video")
+    rec.add_argument("--label", required=True, choices=GESTURES)
+    rec.add_argument("--source", default="0", help="camera index, video file or frame directory")
+    rec.add_argument("--seconds", type=float, default=20.0)
+    rec.add_argument("--output", required=True)
+    rec.set_defaults(func=cmd_record)
+
+    tr = sub.add_parser("train", help="fit a model and measure held-out accuracy")
+    tr.add_argument("data", nargs="+", help=".npz files or directories")
+    tr.add_argument("--kind", default="mlp", choices=CLASSIFIER_KINDS)
+    tr.add_argument("--hidden", type=int, default=32)
+    tr.add_argument("--epochs", type=int, default=300)
+    tr.add_argument("--lr", type=float, default=0.05)
+    tr.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT,
+                    help="fraction of each gesture's recordings kept out for evaluation")
+    tr.add_argument("--seed", type=int, default=0)
+    tr.add_argument("--output", default=DEFAULT_MODEL_PATH)
+    tr.set_defaults(func=cmd_train)
+
+    ev = sub.add_parser("eval", help="evaluate a saved model on recorded data")
+    ev.add_argument("model")
+    ev.add_argument("data", nargs="+", help=".npz files or directories")
+    ev.add_argument("--update", action="store_true", help="store this accuracy in the model file")
+    ev.add_argument("--output", default=None, help="write the JSON report here")
+    ev.set_defaults(func=cmd_eval)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+
+# -------------------- Constants --------------------
+# Operating points from best quality to cheapest. Lower tracking confidence keeps MediaPipe in
+# its landmark-tracking path instead of re-running palm detection, which is the expensive part.
+# inference_scale only shrinks full-frame passes; ROI crops are not scaled. detect_interval > 1
+# runs MediaPipe every N frames and carries landmarks forward with optical flow in between.
+OPERATING_POINTS = (
+    {"model_complexity": 1, "inference_scale": 1.0, "min_tracking_confidence": 0.7, "detect_interval": 1},
+    {"model_complexity": 1, "inference_scale": 0.75, "min_tracking_confidence": 0.6, "detect_interval": 1},
+    {"model_complexity": 0, "inference_scale": 0.75, "min_tracking_confidence": 0.5, "detect_interval": 2},
+    {"model_complexity": 0, "inference_scale": 0.5, "min_tracking_confidence": 0.5, "detect_interval": 3},
+)
+GOVERNOR_WINDOW = 30       # frames per decision
+GOVERNOR_PERCENTILE = 90   # frame-time percentile held against the SLO
+UPGRADE_MARGIN = 0.7       # step back up only if frames run under 70% of the SLO...
+COOLDOWN_S = 2.0           # ...and no change happened in the last COOLDOWN_S seconds
+RETRY_S = 30.0             # a point that missed the SLO is not retried for this long
+
+
+# -------------------- Latency Governor --------------------
+class LatencyGovernor:
+    """
+    Walks OPERATING_POINTS to hold a per-frame time SLO.
+
+    Every GOVERNOR_WINDOW frames the p90 frame time is compared with the target: above it, step
+    one point cheaper; below UPGRADE_MARGIN x target, step one point better, unless that point
+    missed the target within the last RETRY_S seconds, which stops the governor from bouncing
+    between two neighbours. A cooldown after each change lets the new setting settle.
+    """
+
+    def __init__(self, target_ms, points=OPERATING_POINTS, window=GOVERNOR_WINDOW,
+                 percentile=GOVERNOR_PERCENTILE, upgrade_margin=UPGRADE_MARGIN, cooldown_s=COOLDOWN_S,
+                 retry_s=RETRY_S):
+        self.target_ms = target_ms
+        self.points = points
+        self.window = window
+        self.percentile = percentile
+        self.upgrade_margin = upgrade_margin
+        self.cooldown_s = cooldown_s
+        self.retry_s = retry_s
+        self.level = 0
+        self.level_ms = [None] * len(points)   # last measured percentile at each point
+        self.level_at = [None] * len(points)   # ...and when it was measured
+        self.changes = 0
+        self._samples = np.empty(window, dtype=np.float64)
+        self._n = 0
+        self._last_change = float("-inf")
+
+    @property
+    def point(self):
+        return self.points[self.level]
+
+    def observe(self, frame_ms, now=None):
+        """Records one frame time; returns True when the operating point changed."""
+        self._samples[self._n] = frame_ms
+        self._n += 1
+        if self._n < self.window:
+            return False
+        self._n = 0
+        now = time.perf_counter() if now is None else now
+        if now - self._last_change < self.cooldown_s:
+            return False  # still settling (model rebuild, re-detection); don't judge this point yet
+        measured = float(np.percentile(self._samples, self.percentile))
+        self.level_ms[self.level] = measured
+        self.level_at[self.level] = now
+
+        if measured > self.target_ms and self.level < len(self.points) - 1:
+            new_level = self.level + 1
+        elif measured < self.target_ms * self.upgrade_margin and self.level > 0:
+            known = self.level_ms[self.level - 1]
+            if known is not None and known > self.target_ms and now - self.level_at[self.level - 1] < self.retry_s:
+                return False
+            new_level = self.level - 1
+        else:
+            return False
+        self.level = new_level
+        self.changes += 1
+        self._last_change = now
+        return True
+
+    def stats(self):
+        return dict(self.point, level=self.level, levels=len(self.points), target_ms=self.target_ms,
+                    measured_ms=self.level_ms[self.level], changes=self.changes)
+
+
+def describe(stats):
+    """One-line operating point for status captions."""
+    measured = stats["measured_ms"]
+    return (f"level {stats['level'] + 1}/{stats['levels']}: complexity {stats['model_complexity']}, "
+            f"scale {stats['inference_scale']:g}, tracking {stats['min_tracking_confidence']:g}, "
+            f"detect every {stats.get('detect_interval', 1)}, "
+            f"p{GOVERNOR_PERCENTILE} {'--' if measured is None else f'{measured:.0f}'}/{stats['target_ms']:.0f} ms")
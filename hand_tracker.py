@@ -0,0 +1,154 @@
+import numpy as np
+
+from smoothing import DistanceSmoother
+
+# -------------------- Constants --------------------
+PALM = np.array([0, 5, 9, 17], dtype=np.int32)  # wrist + index/middle/pinky knuckles
+MATCH_DISTANCE = 0.15     # max palm-centre movement between frames (normalized image units)
+HANDEDNESS_PENALTY = 0.1  # added to the match cost when MediaPipe handedness disagrees
+MAX_MISSED = 5            # frames a hand may vanish before its track (and ID) is dropped
+CONTROL_POLICIES = ("first", "right", "left", "largest")
+
+
+# -------------------- Track --------------------
+class Track:
+    """One physical hand: a persistent ID plus its own smoothing and control state."""
+
+    __slots__ = ("id", "anchor", "size", "handedness", "smoother", "distance", "volume", "gesture",
+                 "classified", "missed")
+
+    def __init__(self, track_id, anchor, size, handedness, smoother):
+        self.id = track_id
+        self.anchor = anchor
+        self.size = size
+        self.handedness = handedness
+        self.smoother = smoother
+        self.distance = None
+        self.volume = None
+        self.gesture = None      # from the distance cut-offs
+        self.classified = None   # from the landmark classifier, if one is loaded
+        self.missed = 0
+
+    def update(self, raw_distance, t):
+        self.distance, self.volume, self.gesture = self.smoother.update(raw_distance, t)
+        return self.distance, self.volume, self.gesture
+
+    def classify(self, code, confidence, min_confidence):
+        """Takes the classifier's gesture only when it is confident enough (or nothing is known yet)."""
+        if self.classified is None or confidence >= min_confidence:
+            self.classified = int(code)
+        return self.classified
+
+
+# -------------------- Tracker --------------------
+class HandTracker:
+    """
+    Gives every hand a stable ID across frames by matching palm centres (nearest neighbour over
+    one tracks x detections cost matrix, with a penalty for a handedness flip), and picks the
+    hand that drives the volume.
+
+    policy: "first"   - the longest-tracked hand keeps control until it leaves
+            "right"/"left" - that hand whenever it is visible, otherwise as "first"
+            "largest" - when control is free, the hand closest to the camera takes it
+    Control is sticky, so two hands in view never alternate the actuation from frame to frame.
+    """
+
+    def __init__(self, smoother_factory=DistanceSmoother, policy="first", max_distance=MATCH_DISTANCE,
+                 max_missed=MAX_MISSED):
+        if policy not in CONTROL_POLICIES:
+            raise ValueError(f"policy must be one of {CONTROL_POLICIES}, got {policy!r}")
+        self.smoother_factory = smoother_factory
+        self.policy = policy
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.tracks = []
+        self.controller = None
+        self.next_id = 0
+        self.switches = 0
+        self._last_controller = None
+        self._retired_suppressed = 0
+
+    def update(self, landmarks, handedness=None):
+        """Matches this frame's (hands, 21, 3) landmarks to tracks; returns the Track for each hand, in order."""
+        n = len(landmarks)
+        anchors = landmarks[:, PALM, :2].mean(axis=1) if n else np.empty((0, 2), dtype=np.float32)
+        sizes = np.linalg.norm(landmarks[:, 9, :2] - landmarks[:, 0, :2], axis=1) if n else np.empty(0)
+        if handedness is None or len(handedness) != n:
+            handedness = np.full(n, -1, dtype=np.int8)
+
+        assigned = [None] * n
+        if self.tracks and n:
+            prev = np.array([t.anchor for t in self.tracks], dtype=np.float32)
+            prev_hand = np.array([t.handedness for t in self.tracks], dtype=np.int8)
+            cost = np.linalg.norm(prev[:, None, :] - anchors[None, :, :], axis=2)
+            flip = (prev_hand[:, None] != handedness[None, :]) & (prev_hand[:, None] >= 0) & (handedness[None, :] >= 0)
+            cost += HANDEDNESS_PENALTY * flip
+            # Greedy nearest-neighbour: cheapest pairs first, each track and hand used once
+            used_tracks = set()
+            for flat in np.argsort(cost, axis=None):
+                ti, di = divmod(int(flat), n)
+                if cost[ti, di] > self.max_distance:
+                    break
+                if ti in used_tracks or assigned[di] is not None:
+                    continue
+                used_tracks.add(ti)
+                assigned[di] = self.tracks[ti]
+
+        for i in range(n):
+            track = assigned[i]
+            if track is None:
+                track = Track(self.next_id, None, 0.0, -1, self.smoother_factory())
+                self.next_id += 1
+                self.tracks.append(track)
+                assigned[i] = track
+            track.anchor = anchors[i]
+            track.size = float(sizes[i])
+            if handedness[i] >= 0:
+                track.handedness = int(handedness[i])
+            track.missed = -1  # marks "seen this frame" until the sweep below
+
+        alive = []
+        for track in self.tracks:
+            track.missed += 1
+            if track.missed <= self.max_missed:
+                alive.append(track)
+            else:
+                self._retired_suppressed += track.smoother.suppressed
+        self.tracks = alive
+        self._choose_controller(assigned)
+        return assigned
+
+    def _choose_controller(self, present):
+        current = self.controller if self.controller in present else None
+        if self.policy in ("right", "left"):
+            wanted = 1 if self.policy == "right" else 0
+            preferred = [t for t in present if t.handedness == wanted]
+            if preferred and (current is None or current.handedness != wanted):
+                current = min(preferred, key=lambda t: t.id)
+        if current is None and present:
+            if self.policy == "largest":
+                current = max(present, key=lambda t: t.size)
+            else:
+                current = min(present, key=lambda t: t.id)
+        if current is not None:
+            self.switches += self._last_controller is not None and current is not self._last_controller
+            self._last_controller = current
+        self.controller = current
+
+    def reset(self):
+        for track in self.tracks:
+            self._retired_suppressed += track.smoother.suppressed
+        self.tracks = []
+        self.controller = None
+        self._last_controller = None
+
+    @property
+    def suppressed(self):
+        """Actuations the per-hand smoothers held back, over all tracks so far."""
+        return self._retired_suppressed + sum(t.smoother.suppressed for t in self.tracks)
+
+    def stats(self):
+        return {"tracks": len(self.tracks), "ids_issued": self.next_id, "controller_switches": self.switches,
+                "controller": None if self.controller is None else self.controller.id,
+                "suppressed": self.suppressed}
+
@@ -0,0 +1,131 @@
+import numpy as np
+
+# -------------------- Constants --------------------
+HISTORY_CAPACITY = 30 * 60 * 60 * 4  # samples: four hours at 30 FPS (~7 MB for two series)
+CHART_MAX_POINTS = 300               # the browser never holds more than 2x this many points
+
+
+# -------------------- Ring Buffer --------------------
+class RingHistory:
+    """
+    Preallocated time series of `columns` float32 values, overwriting the oldest sample once
+    `capacity` is reached. append() is O(1) and never allocates; `total` counts every sample ever
+    appended, so readers can ask for "everything since sample N" with since().
+    """
+
+    def __init__(self, columns, capacity=HISTORY_CAPACITY):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, len(self.columns)), dtype=np.float32)
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, t, *values):
+        i = self.total % self.capacity
+        self.times[i] = t
+        self.values[i] = values
+        self.total += 1
+
+    def since(self, start):
+        """(times, values) for samples numbered >= start, oldest first (copies)."""
+        start = max(start, self.total - self.capacity)
+        if start >= self.total:
+            return self.times[:0].copy(), self.values[:0].copy()
+        idx = np.arange(start, self.total) % self.capacity
+        return self.times[idx], self.values[idx]
+
+    def snapshot(self):
+        return self.since(0)
+
+    def clear(self):
+        self.total = 0
+
+
+# -------------------- Downsampling --------------------
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points of (x, y) that keep the visual
+    shape of the line (peaks and dips survive, unlike plain striding or averaging).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket is the third triangle vertex
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[b + 1] = a
+    return keep
+
+
+# -------------------- Incremental Chart Feed --------------------
+class ChartFeed:
+    """
+    Keeps a Streamlit line chart in step with a RingHistory without resending it.
+
+    New samples are folded into buckets of `stride` samples (bucket mean) and sent with
+    chart.add_rows(). When the chart reaches 2 * max_points, it is redrawn once from an LTTB
+    downsample of the whole history and the stride doubles accordingly, so full redraws only
+    happen each time the history doubles and the browser holds at most 2 * max_points rows.
+    """
+
+    def __init__(self, chart, history, max_points=CHART_MAX_POINTS, t0=None):
+        self.chart = chart
+        self.history = history
+        self.max_points = max_points
+        self.t0 = t0
+        self.stride = 1
+        self.shown = 0       # rows currently in the chart
+        self.sent_upto = 0   # history.total covered by the chart (complete buckets only)
+        self.redraws = 0
+        self.appends = 0
+
+    def push(self):
+        """Sends whatever is new since the last push; returns the number of rows sent."""
+        history = self.history
+        if self.t0 is None and history.total:
+            self.t0 = history.snapshot()[0][0]
+        if self.shown + (history.total - self.sent_upto) // self.stride >= 2 * self.max_points \
+                or self.sent_upto < history.total - history.capacity:
+            return self.redraw()
+        n_buckets = (history.total - self.sent_upto) // self.stride
+        if n_buckets == 0:
+            return 0
+        t, v = history.since(self.sent_upto)
+        t = t[:n_buckets * self.stride].reshape(n_buckets, self.stride)[:, -1]
+        v = v[:n_buckets * self.stride].reshape(n_buckets, self.stride, -1).mean(axis=1)
+        self.chart.add_rows(self._frame(t, v))
+        self.sent_upto += n_buckets * self.stride
+        self.shown += n_buckets
+        self.appends += 1
+        return n_buckets
+
+    def redraw(self):
+        t, v = self.history.snapshot()
+        keep = lttb(t, v[:, 0], self.max_points) if len(t) else np.arange(0)
+        # Replaces the chart element in place; later add_rows go to the new element
+        self.chart = self.chart.line_chart(self._frame(t[keep], v[keep]))
+        self.shown = len(keep)
+        self.stride = max(1, len(t) // self.max_points)
+        self.sent_upto = self.history.total
+        self.redraws += 1
+        return self.shown
+
+    def stats(self):
+        return {"shown": self.shown, "stride": self.stride, "redraws": self.redraws, "appends": self.appends,
+                "history": len(self.history)}
+
+    def _frame(self, t, v):
+        import pandas as pd
+        index = pd.Index(t - (self.t0 or 0.0), name="seconds")
+        return pd.DataFrame(v, index=index, columns=list(self.history.columns))
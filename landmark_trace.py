@@ -0,0 +1,334 @@
+"""
+Compact landmark traces: record what the pipeline saw and decided, replay it offline.
+
+A trace is a directory of column files in the standard .npy format, appended in chunks:
+
+    frames_t.npy          (F,)        float64  capture time (s)
+    frames_hand_start.npy (F,)        int64    first row of this frame in the hands_* columns
+    frames_n_hands.npy    (F,)        uint8
+    frames_volume.npy     (F,)        int8     committed volume, -1 = no hand
+    frames_gesture.npy    (F,)        int8     gesture code, -1 = no hand
+    frames_distance.npy   (F,)        float32  smoothed thumb-index distance (px)
+    hands_landmarks.npy   (H, 21, 3)  float32  normalized MediaPipe landmarks
+    hands_handedness.npy  (H,)        int8     0 = Left, 1 = Right, -1 = unknown
+    hands_score.npy       (H,)        float32  handedness score
+    meta.json                                  frame size and recording settings
+
+Every column is memory-mapped when read, so million-frame traces replay without loading into RAM.
+
+    python landmark_trace.py info traces/session1
+    python landmark_trace.py replay traces/session1 --pinch-range 20 60 --smoothing kalman
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from gesture_classifier import MIN_CONFIDENCE
+from gesture_core import GESTURES, NUM_LANDMARKS, PINCH_RANGE, hand_metrics
+
+# -------------------- Constants --------------------
+TRACE_VERSION = 1
+CHUNK_FRAMES = 1024
+FLUSH_INTERVAL_S = 2.0  # a partly filled chunk is written at least this often while recording
+NPY_HEADER_BYTES = 128  # fixed, so the shape can be rewritten in place as the file grows
+
+FRAME_COLUMNS = {
+    "frames_t": (np.float64, ()),
+    "frames_hand_start": (np.int64, ()),
+    "frames_n_hands": (np.uint8, ()),
+    "frames_volume": (np.int8, ()),
+    "frames_gesture": (np.int8, ()),
+    "frames_distance": (np.float32, ()),
+}
+HAND_COLUMNS = {
+    "hands_landmarks": (np.float32, (NUM_LANDMARKS, 3)),
+    "hands_handedness": (np.int8, ()),
+    "hands_score": (np.float32, ()),
+}
+
+
+# -------------------- Appendable .npy Column --------------------
+class _NpyColumn:
+    """A .npy file whose leading dimension grows; the header is rewritten after every append."""
+
+    def __init__(self, path, dtype, row_shape):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = row_shape
+        self.rows = 0
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False,
+                       "shape": (self.rows,) + self.row_shape})
+        header = header.encode("latin1").ljust(NPY_HEADER_BYTES - 10 - 1) + b"\n"
+        self.file.seek(0)
+        self.file.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header)
+        self.file.seek(0, os.SEEK_END)
+
+    def append(self, rows):
+        self.file.write(np.ascontiguousarray(rows, dtype=self.dtype).tobytes())
+        self.rows += len(rows)
+        self._write_header()
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+# -------------------- Writer --------------------
+class TraceWriter:
+    """
+    Buffers `chunk_frames` frames in preallocated arrays and appends them to the column files
+    in one write per column, so recording costs a few array stores per frame. The buffer is
+    also written once `flush_interval` seconds have passed, so a process that never reaches
+    close() loses at most that much. flush() may be called from another thread.
+    """
+
+    def __init__(self, path, width, height, chunk_frames=CHUNK_FRAMES, flush_interval=FLUSH_INTERVAL_S, **settings):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.flush_interval = flush_interval
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": TRACE_VERSION, "created": time.time(), "width": width, "height": height,
+                       "gestures": list(GESTURES), "settings": settings}, f, indent=2)
+        columns = dict(FRAME_COLUMNS, **HAND_COLUMNS)
+        self.columns = {name: _NpyColumn(os.path.join(path, name + ".npy"), dtype, shape)
+                        for name, (dtype, shape) in columns.items()}
+        # Up to two hands per frame fit in the hand buffers before an early flush
+        self.buffers = {name: np.zeros((chunk_frames,) + shape, dtype=dtype) for name, (dtype, shape) in FRAME_COLUMNS.items()}
+        self.buffers.update({name: np.zeros((2 * chunk_frames,) + shape, dtype=dtype) for name, (dtype, shape) in HAND_COLUMNS.items()})
+        self.frames = 0   # frames written to disk
+        self.hands = 0    # hand rows written to disk
+        self._nf = 0      # frames buffered
+        self._nh = 0      # hand rows buffered
+        self._next_flush = time.perf_counter() + flush_interval
+        self._lock = threading.Lock()
+
+    def record(self, t, landmarks, handedness=None, scores=None, volume=-1, gesture=-1, distance=0.0):
+        with self._lock:
+            self._record(t, landmarks, handedness, scores, volume, gesture, distance)
+            if self.flush_interval and time.perf_counter() >= self._next_flush:
+                self._flush()
+
+    def _record(self, t, landmarks, handedness, scores, volume, gesture, distance):
+        n = len(landmarks)
+        if self._nf == self.chunk_frames or self._nh + n > len(self.buffers["hands_score"]):
+            self._flush()
+        b, i, j = self.buffers, self._nf, self._nh
+        b["frames_t"][i] = t
+        b["frames_hand_start"][i] = self.hands + j
+        b["frames_n_hands"][i] = n
+        b["frames_volume"][i] = -1 if volume is None else volume
+        b["frames_gesture"][i] = -1 if gesture is None else gesture
+        b["frames_distance"][i] = distance
+        if n:
+            b["hands_landmarks"][j:j + n] = landmarks
+            b["hands_handedness"][j:j + n] = -1 if handedness is None else handedness
+            b["hands_score"][j:j + n] = 0.0 if scores is None else scores
+        self._nf += 1
+        self._nh += n
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        self._next_flush = time.perf_counter() + self.flush_interval
+        if not self._nf:
+            return
+        for name in FRAME_COLUMNS:
+            self.columns[name].append(self.buffers[name][:self._nf])
+        for name in HAND_COLUMNS:
+            self.columns[name].append(self.buffers[name][:self._nh])
+        self.frames += self._nf
+        self.hands += self._nh
+        self._nf = self._nh = 0
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            for column in self.columns.values():
+                column.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -------------------- Reader --------------------
+class TraceReader:
+    """Memory-maps every column of a trace; nothing is read until it is indexed."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.columns = {}
+        for name in list(FRAME_COLUMNS) + list(HAND_COLUMNS):
+            file = os.path.join(path, name + ".npy")
+            # An empty column cannot be memory-mapped
+            self.columns[name] = np.load(file, mmap_mode="r") if _npy_rows(file) else np.load(file)
+        self.width = self.meta["width"]
+        self.height = self.meta["height"]
+
+    def __len__(self):
+        return len(self.columns["frames_t"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def frame(self, i):
+        c = self.columns
+        start, n = int(c["frames_hand_start"][i]), int(c["frames_n_hands"][i])
+        return {
+            "t": float(c["frames_t"][i]),
+            "landmarks": np.asarray(c["hands_landmarks"][start:start + n]),
+            "handedness": np.asarray(c["hands_handedness"][start:start + n]),
+            "volume": int(c["frames_volume"][i]),
+            "gesture": int(c["frames_gesture"][i]),
+            "distance": float(c["frames_distance"][i]),
+        }
+
+    def chunks(self, size=65536):
+        """Yields (frame slice, {column: array}) with frame columns for `size` frames at a time."""
+        for lo in range(0, len(self), size):
+            hi = min(lo + size, len(self))
+            yield slice(lo, hi), {name: np.asarray(self.columns[name][lo:hi]) for name in FRAME_COLUMNS}
+
+
+def _npy_rows(path):
+    with open(path, "rb") as f:
+        np.lib.format.read_magic(f)
+        shape, _, _ = np.lib.format.read_array_header_1_0(f)
+    return shape[0]
+
+
+# -------------------- Replay --------------------
+def replay(reader, tracker, pinch_range=PINCH_RANGE, classifier=None, min_confidence=MIN_CONFIDENCE, chunk=65536):
+    """
+    Re-runs hand tracking -> distance -> smoothing -> volume/gesture over a trace, with the same
+    HandTracker control policy as GestureEngine. Returns (volume, gesture) int8 arrays of the
+    controlling hand per frame, -1 = no hand.
+    """
+    volume = np.full(len(reader), -1, dtype=np.int8)
+    gesture = np.full(len(reader), -1, dtype=np.int8)
+    for frames, cols in reader.chunks(chunk):
+        starts = cols["frames_hand_start"]
+        counts = cols["frames_n_hands"].astype(np.int64)
+        lo = int(starts[0])
+        hi = int(starts[-1] + counts[-1])
+        hands = np.asarray(reader["hands_landmarks"][lo:hi])
+        handedness = np.asarray(reader["hands_handedness"][lo:hi])
+        # The geometry (and classifier) is one batched pass per chunk; tracking and filters run per frame
+        hm = hand_metrics(hands, reader.width, reader.height, pinch_range)
+        codes, confidence = classifier.predict(hands) if classifier is not None else (None, None)
+        times = cols["frames_t"]
+        for row in range(len(times)):
+            a = int(starts[row]) - lo
+            b = a + int(counts[row])
+            tracks = tracker.update(hands[a:b], handedness[a:b])
+            for k, track in enumerate(tracks, a):
+                track.update(hm.distance[k], times[row])
+                if codes is not None:
+                    track.classify(codes[k], confidence[k], min_confidence)
+            control = tracker.controller
+            if control is not None:
+                volume[frames.start + row] = control.volume
+                gesture[frames.start + row] = control.gesture if codes is None else control.classified
+    return volume, gesture
+
+
+# -------------------- CLI --------------------
+def cmd_info(args):
+    reader = TraceReader(args.trace)
+    t = reader["frames_t"]
+    n_hands = reader["frames_n_hands"]
+    duration = float(t[-1] - t[0]) if len(t) > 1 else 0.0
+    print(f"{args.trace}: {len(reader)} frames, {len(reader['hands_score'])} hands, {duration:.1f} s, "
+          f"{reader.width}x{reader.height}")
+    print(f"Frames with hands: {int(np.count_nonzero(n_hands))}")
+    recorded = reader["frames_gesture"]
+    for code, name in enumerate(GESTURES):
+        print(f"  {name:<12} {int(np.count_nonzero(np.asarray(recorded) == code))}")
+    return 0
+
+
+def cmd_replay(args):
+    from hand_tracker import HandTracker
+    from smoothing import DistanceSmoother, make_filter
+
+    reader = TraceReader(args.trace)
+    tracker = HandTracker(
+        lambda: DistanceSmoother(make_filter(args.smoothing), volume_band=args.volume_band,
+                                 gesture_band=args.gesture_band, pinch_range=tuple(args.pinch_range)),
+        policy=args.policy,
+    )
+    classifier = None
+    if args.gesture_model:
+        from gesture_classifier import GestureClassifier
+        classifier = GestureClassifier.load(args.gesture_model)
+    t0 = time.perf_counter()
+    volume, gesture = replay(reader, tracker, tuple(args.pinch_range), classifier)
+    elapsed = time.perf_counter() - t0
+
+    recorded_volume = np.asarray(reader["frames_volume"])
+    recorded_gesture = np.asarray(reader["frames_gesture"])
+    present = recorded_gesture >= 0
+    report = {
+        "frames": len(reader),
+        "elapsed_s": elapsed,
+        "frames_per_s": len(reader) / elapsed if elapsed > 0 else 0.0,
+        "gesture_changed": int(np.count_nonzero(gesture[present] != recorded_gesture[present])),
+        "volume_changed": int(np.count_nonzero(volume[present] != recorded_volume[present])),
+        "mean_abs_volume_delta": float(np.abs(volume[present].astype(np.int16) - recorded_volume[present]).mean())
+        if present.any() else 0.0,
+        "tracking": tracker.stats(),
+        "gestures": {name: int(np.count_nonzero(gesture == code)) for code, name in enumerate(GESTURES)},
+    }
+    print(f"Replayed {report['frames']} frames in {elapsed:.2f}s ({report['frames_per_s']:.0f} frames/s)")
+    print(f"Differs from recording: gesture on {report['gesture_changed']} frames, "
+          f"volume on {report['volume_changed']} (mean |delta| {report['mean_abs_volume_delta']:.1f}%)")
+    print(f"Gestures: {report['gestures']}  Tracking: {report['tracking']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def main(argv=None):
+    from hand_tracker import CONTROL_POLICIES
+    from smoothing import SMOOTHING_FILTERS
+
+    parser = argparse.ArgumentParser(description="Inspect and replay landmark traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info = sub.add_parser("info", help="summarise a trace")
+    info.add_argument("trace")
+    info.set_defaults(func=cmd_info)
+
+    rp = sub.add_parser("replay", help="re-run the volume/gesture logic with other settings")
+    rp.add_argument("trace")
+    rp.add_argument("--pinch-range", type=int, nargs=2, default=PINCH_RANGE, metavar=("LOW", "HIGH"))
+    rp.add_argument("--smoothing", default="one_euro", choices=SMOOTHING_FILTERS)
+    rp.add_argument("--volume-band", type=int, default=5)
+    rp.add_argument("--gesture-band", type=float, default=5.0)
+    rp.add_argument("--policy", default="first", choices=CONTROL_POLICIES, help="which hand drives the volume")
+    rp.add_argument("--gesture-model", default=None, help="classify with this gesture_train.py model")
+    rp.add_argument("--output", default=None, help="write the JSON report here")
+    rp.set_defaults(func=cmd_replay)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,4 @@
 import streamlit as st
-import cv2
-import mediapipe as mp
-import math
-from PIL import Image
-import numpy as np
-import time
-
-# ---------------------- Gesture Detection Setup ----------------------
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-
-def calculate_distance(p1, p2):
-    return math.hypot(p2[0]-p1[0], p2[1]-p1[1])
 
 # ---------------------- Thresholds ----------------------
 PINCH_THRESHOLD = (20, 50)
@@ -38,51 +25,58 @@ with col2:
     distance_placeholder = st.empty()
     progress_bar = st.progress(0)
 
-# Camera + MediaPipe
-cap = cv2.VideoCapture(0)
-hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
-
 frame_placeholder = col1.empty()
 
 running = start_btn
 
-while running:
-    ret, frame = cap.read()
-    if not ret:
-        st.error("Failed to access camera.")
-        break
+# Heavy imports, the model and the camera load only after the layout has painted
+if running:
+    import cv2
+    import mediapipe as mp
+    from capture import open_capture
+    from gesture_core import hand_metrics, landmarks_to_array
+    from overlay import DEFAULT_STYLE, draw_overlay
+
+    # ---------------------- Gesture Detection Setup ----------------------
+    mp_hands = mp.solutions.hands
+    overlay_style = DEFAULT_STYLE._replace(thumb=(0, 0, 255), index=(0, 255, 0), pinch_line=(255, 0, 255), line_thickness=3)
+
+    # Camera + MediaPipe
+    cap = open_capture(0)
+    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+
+    while running:
+        ret, frame = cap.read()
+        if not ret:
+            st.error("Failed to access camera.")
+            break
     
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
+        frame = cv2.flip(frame, 1)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        result = hands.process(rgb)
 
-    gesture_state = "None"
-    distance_val = 0
+        gesture_state = "None"
+        distance_val = 0
 
-    if result.multi_hand_landmarks:
-        for hand_landmarks in result.multi_hand_landmarks:
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        if result.multi_hand_landmarks:
             h, w, _ = frame.shape
-            thumb = (int(hand_landmarks.landmark[4].x * w), int(hand_landmarks.landmark[4].y * h))
-            index = (int(hand_landmarks.landmark[8].x * w), int(hand_landmarks.landmark[8].y * h))
-            
-            cv2.line(frame, thumb, index, (255, 0, 255), 3)
-            cv2.circle(frame, thumb, 10, (0, 0, 255), -1)
-            cv2.circle(frame, index, 10, (0, 255, 0), -1)
-
-            distance_val = int(calculate_distance(thumb, index))
+            hm = hand_metrics(landmarks_to_array(result.multi_hand_landmarks), w, h, pinch_range=PINCH_THRESHOLD)
+            # Classified from the whole-pixel distance, with this page's own labels
+            distance_val = int(hm.distance[-1])
             gesture_state = "Pinch" if PINCH_THRESHOLD[0] <= distance_val <= PINCH_THRESHOLD[1] else \
                             "Open Hand" if distance_val > OPEN_THRESHOLD else "Closed"
 
-    # Display Distance
-    distance_placeholder.markdown(f"**Distance:** {distance_val} px")
-    progress_bar.progress(min(distance_val, 100) / 100)
+            draw_overlay(frame, hm.points, "full", overlay_style)
+
+        # Display Distance
+        distance_placeholder.markdown(f"**Distance:** {distance_val} px")
+        progress_bar.progress(min(distance_val, 100) / 100)
 
-    # Show Frame
-    frame_placeholder.image(frame, channels="BGR")
+        # Show Frame
+        frame_placeholder.image(frame, channels="BGR")
 
-    # Stop logic
-    if stop_btn:
-        running = False
+        # Stop logic
+        if stop_btn:
+            running = False
 
-cap.release()
+    cap.release()
@@ -1,20 +1,9 @@
-import cv2
-import mediapipe as mp
-import math
-import pyautogui
 import streamlit as st
-import numpy as np
-from collections import deque
-from PIL import Image
+import time
 
 # -------------------- Constants --------------------
-MAX_HISTORY = 50
-
-# -------------------- Hand Detection --------------------
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-
-hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+CHART_MAX_POINTS = 300  # history is LTTB-downsampled to this many rows; the chart never holds 2x more
+CHART_REFRESH_HZ = 5    # chart appends per second; history itself records every frame
 
 # -------------------- Streamlit UI --------------------
 st.set_page_config(page_title="Gesture-Based Volume Control", layout="wide")
@@ -31,19 +20,13 @@ start_btn = col2.button("▶ Start")
 pause_btn = col2.button("⏸ Pause")
 vol_text = col2.empty()
 dist_text = col2.empty()
-vol_chart = col2.line_chart(np.zeros(MAX_HISTORY))
+vol_chart = col2.line_chart()
 dist_progress = col2.progress(0)
 
 # -------------------- Variables --------------------
 running = False
-prev_level = None
-volume_history = deque(maxlen=MAX_HISTORY)
 dist_val = 0
 
-# -------------------- Distance Function --------------------
-def calculate_distance(p1, p2):
-    return math.hypot(p2[0]-p1[0], p2[1]-p1[1])
-
 # -------------------- Start / Pause --------------------
 if start_btn:
     running = True
@@ -51,68 +34,96 @@ if start_btn:
 if pause_btn:
     running = False
 
-# -------------------- OpenCV Capture --------------------
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    st.error("Cannot open webcam")
-    st.stop()
-
-# -------------------- Main Loop --------------------
-while running:
-    ret, frame = cap.read()
-    if not ret:
-        st.warning("Failed to capture frame")
-        break
-
-    frame = cv2.flip(frame, 1)
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
-
-    volume_level = 0
-
-    if result.multi_hand_landmarks:
-        for hand_landmarks in result.multi_hand_landmarks:
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-            x1, y1 = int(hand_landmarks.landmark[4].x * w), int(hand_landmarks.landmark[4].y * h)
-            x2, y2 = int(hand_landmarks.landmark[8].x * w), int(hand_landmarks.landmark[8].y * h)
-
-            cv2.circle(frame, (x1, y1), 10, (255, 0, 0), -1)
-            cv2.circle(frame, (x2, y2), 10, (0, 255, 0), -1)
-            cv2.line(frame, (x1, y1), (x2, y2), (0, 255, 255), 4)
-
-            dist = calculate_distance((x1, y1), (x2, y2))
-            dist_val = int(dist)
-
-            volume_level = int(((dist - 20) / (200 - 20)) * 100)
-            volume_level = max(0, min(volume_level, 100))
-
-            if prev_level is None or abs(volume_level - prev_level) > 5:
-                if prev_level is not None:
-                    if volume_level > prev_level:
-                        pyautogui.press("volumeup")
-                    else:
-                        pyautogui.press("volumedown")
-                prev_level = volume_level
-
-    # -------------------- Update Streamlit UI --------------------
-    vol_text.markdown(f"**Volume:** {volume_level}%")
-    dist_text.markdown(f"**Distance:** {dist_val} px")
-    dist_progress.progress(min(dist_val, 100))
-
-    volume_history.append(volume_level)
-    vol_chart.line_chart(np.array(volume_history))
-
-    # Show frame
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    image = Image.fromarray(frame_rgb)
-    video_display.image(image)
-
-    # Stop button check
-    if pause_btn:
-        running = False
-        break
-
-# -------------------- Cleanup --------------------
-cap.release()
+# -------------------- Lazy Setup --------------------
+# Heavy imports, the model and the camera load only after the layout has painted
+if running:
+    import cv2
+    import mediapipe as mp
+    from actuator import VolumeActuator, default_backend
+    from capture import open_capture
+    from gesture_core import hand_metrics, handedness_arrays, landmarks_to_array
+    from hand_tracker import HandTracker
+    from history import ChartFeed, RingHistory
+    from overlay import DEFAULT_STYLE, draw_overlay
+    from ui_refresh import RateLimiter
+
+    # -------------------- Hand Detection --------------------
+    mp_hands = mp.solutions.hands
+    overlay_style = DEFAULT_STYLE._replace(thumb=(255, 0, 0), index=(0, 255, 0), pinch_line=(0, 255, 255))
+
+    hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+    volume_actuator = VolumeActuator(default_backend())
+    hand_tracker = HandTracker()  # stable per-hand IDs + smoothing; one hand drives the volume
+
+    # -------------------- History --------------------
+    # Preallocated ring kept across reruns, so Pause/Start does not lose the session's history
+    if "history" not in st.session_state:
+        st.session_state["history"] = RingHistory(("volume", "distance"))
+    chart_feed = ChartFeed(vol_chart, st.session_state["history"], CHART_MAX_POINTS)
+    chart_feed.redraw()
+    chart_refresh = RateLimiter(CHART_REFRESH_HZ)
+
+    # -------------------- OpenCV Capture --------------------
+    cap = open_capture(0)
+    if not cap.isOpened():
+        st.error("Cannot open webcam")
+        st.stop()
+
+    # -------------------- Main Loop --------------------
+    volume_actuator.start()
+
+    try:
+        while running:
+            ret, frame = cap.read()
+            if not ret:
+                st.warning("Failed to capture frame")
+                break
+
+            frame = cv2.flip(frame, 1)
+            h, w, _ = frame.shape
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = hands.process(rgb)
+
+            volume_level = 0
+
+            # The tracker sees every frame, empty ones included, so tracks of hands that left
+            # the view age out after MAX_MISSED frames and control is handed on
+            landmarks = landmarks_to_array(result.multi_hand_landmarks)
+            hm = hand_metrics(landmarks, w, h)
+            now = time.perf_counter()
+            for track, raw in zip(hand_tracker.update(landmarks, handedness_arrays(result)[0]), hm.distance):
+                track.update(raw, now)
+            control = hand_tracker.controller
+
+            if control is not None:
+                dist_val = int(control.distance)
+                volume_level = control.volume
+                volume_actuator.set_target(volume_level)
+
+                draw_overlay(frame, hm.points, "full", overlay_style)
+
+            # -------------------- Update Streamlit UI --------------------
+            vol_text.markdown(f"**Volume:** {volume_level}%")
+            dist_text.markdown(f"**Distance:** {dist_val} px")
+            dist_progress.progress(min(dist_val, 100))
+
+            # Chart only receives new (bucketed) rows, never the whole history
+            now = time.perf_counter()
+            chart_feed.history.append(now, volume_level, dist_val)
+            if chart_refresh.ready(now):
+                chart_feed.push()
+
+            # Show frame
+            video_display.image(frame, channels="BGR")
+
+            # Stop button check
+            if pause_btn:
+                running = False
+                break
+    finally:
+        # Streamlit interrupts the script on rerun; stop the actuator thread with it
+        volume_actuator.stop()
+
+    # -------------------- Cleanup --------------------
+    cap.release()
 st.info("Camera stopped")
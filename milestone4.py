@@ -1,10 +1,8 @@
-import cv2
-import mediapipe as mp
-import math
-import pyautogui
+import os
 import streamlit as st
-import numpy as np
-from PIL import Image
+import time
+from app_settings import ENGINE_CONFIG
+from ui_refresh import ChangeDrivenUI, RateLimiter
 
 # -------------------- Streamlit UI Configuration --------------------
 st.set_page_config(
@@ -121,22 +119,34 @@ st.markdown("""
 
 # -------------------- Constants and Setup --------------------
 MAX_HISTORY = 50
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-hands = mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+METRICS_PATH = "perf_metrics.json"
+METRICS_WRITE_INTERVAL = 1.0  # seconds between metric file dumps
+UI_REFRESH_HZ = 10              # metrics/gesture panel refresh rate (processing runs at camera rate)
+PREVIEW_MODE = "jpeg"           # "jpeg" = encode once with cv2.imencode, "bgr" = send the raw pixel buffer
+PREVIEW_MAX_WIDTH = 640         # px, preview is downscaled to this width
+PREVIEW_JPEG_QUALITY = 70
+PREVIEW_FPS = 15                # preview frame cap, independent of the control loop
+PROFILE_FRAMES = 300     # frames per on-demand profile capture (or set GESTURE_PROFILE=<frames>)
+PROFILE_SAMPLE = False   # also run the sampling profiler during a capture
+TIMED_STAGES = ["capture", "preprocess", "inference", "landmarks", "classify", "smoothing", "actuation",
+                "actuation_os", "drawing", "ui_push", "end_to_end"]
+
+
+# -------------------- Persistent Gesture Engine --------------------
+# Built once per process: Start/Pause reruns reuse the warm model, camera and control state.
+# Usually frontpage.py has already built and warmed it in the background (prewarm.py); otherwise
+# cv2/mediapipe are imported here, after the layout has painted, not at page load.
+# Engine settings are in app_settings.py so the landing page warms an identical engine.
+@st.cache_resource
+def get_engine():
+    from prewarm import take_engine
+    return take_engine(ENGINE_CONFIG)
 
 
 # -------------------- Variables --------------------
 running = False
-prev_level = None
 dist_val = 0
 volume_level = 0
-response_time_ms = 15 
-
-# -------------------- Distance Function --------------------
-def calculate_distance(p1, p2):
-    return math.hypot(p2[0]-p1[0], p2[1]-p1[1])
-
 
 
 col1, col2 = st.columns([1,1.5]) 
@@ -192,11 +202,9 @@ with col2:
     with metric_col_v:
         volume_metric_placeholder = st.empty()
         
-    # Accuracy Metric (Static Display)
+    # Accuracy Metric (measured held-out accuracy of the gesture model)
     with metric_col_a:
-        st.markdown('<div class="accuracy-metric">', unsafe_allow_html=True)
-        st.metric(label="✅ Model Accuracy", value="98.5%", delta="Stable") 
-        st.markdown('</div>', unsafe_allow_html=True)
+        accuracy_metric_placeholder = st.empty()
 
     # 2. Secondary Metrics (Distance & Response Time)
     metric_col_d, metric_col_t = st.columns(2)
@@ -206,6 +214,16 @@ with col2:
     
     with metric_col_t:
         latency_metric_placeholder = st.empty()
+
+    # 3. Pipeline Stage Stats (queue depth & dropped frames)
+    pipeline_stats_placeholder = st.empty()
+
+    # 4. Per-Stage Latency Percentiles & FPS
+    stage_latency_placeholder = st.empty()
+
+    # 5. On-demand profile capture (Chrome trace of the next PROFILE_FRAMES frames)
+    profile_btn = st.button("🧪 Capture Profile")
+    profile_status = st.empty()
         
 # ------------------ METRICS INITIALIZATION ------------------
 
@@ -215,130 +233,223 @@ with volume_metric_placeholder.container():
     st.metric(label="🔊 Current Volume", value="--%", delta="Paused")
     st.markdown('</div>', unsafe_allow_html=True)
 
-# 2. Distance Metric Initialization
+# 2. Accuracy Metric Initialization
+def render_accuracy_metric(accuracy):
+    with accuracy_metric_placeholder.container():
+        st.markdown('<div class="accuracy-metric">', unsafe_allow_html=True)
+        if accuracy is None:
+            st.metric(label="✅ Model Accuracy", value="n/a", delta="Distance rules", delta_color="off")
+        else:
+            st.metric(label="✅ Model Accuracy", value=f"{accuracy * 100:.1f}%", delta="Held-out", delta_color="off")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+render_accuracy_metric(None)
+
+# 3. Distance Metric Initialization
 with distance_metric_placeholder.container():
     st.markdown('<div class="secondary-metric">', unsafe_allow_html=True)
     st.metric(label="📏 Finger Distance", value="-- px")
     st.markdown('</div>', unsafe_allow_html=True)
 
-# 3. Latency Metric Initialization
+# 4. Latency Metric Initialization
 with latency_metric_placeholder.container():
     st.markdown('<div class="secondary-metric">', unsafe_allow_html=True)
-    st.metric(label="⏱️ Response Time", value=f"{response_time_ms} ms", delta_color="off")
+    st.metric(label="⏱️ Response Time", value="-- ms", delta_color="off")
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-# -------------------- Start/Pause Logic --------------------
+def profile_caption(profiler):
+    if profiler.active:
+        done, target = profiler.progress()
+        return f"Profiling: {done}/{target} frames"
+    if profiler.last_path:
+        return f"Profile written to {profiler.last_path} (open in ui.perfetto.dev or chrome://tracing)"
+    return ""
 
-if start_btn:
-    running = True
-if pause_btn:
-    running = False
 
-# -------------------- OpenCV Capture --------------------
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    st.error("Cannot open webcam")
-    st.stop()
+def format_pipeline_stats(stats):
+    return " | ".join(
+        f"{stage}: depth {s.get('depth', 0)}, dropped {s.get('dropped', 0)}"
+        for stage, s in stats.items() if stage != "render"
+    )
 
-# -------------------- Main Loop --------------------
-while running:
-    ret, frame = cap.read()
-    if not ret:
-        st.warning("Failed to capture frame")
-        break
-
-    frame = cv2.flip(frame, 1)
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
-
-    volume_level = 0
-    dist_val = 0
-    gesture_state = {"Open Hand": False, "Pinch": False, "Closed Hand": False}
-
-    if result.multi_hand_landmarks:
-        for hand_landmarks in result.multi_hand_landmarks:
-            # Drawing landmarks
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                   mp_draw.DrawingSpec(color=(255, 0, 255), thickness=2, circle_radius=2),
-                                   mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2))
-            
-            x1, y1 = int(hand_landmarks.landmark[4].x * w), int(hand_landmarks.landmark[4].y * h)
-            x2, y2 = int(hand_landmarks.landmark[8].x * w), int(hand_landmarks.landmark[8].y * h)
-
-            # Drawing circles and line
-            cv2.circle(frame, (x1, y1), 10, (10, 215, 255), -1) 
-            cv2.circle(frame, (x2, y2), 10, (255, 87, 51), -1) 
-            cv2.line(frame, (x1, y1), (x2, y2), (255, 0, 255), 4) 
-
-            dist = calculate_distance((x1, y1), (x2, y2))
-            dist_val = int(dist)
-
-            # Volume mapping
-            volume_level = int(((dist - 20) / (200 - 20)) * 100)
-            volume_level = max(0, min(volume_level, 100))
-
-            # PyAutoGUI volume control logic
-            if prev_level is None or abs(volume_level - prev_level) > 5:
-                if prev_level is not None:
-                    if volume_level > prev_level:
-                        pyautogui.press("volumeup")
-                    else:
-                        pyautogui.press("volumedown")
-                prev_level = volume_level
-
-            # ---- Gesture Detection ----
-            gesture_state["Open Hand"] = dist > 80
-            gesture_state["Pinch"] = 20 <= dist <= 80
-            gesture_state["Closed Hand"] = dist < 20
-
-    # -------------------- Update Gesture Panel --------------------
-    for g, active in gesture_state.items():
-        color_map = {"Open Hand": "#FFD700", "Pinch": "#58A6FF", "Closed Hand": "#E34C4C"} 
-        active_bg = color_map[g]
-        active_text = "#0d1117" 
-        inactive_bg = "#30363d" 
-        inactive_text = "#8b949e" 
-        bg = active_bg if active else inactive_bg
-        text_color = active_text if active else inactive_text
-        emoji = "✋" if g=="Open Hand" else "🤏" if g=="Pinch" else "✊"
-        
-        gesture_placeholders[g].markdown(
-            f"<div style='background-color:{bg};padding:12px 15px;border-radius:25px;color:{text_color};font-weight:700;text-align:center;margin-bottom:10px; border: 2px solid {active_bg if active else inactive_bg};'>"
-            f"{emoji} {g}</div>",
-            unsafe_allow_html=True
-        )
 
-    # -------------------- Update Performance Metrics (Dynamic) --------------------
-    
-    # 1. Volume Metric 
-    with volume_metric_placeholder.container(): 
+# -------------------- Change-Driven Panel Rendering --------------------
+GESTURE_COLORS = {"Open Hand": "#FFD700", "Pinch": "#58A6FF", "Closed Hand": "#E34C4C"}
+GESTURE_EMOJI = {"Open Hand": "✋", "Pinch": "🤏", "Closed Hand": "✊"}
+
+
+def gesture_badge_html(g, active):
+    active_bg = GESTURE_COLORS[g]
+    bg = active_bg if active else "#30363d"
+    text_color = "#0d1117" if active else "#8b949e"
+    return (
+        f"<div style='background-color:{bg};padding:12px 15px;border-radius:25px;color:{text_color};font-weight:700;text-align:center;margin-bottom:10px; border: 2px solid {bg};'>"
+        f"{GESTURE_EMOJI[g]} {g}</div>"
+    )
+
+
+# Badges only ever take six forms, so build them once
+GESTURE_BADGES = {(g, active): gesture_badge_html(g, active) for g in GESTURE_COLORS for active in (False, True)}
+
+
+def gesture_badge_renderer(g):
+    return lambda active: gesture_placeholders[g].markdown(GESTURE_BADGES[(g, active)], unsafe_allow_html=True)
+
+
+gesture_renderers = {g: gesture_badge_renderer(g) for g in GESTURE_COLORS}
+
+
+def render_volume_metric(volume_level):
+    with volume_metric_placeholder.container():
         st.markdown('<div class="volume-metric">', unsafe_allow_html=True)
         st.metric(label="🔊 Current Volume", value=f"{volume_level}%", delta="Control")
         st.markdown('</div>', unsafe_allow_html=True)
-        
-    # 2. Distance Metric
-    with distance_metric_placeholder.container(): 
+
+
+def render_distance_metric(dist_val):
+    with distance_metric_placeholder.container():
         st.markdown('<div class="secondary-metric">', unsafe_allow_html=True)
         st.metric(label="📏 Finger Distance", value=f"{dist_val} px")
         st.markdown('</div>', unsafe_allow_html=True)
 
-    # 3. Latency Metric (Response Time)
-    with latency_metric_placeholder.container(): 
+
+def render_latency_metric(response):
+    # Response Time, measured capture -> render
+    p50, p95 = response
+    with latency_metric_placeholder.container():
         st.markdown('<div class="secondary-metric">', unsafe_allow_html=True)
-        st.metric(label="⏱️ Response Time", value=f"{response_time_ms} ms", delta_color="off")
+        st.metric(label="⏱️ Response Time", value=f"{p50} ms", delta=f"p95 {p95} ms", delta_color="off")
         st.markdown('</div>', unsafe_allow_html=True)
 
-    # -------------------- Show Webcam --------------------
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    image = Image.fromarray(frame_rgb)
-    video_display.image(image, use_container_width=True) 
 
-    # Stop button check
-    if pause_btn:
-        running = False
-        break
+# -------------------- Thin-Client Mode --------------------
+# With GESTURE_DAEMON_SOCKET set, a running gesture_daemon.py owns the camera, model and
+# volume; this page only mirrors its state stream and never builds a local engine.
+DAEMON_SOCKET = os.environ.get("GESTURE_DAEMON_SOCKET")
+
+
+def run_thin_client(path):
+    from gesture_daemon import DaemonClient
+    try:
+        client = DaemonClient(path)
+    except OSError as e:
+        st.error(f"Cannot connect to gesture daemon at {path}: {e}")
+        return
+    video_display.info("Thin-client mode: video runs in the gesture daemon, not in this page.")
+    ui = ChangeDrivenUI()
+    ui_refresh = RateLimiter(UI_REFRESH_HZ)
+    try:
+        while True:
+            msg = client.read()
+            if msg is None or msg["type"] != "state" or not ui_refresh.ready():
+                continue
+            for g in GESTURE_COLORS:
+                ui.update(g, msg["gesture"] == g, gesture_renderers[g])
+            if msg["hands"]:
+                ui.update("volume", msg["volume"], render_volume_metric)
+                ui.update("distance", msg["distance"], render_distance_metric)
+            ui.update("pipeline", f"daemon frame {msg['seq']} | hands: {msg['hands']}", pipeline_stats_placeholder.caption)
+    except ConnectionError as e:
+        st.warning(str(e))
+    finally:
+        client.close()
+
+
+if DAEMON_SOCKET:
+    run_thin_client(DAEMON_SOCKET)
+    st.stop()
+
+
+# -------------------- Engine (lazy) --------------------
+engine = get_engine()
+metrics = engine.metrics
+render_accuracy_metric(engine.model_accuracy)
+
+from governor import describe
+from perf_metrics import format_table
+from preview import PreviewEncoder
+
+if profile_btn:
+    engine.profiler.arm(PROFILE_FRAMES, sample=PROFILE_SAMPLE)
+profile_status.caption(profile_caption(engine.profiler))
+
+# -------------------- Start/Pause Logic --------------------
+# Buttons only queue a command; the engine applies it without rebuilding anything
+if start_btn:
+    st.session_state["engine_command"] = "start"
+if pause_btn:
+    st.session_state["engine_command"] = "pause"
+
+engine_command = st.session_state.pop("engine_command", None)
+if engine_command is not None and not engine.command(engine_command):
+    st.error("Cannot open webcam")
+    st.stop()
+
+running = engine.active
+capture = engine.capture_info()
+capture_caption = "" if capture is None or "width" not in capture else (
+    f" | camera {capture['width']}x{capture['height']} {capture['fourcc'] or '?'} @ {capture['fps']:.0f} FPS, "
+    f"buffer {capture['buffer_size'] or '?'}"
+)
+
 
-# -------------------- Cleanup --------------------
-cap.release()
+# -------------------- Main Loop (Render / UI Consumer) --------------------
+# Capture, inference and actuation keep running in the engine's threads; this loop only renders
+ui = ChangeDrivenUI()
+ui_refresh = RateLimiter(UI_REFRESH_HZ)
+preview = PreviewEncoder(PREVIEW_MODE, PREVIEW_MAX_WIDTH, PREVIEW_JPEG_QUALITY, PREVIEW_FPS, channels="RGB")
+last_metrics_write = 0.0
+
+while running:
+    packet = engine.get(timeout=1.0, preview=True)
+    if packet is None:
+        if not engine.active:
+            if engine.error:
+                st.warning(engine.error)
+            break
+        continue
+
+    frame = packet.output["frame"]
+    volume_level = packet.output["volume_level"]
+    dist_val = packet.output["dist_val"]
+    gesture_state = packet.output["gesture_state"]
+    ui_start = time.perf_counter()
+
+    # Panels refresh at UI_REFRESH_HZ, and each widget only when its value changed
+    if ui_refresh.ready(ui_start):
+        # -------------------- Update Gesture Panel --------------------
+        for g, active in gesture_state.items():
+            ui.update(g, active, gesture_renderers[g])
+
+        # -------------------- Update Performance Metrics (Dynamic) --------------------
+        ui.update("volume", volume_level, render_volume_metric)
+        ui.update("distance", dist_val, render_distance_metric)
+
+        response_p50 = metrics.percentile("end_to_end", 50)
+        response_p95 = metrics.percentile("end_to_end", 95)
+        if response_p50 is not None:
+            ui.update("latency", (round(response_p50), round(response_p95)), render_latency_metric)
+
+        # 4. Pipeline queue depth / drop counts
+        ui.update("pipeline", format_pipeline_stats(engine.stats())
+                  + f" | suppressed actuations: {engine.tracker.suppressed}"
+                  + f" | control switches: {engine.tracker.switches}" + capture_caption
+                  + (f" | {describe(engine.operating_point())}" if engine.governor is not None else ""),
+                  pipeline_stats_placeholder.caption)
+        ui.update("profile", profile_caption(engine.profiler), profile_status.caption)
+
+    # -------------------- Show Webcam --------------------
+    preview.show(video_display, frame, ui_start)
+    engine.release(packet)  # the RGB buffer goes back to the engine's pool
+    metrics.record("ui_push", (time.perf_counter() - ui_start) * 1000.0)
+    metrics.frame_done(packet.t_capture)
+
+    # 5. Stage latency histogram summary + scrapeable dump
+    if ui_start - last_metrics_write >= METRICS_WRITE_INTERVAL:
+        summary = metrics.write(METRICS_PATH)
+        stage_latency_placeholder.markdown(
+            f"**FPS:** {summary['fps']:.1f}\n\n" + format_table(summary, TIMED_STAGES)
+        )
+        last_metrics_write = ui_start
@@ -0,0 +1,354 @@
+"""
+Multi-camera mode: one host drives several gesture stations.
+
+Each source gets a capture thread in the main process that writes frames into a
+multiprocessing.shared_memory ring buffer; inference runs in a pool of worker
+processes (each with its own MediaPipe Hands and HandTracker per stream), so frames
+are never pickled and throughput scales with cores instead of being capped by the GIL.
+Capture starts only once every worker has built its models, and video files are
+paced to their recorded frame rate so they behave like the cameras they stand in for.
+
+    python multistream.py 0 1 2 --workers 3 --duration 60
+    python multistream.py station_a.mp4 station_b.mp4 --workers 2 --output multi.json
+"""
+import argparse
+import json
+import multiprocessing as mp_proc
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from capture import open_capture
+from perf_metrics import LatencyTracker
+
+# -------------------- Constants --------------------
+RING_SLOTS = 4
+STOP = None
+FILE_FPS = 30.0          # pacing for frame directories / files whose header has no frame rate
+READY_TIMEOUT_S = 60.0   # workers import MediaPipe and build one Hands per stream before capture starts
+
+
+# -------------------- Shared-Memory Frame Ring --------------------
+class SharedFrameRing:
+    """
+    Fixed ring of `slots` frames in one shared-memory block.
+
+    Layout: [latest seq][per-slot seq x slots][per-slot capture time x slots][frames].
+    The writer fills a slot, then publishes its seq; readers copy the newest slot out and
+    re-check its seq to detect a frame overwritten mid-copy.
+    """
+
+    def __init__(self, shape, slots=RING_SLOTS, name=None, create=True):
+        self.shape = tuple(shape)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape))
+        header_bytes = 8 * (1 + 2 * slots)
+        if create:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_bytes + frame_bytes * slots)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = create
+        buf = self.shm.buf
+        self.latest = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=0)
+        self.seqs = np.ndarray((slots,), dtype=np.int64, buffer=buf, offset=8)
+        self.times = np.ndarray((slots,), dtype=np.float64, buffer=buf, offset=8 * (1 + slots))
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=buf, offset=header_bytes)
+        if create:
+            self.latest[0] = -1
+            self.seqs[:] = -1
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        return {"name": self.name, "shape": self.shape, "slots": self.slots}
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(spec["shape"], spec["slots"], name=spec["name"], create=False)
+
+    def write(self, seq, frame, t_capture):
+        slot = seq % self.slots
+        self.seqs[slot] = -1  # invalidate first so a reader mid-copy sees the overwrite
+        np.copyto(self.frames[slot], frame)
+        self.times[slot] = t_capture
+        self.seqs[slot] = seq
+        self.latest[0] = seq
+
+    def read_latest(self, out):
+        """Copies the newest frame into `out`; returns (seq, t_capture) or None if nothing valid."""
+        seq = int(self.latest[0])
+        if seq < 0:
+            return None
+        slot = seq % self.slots
+        np.copyto(out, self.frames[slot])
+        if self.seqs[slot] != seq:
+            return None
+        return seq, float(self.times[slot])
+
+    def close(self):
+        # Drop the numpy views before closing the mapping
+        self.latest = self.seqs = self.times = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# -------------------- Worker Process --------------------
+def inference_worker(jobs, results, ring_specs, ready, flip=True):
+    """
+    Serves the streams in `ring_specs` ({stream_id: ring spec}, the ones pinned to this worker).
+    Everything per stream is built up front and run once on a blank frame (MediaPipe initializes
+    its graph lazily, on the first process() call), then `ready` is set so capture can start.
+    """
+    import mediapipe as mp
+    from gesture_core import hand_metrics, handedness_arrays, landmarks_to_array
+    from hand_tracker import HandTracker
+    from smoothing import DistanceSmoother, make_filter
+
+    rings, buffers, hands, trackers, last_seq = {}, {}, {}, {}, {}
+    for stream_id, spec in ring_specs.items():
+        rings[stream_id] = SharedFrameRing.attach(spec)
+        buffers[stream_id] = np.empty(rings[stream_id].shape, dtype=np.uint8)
+        hands[stream_id] = mp.solutions.hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        trackers[stream_id] = HandTracker(lambda: DistanceSmoother(make_filter("one_euro")))
+        last_seq[stream_id] = -1
+        hands[stream_id].process(np.zeros(rings[stream_id].shape, dtype=np.uint8))
+    ready.set()
+
+    while True:
+        stream_id = jobs.get()
+        if stream_id is STOP:
+            break
+
+        frame = buffers[stream_id]
+        meta = rings[stream_id].read_latest(frame)
+        if meta is None or meta[0] <= last_seq[stream_id]:
+            continue
+        seq, t_capture = meta
+        skipped = seq - last_seq[stream_id] - 1
+        last_seq[stream_id] = seq
+
+        t0 = time.perf_counter()
+        view = cv2.flip(frame, 1) if flip else frame
+        h, w = view.shape[:2]
+        result = hands[stream_id].process(cv2.cvtColor(view, cv2.COLOR_BGR2RGB))
+        landmarks = landmarks_to_array(result.multi_hand_landmarks)
+        hm = hand_metrics(landmarks, w, h)
+        # Same per-hand IDs and filters as the engine, so the controlling hand is chosen alike
+        tracker = trackers[stream_id]
+        tracks = tracker.update(landmarks, handedness_arrays(result)[0])
+        for track, raw in zip(tracks, hm.distance):
+            track.update(raw, t0)
+        control = tracker.controller
+        hand_id = volume = gesture = dist = None
+        if control is not None:
+            hand_id, dist, volume, gesture = control.id, control.distance, control.volume, control.gesture
+        process_ms = (time.perf_counter() - t0) * 1000.0
+        results.put((stream_id, seq, t_capture, skipped, len(tracks), hand_id, dist, volume, gesture, process_ms))
+
+    for ring in rings.values():
+        ring.close()
+    for h in hands.values():
+        h.close()
+
+
+# -------------------- Multi-Stream Runner --------------------
+class MultiStreamRunner:
+    """Capture threads + shared-memory rings in this process, inference in `workers` processes."""
+
+    def __init__(self, sources, workers=None, slots=RING_SLOTS, flip=True):
+        self.sources = list(sources)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.sources)))
+        self.slots = slots
+        self.flip = flip
+        self.rings = []
+        self.caps = []
+        self.frame_intervals = []
+        self.streams = [
+            {"source": str(s), "captured": 0, "processed": 0, "dropped": 0, "hands": 0,
+             "last": None, "metrics": LatencyTracker()}
+            for s in self.sources
+        ]
+        self._stop = threading.Event()
+        self._threads = []
+        self._procs = []
+        self._jobs = []
+        self._results = None
+
+    def start(self):
+        ctx = mp_proc.get_context("spawn")
+        first_frames = []
+        try:
+            for source in self.sources:
+                cap = open_capture(source)
+                self.caps.append(cap)
+                ret, frame = cap.read()
+                if not ret:
+                    raise RuntimeError(f"Cannot read from source {source!r}")
+                first_frames.append(frame)
+                self.rings.append(SharedFrameRing(frame.shape, self.slots))
+                # Cameras deliver in real time on their own; files would otherwise be read as fast as possible
+                fps = None if cap.kind == "camera" else (cap.info().get("fps") or FILE_FPS)
+                self.frame_intervals.append(1.0 / fps if fps else 0.0)
+        except Exception:
+            # Shared memory outlives the process unless unlinked
+            for cap in self.caps:
+                cap.release()
+            for ring in self.rings:
+                ring.close()
+            self.caps, self.rings = [], []
+            raise
+
+        self._results = ctx.Queue()
+        ready = []
+        for w in range(self.workers):
+            # Streams are pinned to one worker so each Hands instance sees consecutive frames
+            specs = {i: ring.spec() for i, ring in enumerate(self.rings) if i % self.workers == w}
+            jobs = ctx.Queue(maxsize=len(self.sources) * self.slots)
+            ready.append(ctx.Event())
+            proc = ctx.Process(target=inference_worker, args=(jobs, self._results, specs, ready[-1], self.flip),
+                               daemon=True)
+            proc.start()
+            self._jobs.append(jobs)
+            self._procs.append(proc)
+
+        # Handshake: no frame is captured (or counted as dropped) while a worker is still loading
+        deadline = time.perf_counter() + READY_TIMEOUT_S
+        for event, proc in zip(ready, self._procs):
+            while not event.wait(0.5):
+                if not proc.is_alive() or time.perf_counter() > deadline:
+                    self.stop()
+                    raise RuntimeError("inference workers failed to start")
+
+        for i, frame in enumerate(first_frames):
+            t = threading.Thread(target=self._capture_loop, args=(i, frame), name=f"capture-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        collector = threading.Thread(target=self._collect_loop, name="collector", daemon=True)
+        collector.start()
+        self._threads.append(collector)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for t in self._threads:
+            t.join(2.0)
+        for jobs in self._jobs:
+            try:
+                jobs.put(STOP, timeout=1.0)
+            except queue.Full:
+                pass
+        # A worker only exits once its queued results are flushed, so keep draining while joining
+        deadline = time.perf_counter() + 5.0
+        for proc in self._procs:
+            while proc.is_alive() and time.perf_counter() < deadline:
+                self._drain()
+                proc.join(0.05)
+            if proc.is_alive():
+                proc.terminate()
+        if self._results is not None:
+            self._drain()
+        for cap in self.caps:
+            cap.release()
+        for ring in self.rings:
+            ring.close()
+
+    def _capture_loop(self, stream_id, frame):
+        cap, ring, stream = self.caps[stream_id], self.rings[stream_id], self.streams[stream_id]
+        # Streams are pinned to one worker so each Hands instance sees consecutive frames
+        jobs = self._jobs[stream_id % self.workers]
+        interval = self.frame_intervals[stream_id]
+        t_start = time.perf_counter()
+        seq = 0
+        while not self._stop.is_set():
+            if interval:
+                delay = t_start + seq * interval - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            ring.write(seq, frame, time.perf_counter())
+            stream["captured"] += 1
+            try:
+                jobs.put_nowait(stream_id)
+            except queue.Full:
+                pass  # the worker reads the newest slot anyway
+            seq += 1
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+    def _collect_loop(self):
+        while not self._stop.is_set():
+            try:
+                self._record(self._results.get(timeout=0.5))
+            except queue.Empty:
+                continue
+
+    def _drain(self):
+        while True:
+            try:
+                self._record(self._results.get_nowait())
+            except queue.Empty:
+                return
+
+    def _record(self, result):
+        stream_id, seq, t_capture, skipped, n_hands, hand_id, dist, volume, gesture, process_ms = result
+        stream = self.streams[stream_id]
+        stream["processed"] += 1
+        stream["dropped"] += skipped
+        stream["hands"] += n_hands > 0
+        stream["last"] = {"seq": seq, "hand_id": hand_id, "distance": dist, "volume": volume, "gesture": gesture}
+        stream["metrics"].record("process", process_ms)
+        stream["metrics"].frame_done(t_capture)
+
+    def stats(self):
+        report = {}
+        for i, s in enumerate(self.streams):
+            summary = s["metrics"].summary()
+            report[i] = {
+                "source": s["source"], "captured": s["captured"], "processed": s["processed"],
+                "dropped": s["dropped"], "frames_with_hands": s["hands"], "fps": summary["fps"],
+                "latency": {k: {p: v[p] for p in ("p50_ms", "p95_ms", "p99_ms")} for k, v in summary["stages"].items()},
+                "last": s["last"],
+            }
+        return report
+
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run several gesture streams across a process pool")
+    parser.add_argument("sources", nargs="+", help="camera indices and/or video files")
+    parser.add_argument("--workers", type=int, default=None, help="inference processes (default: one per core)")
+    parser.add_argument("--slots", type=int, default=RING_SLOTS, help="frames per shared-memory ring")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--no-flip", action="store_true")
+    parser.add_argument("--output", default=None, help="write per-stream JSON results to this file")
+    args = parser.parse_args(argv)
+
+    runner = MultiStreamRunner(args.sources, args.workers, args.slots, not args.no_flip).start()
+    t0 = time.perf_counter()
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.perf_counter() - t0  # measured: Ctrl+C may cut the run short
+    runner.stop()
+    stats = runner.stats()  # after stop(), which drains the results still in flight
+
+    total = sum(s["processed"] for s in stats.values())
+    print(f"{len(stats)} streams on {runner.workers} workers: {total / elapsed:.1f} frames/s total over {elapsed:.1f}s")
+    for i, s in stats.items():
+        print(f"  [{i}] {s['source']}: {s['fps']:.1f} FPS, processed {s['processed']}, dropped {s['dropped']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"workers": runner.workers, "duration_s": elapsed, "streams": stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
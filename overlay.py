@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from gesture_core import INDEX_TIP, THUMB_TIP
+
+# -------------------- Constants --------------------
+OVERLAY_LEVELS = ("none", "fingertips", "full")
+
+# MediaPipe's 21-landmark hand topology as (start, end) index pairs
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),            # thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),            # index
+    (5, 9), (9, 10), (10, 11), (11, 12),       # middle
+    (9, 13), (13, 14), (14, 15), (15, 16),     # ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky + palm
+], dtype=np.int32)
+TIPS = np.array([THUMB_TIP, INDEX_TIP], dtype=np.int32)
+
+# Colors are BGR; thumb=None draws the "full" skeleton without the thumb/index highlight
+OverlayStyle = namedtuple("OverlayStyle", ["joint", "bone", "thumb", "index", "pinch_line",
+                                           "thickness", "joint_radius", "tip_radius", "line_thickness"])
+# Same look as mp.solutions.drawing_utils.draw_landmarks with its default specs
+DEFAULT_STYLE = OverlayStyle((0, 0, 255), (224, 224, 224), None, None, None, 2, 2, 10, 4)
+# Thumb, index and pinch-line colors for styles that leave them unset: "fingertips" is only the
+# highlight, so it always needs them
+TIP_COLORS = ((255, 0, 0), (0, 255, 0), (255, 0, 255))
+
+
+def to_rgb(style):
+    """The same style for RGB frames: every color with its channels swapped."""
+    return style._replace(**{k: v[::-1] for k, v in style._asdict().items() if isinstance(v, tuple)})
+
+
+# -------------------- Renderer --------------------
+def draw_overlay(frame, points, level="full", style=DEFAULT_STYLE):
+    """
+    Draws every hand at once onto `frame` in place. `points` is the (hands, 21, 2) int32 pixel array
+    from hand_metrics(). Each element kind is one cv2.polylines call covering all hands: bones
+    are the HAND_CONNECTIONS segments, dots are zero-length segments drawn with round caps.
+    """
+    if level == "none" or not len(points):
+        return frame
+    if level not in OVERLAY_LEVELS:
+        raise ValueError(f"level must be one of {OVERLAY_LEVELS}, got {level!r}")
+    points = np.ascontiguousarray(points[..., :2], dtype=np.int32)
+
+    if level == "full":
+        bones = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+        cv2.polylines(frame, list(bones), False, style.bone, style.thickness, cv2.LINE_AA)
+        _dots(frame, points.reshape(-1, 2), style.joint, style.joint_radius)
+
+    if style.thumb is not None or level == "fingertips":
+        thumb, index, pinch_line = (color if color is not None else fallback
+                                    for color, fallback in zip((style.thumb, style.index, style.pinch_line), TIP_COLORS))
+        # cv2 rejects strided views (checkVector), so every array handed to it is made contiguous
+        tips = np.ascontiguousarray(points[:, TIPS])
+        cv2.polylines(frame, list(tips), False, pinch_line, style.line_thickness, cv2.LINE_AA)
+        _dots(frame, np.ascontiguousarray(tips[:, 0]), thumb, style.tip_radius)
+        _dots(frame, np.ascontiguousarray(tips[:, 1]), index, style.tip_radius)
+    return frame
+
+
+def _dots(frame, centers, color, radius):
+    # A zero-length thick segment renders as a filled disc of diameter `thickness`
+    segments = np.ascontiguousarray(np.repeat(centers[:, None, :], 2, axis=1))
+    cv2.polylines(frame, list(segments), False, color, max(1, 2 * radius), cv2.LINE_AA)
@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# -------------------- Constants --------------------
+DEFAULT_WINDOW = 300
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 150, 250, 500, 1000)
+PERCENTILES = (50, 95, 99)
+
+
+# -------------------- Rolling Per-Stage Latency Tracker --------------------
+class LatencyTracker:
+    """Keeps a rolling window of per-stage timings (ms) plus frame timestamps for FPS."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._frame_times = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.profiler = None  # profiler.FrameProfiler; spans are also traced while it is armed
+
+    def record(self, stage, ms, end=None):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(ms)
+        profiler = self.profiler
+        if profiler is not None and profiler.active:
+            end = time.perf_counter() if end is None else end
+            profiler.add(stage, end - ms / 1000.0, end)
+
+    @contextmanager
+    def span(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            self.record(stage, (t1 - t0) * 1000.0, t1)
+
+    def frame_done(self, t_capture=None):
+        now = time.perf_counter()
+        with self._lock:
+            self._frame_times.append(now)
+            self.frames += 1
+        if t_capture is not None:
+            self.record("end_to_end", (now - t_capture) * 1000.0, now)
+        if self.profiler is not None:
+            self.profiler.frame_done()
+
+    def fps(self):
+        with self._lock:
+            times = list(self._frame_times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def summary(self):
+        with self._lock:
+            snapshot = {stage: np.fromiter(s, dtype=np.float64) for stage, s in self._samples.items()}
+        stages = {}
+        for stage, values in snapshot.items():
+            if values.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            counts, _ = np.histogram(values, bins=(0,) + HISTOGRAM_BUCKETS_MS + (np.inf,))
+            stages[stage] = {
+                "count": int(values.size),
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(values.max()),
+                "histogram": {
+                    "buckets_ms": list(HISTOGRAM_BUCKETS_MS) + ["+Inf"],
+                    "counts": counts.tolist(),
+                },
+            }
+        return {"timestamp": time.time(), "frames": self.frames, "fps": self.fps(), "stages": stages}
+
+    def percentile(self, stage, q):
+        with self._lock:
+            samples = self._samples.get(stage)
+            values = np.fromiter(samples, dtype=np.float64) if samples else None
+        if values is None or values.size == 0:
+            return None
+        return float(np.percentile(values, q))
+
+    # -------------------- Export --------------------
+    def write(self, path, summary=None):
+        """Writes the summary as JSON to `path` and as plain `name value` lines next to it (.txt)."""
+        summary = summary or self.summary()
+        _atomic_write(path, json.dumps(summary, indent=2))
+        _atomic_write(os.path.splitext(path)[0] + ".txt", format_text(summary))
+        return summary
+
+
+def format_text(summary):
+    lines = [
+        f"gesture_frames_total {summary['frames']}",
+        f"gesture_fps {summary['fps']:.3f}",
+    ]
+    for stage, s in summary["stages"].items():
+        for key in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms"):
+            lines.append(f'gesture_stage_latency_{key}{{stage="{stage}"}} {s[key]:.3f}')
+        lines.append(f'gesture_stage_samples{{stage="{stage}"}} {s["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def format_table(summary, stages=None):
+    rows = ["| Stage | p50 | p95 | p99 |", "|---|---|---|---|"]
+    for stage in stages or summary["stages"].keys():
+        s = summary["stages"].get(stage)
+        if s is None:
+            continue
+        rows.append(f"| {stage} | {s['p50_ms']:.1f} ms | {s['p95_ms']:.1f} ms | {s['p99_ms']:.1f} ms |")
+    return "\n".join(rows)
+
+
+def _atomic_write(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
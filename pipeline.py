@@ -0,0 +1,253 @@
+import threading
+import time
+from collections import deque
+
+from frame_pool import BufferPool
+
+# -------------------- Constants --------------------
+FILE_FPS = 30.0  # playback rate for file sources whose header has no frame rate (frame directories)
+
+
+# -------------------- Bounded Drop-Oldest Queue --------------------
+class LatestQueue:
+    """Bounded queue that discards the oldest item when full, so readers always get the newest frame."""
+
+    def __init__(self, name, maxsize=1, on_drop=None):
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.on_drop = on_drop  # called with each discarded item, e.g. to recycle its frame buffer
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item):
+        discarded = []
+        with self._cond:
+            if self._closed:
+                discarded.append(item)
+            else:
+                while len(self._items) >= self.maxsize:
+                    discarded.append(self._items.popleft())
+                    self.dropped += 1
+                self._items.append(item)
+                self.put_count += 1
+                self._cond.notify()
+        if self.on_drop is not None:
+            for old in discarded:
+                self.on_drop(old)
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def clear(self):
+        """Discards everything queued, through on_drop like any other dropped item."""
+        with self._cond:
+            discarded = list(self._items)
+            self._items.clear()
+            self.dropped += len(discarded)
+        if self.on_drop is not None:
+            for old in discarded:
+                self.on_drop(old)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed and not self._items
+
+    @property
+    def depth(self):
+        return len(self._items)
+
+    def stats(self):
+        return {"depth": self.depth, "dropped": self.dropped, "passed": self.put_count}
+
+
+# -------------------- Frame Packet --------------------
+class FramePacket:
+    __slots__ = ("seq", "t_capture", "frame", "output")
+
+    def __init__(self, seq, t_capture, frame, output=None):
+        self.seq = seq
+        self.t_capture = t_capture
+        self.frame = frame
+        self.output = output
+
+
+# -------------------- Capture -> Inference -> Render Pipeline --------------------
+class FramePipeline:
+    """
+    Runs capture and inference on their own threads, joined by drop-oldest queues.
+    The render/UI stage is the caller: it pulls finished packets with get().
+
+    recycle_frames=True reads into pooled buffers (source.read(image)) and takes each raw frame
+    back once `process` returns, so `process` must not keep it. `release(packet)` is called for
+    every processed packet the result queue discards, to recycle whatever its output holds.
+    """
+
+    def __init__(self, source, process, capture_queue_size=1, result_queue_size=1, metrics=None,
+                 recycle_frames=False, release=None):
+        self.source = source
+        self.process = process
+        self.metrics = metrics
+        self.frame_pool = BufferPool(capture_queue_size + 3) if recycle_frames else None
+        self.capture_queue = LatestQueue("capture", capture_queue_size,
+                                         on_drop=self._recycle if recycle_frames else None)
+        self.result_queue = LatestQueue("result", result_queue_size, on_drop=release)
+        self.error = None
+        self.exhausted = False  # a file/directory source ran out of frames (not an error)
+        self.live = getattr(source, "kind", "camera") == "camera"  # files wait while paused instead of being drained
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.frames_rendered = 0
+        self._stop = threading.Event()
+        self._paused = threading.Event()
+        self._generation = 0             # bumped by pause(); packets from an older one are stale
+        self._pause_lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        self.capture_queue.close()
+        self.result_queue.close()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def pause(self):
+        # Capture keeps draining a camera so nothing stale is queued on resume (a file just waits);
+        # frames already queued are dropped (and recycled) so none of them is processed after pause
+        with self._pause_lock:
+            self._paused.set()
+            self._generation += 1
+            self.capture_queue.clear()
+            self.result_queue.clear()
+
+    def resume(self):
+        self._paused.clear()
+
+    @property
+    def paused(self):
+        return self._paused.is_set()
+
+    @property
+    def running(self):
+        return not self._stop.is_set() and not self.result_queue.closed
+
+    def get(self, timeout=None):
+        packet = self.result_queue.get(timeout)
+        if packet is not None:
+            self.frames_rendered += 1
+        return packet
+
+    def stats(self):
+        return {
+            "capture": dict(self.capture_queue.stats(), frames=self.frames_captured),
+            "inference": dict(self.result_queue.stats(), frames=self.frames_processed),
+            "render": {"frames": self.frames_rendered},
+        }
+
+    def _recycle(self, packet):
+        self.frame_pool.release(packet.frame)
+
+    def _read(self):
+        if self.frame_pool is None:
+            return self.source.read()
+        buf = self.frame_pool.acquire()
+        ret, frame = self.source.read(buf)
+        if ret and frame is not buf:
+            self.frame_pool.learn(frame.shape, frame.dtype)  # first frame or a new camera mode
+        return ret, frame
+
+    def _file_fps(self):
+        info = self.source.info() if hasattr(self.source, "info") else {}
+        return info.get("fps") or FILE_FPS
+
+    def _capture_loop(self):
+        seq = 0
+        # Files are played back at their frame rate, like the camera they stand in for;
+        # read as fast as possible, most frames would just be dropped by the queues
+        interval = 0.0 if self.live else 1.0 / self._file_fps()
+        next_read = 0.0
+        while not self._stop.is_set():
+            if self._paused.is_set() and not self.live:
+                self._stop.wait(0.01)
+                continue
+            if interval:
+                delay = next_read - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                next_read = max(next_read + interval, time.perf_counter())
+            t0 = time.perf_counter()
+            ret, frame = self._read()
+            t_capture = time.perf_counter()
+            if not ret:
+                if self.live:
+                    self.error = "Failed to capture frame"
+                else:
+                    self.exhausted = True
+                break
+            if self._paused.is_set():
+                if self.frame_pool is not None:
+                    self.frame_pool.release(frame)
+                continue
+            if self.metrics is not None:
+                self.metrics.record("capture", (t_capture - t0) * 1000.0, t_capture)
+            self.capture_queue.put(FramePacket(seq, t_capture, frame))
+            self.frames_captured += 1
+            seq += 1
+        self.capture_queue.close()
+
+    def _inference_loop(self):
+        while not self._stop.is_set():
+            packet = self.capture_queue.get(timeout=0.5)
+            if packet is None:
+                if self.capture_queue.closed:
+                    break
+                continue
+            if self._paused.is_set():
+                # Queued just before pause() cleared the queue
+                if self.frame_pool is not None:
+                    self._recycle(packet)
+                continue
+            generation = self._generation
+            try:
+                packet.output = self.process(packet.frame)
+            except Exception as exc:
+                self.error = f"Processing failed: {exc}"
+                break
+            if self.frame_pool is not None:
+                self._recycle(packet)
+                packet.frame = None
+            # Checked and enqueued under the lock so pause() cannot slip in between
+            with self._pause_lock:
+                stale = self._paused.is_set() or generation != self._generation
+                if not stale:
+                    self.result_queue.put(packet)
+            if stale:
+                # Finished after pause() (even if resumed since): nobody should see it
+                if self.result_queue.on_drop is not None:
+                    self.result_queue.on_drop(packet)
+                continue
+            self.frames_processed += 1
+        self.result_queue.close()
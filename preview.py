@@ -0,0 +1,76 @@
+import cv2
+
+from ui_refresh import RateLimiter
+
+# -------------------- Constants --------------------
+PREVIEW_MODES = ("bgr", "jpeg")
+PREVIEW_MAX_WIDTH = 640
+PREVIEW_JPEG_QUALITY = 70
+PREVIEW_FPS = 15
+PREVIEW_CHANNELS = ("BGR", "RGB")
+
+
+# -------------------- Preview Encoder --------------------
+class PreviewEncoder:
+    """
+    Prepares processed frames for the browser, independently of the control loop.
+
+    mode="bgr" hands the (downscaled) pixel buffer straight to st.image(channels=channels);
+    mode="jpeg" encodes the downscaled copy once with cv2.imencode at `jpeg_quality`.
+    Frames beyond `fps` per second are skipped before any resize/encode work is done.
+    `channels` is the frames' channel order; resize and RGB->BGR targets are reused buffers.
+    """
+
+    def __init__(self, mode="jpeg", max_width=PREVIEW_MAX_WIDTH, jpeg_quality=PREVIEW_JPEG_QUALITY, fps=PREVIEW_FPS,
+                 channels="BGR"):
+        if mode not in PREVIEW_MODES:
+            raise ValueError(f"mode must be one of {PREVIEW_MODES}, got {mode!r}")
+        if channels not in PREVIEW_CHANNELS:
+            raise ValueError(f"channels must be one of {PREVIEW_CHANNELS}, got {channels!r}")
+        self.mode = mode
+        self.channels = channels
+        self.max_width = max_width
+        self._small = None
+        self._bgr = None
+        self.encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self.limiter = RateLimiter(fps)
+        self.sent = 0
+        self.skipped = 0
+        self.bytes_sent = 0
+
+    def encode(self, frame, now=None):
+        """Returns the payload to display, or None when this frame is over the preview frame cap."""
+        if not self.limiter.ready(now):
+            self.skipped += 1
+            return None
+        h, w = frame.shape[:2]
+        if self.max_width and w > self.max_width:
+            # cv2 only reallocates the target when the size changes
+            frame = self._small = cv2.resize(frame, (self.max_width, int(h * self.max_width / w)), dst=self._small,
+                                             interpolation=cv2.INTER_AREA)
+        if self.mode == "jpeg":
+            if self.channels == "RGB":
+                frame = self._bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self._bgr)
+            ok, buf = cv2.imencode(".jpg", frame, self.encode_params)
+            if not ok:
+                return None
+            payload = buf.tobytes()
+            self.bytes_sent += len(payload)
+        else:
+            payload = frame
+            self.bytes_sent += frame.nbytes
+        self.sent += 1
+        return payload
+
+    def show(self, placeholder, frame, now=None):
+        payload = self.encode(frame, now)
+        if payload is None:
+            return False
+        if self.mode == "jpeg":
+            placeholder.image(payload, use_container_width=True)
+        else:
+            placeholder.image(payload, channels=self.channels, use_container_width=True)
+        return True
+
+    def stats(self):
+        return {"mode": self.mode, "sent": self.sent, "skipped": self.skipped, "bytes_sent": self.bytes_sent}
@@ -0,0 +1,82 @@
+"""
+Background warm-up of the gesture engine, started by the landing page.
+
+frontpage.py calls start() as soon as it renders: a daemon thread imports cv2/mediapipe,
+builds the GestureEngine, opens the camera (pipeline started paused) and runs blank frames
+through the model. milestone4.py then takes that engine with take_engine() instead of
+cold-starting. State is module-level, i.e. per process, which is what Streamlit pages share.
+"""
+import threading
+import time
+
+_lock = threading.Lock()
+_thread = None
+_config = None
+_engine = None
+_error = None
+_timings = {}
+
+
+def start(config):
+    """Starts warming an engine built with `config`; no-op if a warm-up already ran in this process."""
+    global _thread, _config
+    with _lock:
+        if _thread is not None:
+            return False
+        _config = dict(config)
+        _thread = threading.Thread(target=_warm, args=(_config,), name="prewarm", daemon=True)
+        _thread.start()
+        return True
+
+
+def _warm(config):
+    global _engine, _error
+    engine = None
+    try:
+        t0 = time.perf_counter()
+        from engine import GestureEngine
+        t1 = time.perf_counter()
+        engine = GestureEngine(**config)
+        t2 = time.perf_counter()
+        engine.open()  # a missing camera is reported when the user presses Start, as without warm-up
+        t3 = time.perf_counter()
+        engine.warm_up()
+        t4 = time.perf_counter()
+        _timings.update(import_s=t1 - t0, build_s=t2 - t1, camera_s=t3 - t2, model_s=t4 - t3)
+        # Published only once fully warmed, so no page ever picks up a half-open engine
+        _engine = engine
+    except Exception as exc:
+        _error = f"{type(exc).__name__}: {exc}"
+        if engine is not None:
+            engine.close()  # frees the camera for the engine take_engine() builds instead
+
+
+def status():
+    """"idle", "warming", "ready" or "failed", plus timings / the error once known."""
+    if _thread is None:
+        return {"state": "idle"}
+    if _thread.is_alive():
+        return {"state": "warming"}
+    if _engine is None:
+        return {"state": "failed", "error": _error}
+    return dict(_timings, state="ready", error=_error)
+
+
+def take_engine(config, timeout=None):
+    """
+    The pre-warmed engine if it was built with `config` (waiting for the warm-up to finish),
+    otherwise a new GestureEngine. A warmed engine with other settings is closed first so it
+    does not keep the camera.
+    """
+    global _engine
+    with _lock:
+        thread, warmed = _thread, _config
+    if thread is not None:
+        thread.join(timeout)
+        if _engine is not None:
+            if warmed == dict(config):
+                return _engine
+            _engine.close()
+            _engine = None
+    from engine import GestureEngine
+    return GestureEngine(**config)
@@ -0,0 +1,233 @@
+"""
+On-demand frame-loop profiler.
+
+When armed, every stage timing that goes through LatencyTracker.record()/span() is also kept as
+a Chrome trace event (one row per thread), for a bounded window of frames. The window is then
+written as trace-event JSON, which chrome://tracing or https://ui.perfetto.dev open directly.
+Optionally a stdlib sampling profiler runs alongside and its hottest functions are stored in
+the same file. Disarmed, the hooks cost one attribute check per stage.
+
+    GESTURE_PROFILE=300 streamlit run milestone4.py         # profile the first 300 frames
+    GESTURE_PROFILE=300 GESTURE_PROFILE_SAMPLE=1 python gesture_daemon.py
+    python profiler.py profiles/profile-20260101-120000.json   # print a stage summary
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# -------------------- Constants --------------------
+PROFILE_ENV = "GESTURE_PROFILE"                # frames to capture on startup (unset/0 = off)
+PROFILE_SAMPLE_ENV = "GESTURE_PROFILE_SAMPLE"  # "1" = also run the sampling profiler
+PROFILE_DIR = "profiles"
+DEFAULT_FRAMES = 300
+MAX_EVENTS = 200000          # hard cap in case frames are never marked done
+SAMPLE_INTERVAL_S = 0.001
+TOP_FUNCTIONS = 25
+
+
+# -------------------- Frame Profiler --------------------
+class FrameProfiler:
+    """Collects complete ("X") trace events for `frames` frames, then writes them and disarms itself."""
+
+    def __init__(self, directory=PROFILE_DIR):
+        self.directory = directory
+        self.active = False
+        self.frames = 0
+        self.target = 0
+        self.last_path = None
+        self._events = []
+        self._threads = {}
+        self._t0 = 0.0
+        self._sampler = None
+        self._lock = threading.Lock()
+
+    def arm(self, frames=DEFAULT_FRAMES, sample=False):
+        """Starts a capture window; ignored while one is already running."""
+        with self._lock:
+            if self.active:
+                return False
+            self._events = []
+            self._threads = {}
+            self.frames = 0
+            self.target = max(1, int(frames))
+            self._t0 = time.perf_counter()
+            self._sampler = _Sampler() if sample else None
+            if self._sampler is not None:
+                self._sampler.start()
+            self.active = True
+            return True
+
+    def add(self, name, start, end):
+        """One span on the calling thread, perf_counter() seconds."""
+        if len(self._events) >= MAX_EVENTS:
+            return
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, tid, start, end))
+
+    def frame_done(self):
+        """Marks one frame finished; writes the trace once the window is full."""
+        if not self.active:
+            return None
+        self.add("frame", time.perf_counter(), time.perf_counter())
+        with self._lock:
+            self.frames += 1
+            if self.frames < self.target or not self.active:
+                return None
+            self.active = False
+        return self._finish()
+
+    def progress(self):
+        return self.frames, self.target
+
+    def _finish(self):
+        sampling = None
+        if self._sampler is not None:
+            sampling = self._sampler.stop()
+            self._sampler = None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime("profile-%Y%m%d-%H%M%S.json"))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(sampling), f)
+        self.last_path = path
+        return path
+
+    def to_chrome_trace(self, sampling=None):
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in self._threads.items()]
+        for name, tid, start, end in self._events:
+            ts = (start - self._t0) * 1e6
+            if name == "frame":
+                events.append({"name": name, "ph": "i", "s": "t", "pid": pid, "tid": tid, "ts": ts})
+            else:
+                events.append({"name": name, "ph": "X", "pid": pid, "tid": tid, "ts": ts,
+                               "dur": max(0.0, (end - start) * 1e6)})
+        other = {"frames": self.frames, "events": len(self._events), "truncated": len(self._events) >= MAX_EVENTS}
+        if sampling is not None:
+            other["sampling"] = sampling
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": other}
+
+
+class ProfiledHands:
+    """Wraps a MediaPipe Hands so each process() call is its own span while the profiler is armed."""
+
+    def __init__(self, hands, profiler):
+        self.hands = hands
+        self.profiler = profiler
+
+    def process(self, image):
+        if not self.profiler.active:
+            return self.hands.process(image)
+        t0 = time.perf_counter()
+        try:
+            return self.hands.process(image)
+        finally:
+            self.profiler.add("hands.process", t0, time.perf_counter())
+
+    def close(self):
+        self.hands.close()
+
+
+def arm_from_env(profiler):
+    """Arms `profiler` when GESTURE_PROFILE=<frames> is set; returns whether it did."""
+    frames = os.environ.get(PROFILE_ENV, "").strip()
+    if not frames or frames == "0":
+        return False
+    return profiler.arm(int(frames), sample=os.environ.get(PROFILE_SAMPLE_ENV, "") not in ("", "0"))
+
+
+# -------------------- Sampling Profiler --------------------
+class _Sampler:
+    """Polls sys._current_frames() on a daemon thread and counts leaf functions per thread."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL_S):
+        self.interval = interval
+        self.samples = 0
+        self._leaf = Counter()
+        self._inclusive = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                thread = names.get(tid, str(tid))
+                self._leaf[(thread, _frame_key(frame))] += 1
+                seen = set()
+                while frame is not None:
+                    key = _frame_key(frame)
+                    if key not in seen:
+                        seen.add(key)
+                        self._inclusive[(thread, key)] += 1
+                    frame = frame.f_back
+            self.samples += 1
+
+    def stop(self, top=TOP_FUNCTIONS):
+        self._stop.set()
+        self._thread.join()
+        n = max(1, self.samples)
+
+        def rows(counter):
+            return [{"thread": thread, "function": key, "samples": count, "pct": 100.0 * count / n}
+                    for (thread, key), count in counter.most_common(top)]
+
+        return {"interval_ms": self.interval * 1000.0, "samples": self.samples,
+                "self": rows(self._leaf), "inclusive": rows(self._inclusive)}
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# -------------------- Summary CLI --------------------
+def summarize(trace):
+    """Per-thread, per-span totals from a written trace: {(thread, name): (count, total_ms, max_ms)}."""
+    threads = {e["tid"]: e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    totals = {}
+    for e in trace["traceEvents"]:
+        if e["ph"] != "X":
+            continue
+        key = (threads.get(e["tid"], str(e["tid"])), e["name"])
+        count, total, peak = totals.get(key, (0, 0.0, 0.0))
+        ms = e["dur"] / 1000.0
+        totals[key] = (count + 1, total + ms, max(peak, ms))
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a captured frame-loop profile")
+    parser.add_argument("trace", help="profile JSON written by FrameProfiler")
+    args = parser.parse_args(argv)
+
+    with open(args.trace, encoding="utf-8") as f:
+        trace = json.load(f)
+    other = trace.get("otherData", {})
+    print(f"{other.get('frames', '?')} frames, {other.get('events', '?')} events"
+          + (" (truncated)" if other.get("truncated") else ""))
+    print(f"{'thread':<12} {'span':<16} {'count':>6} {'mean':>8} {'max':>8}")
+    for (thread, name), (count, total, peak) in sorted(summarize(trace).items()):
+        print(f"{thread:<12} {name:<16} {count:>6} {total / count:7.2f}ms {peak:7.2f}ms")
+    sampling = other.get("sampling")
+    if sampling:
+        print(f"\nSampling profiler: {sampling['samples']} samples every {sampling['interval_ms']:g} ms (self time)")
+        for row in sampling["self"]:
+            print(f"  {row['pct']:5.1f}%  {row['thread']:<12} {row['function']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
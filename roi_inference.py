@@ -0,0 +1,134 @@
+import cv2
+import numpy as np
+
+from gesture_core import landmarks_to_array
+
+# -------------------- Constants --------------------
+INFERENCE_MODES = ("full", "roi")
+ROI_PADDING = 0.6       # extra margin around the last hand box, as a fraction of its size
+ROI_MIN_SIZE = 192      # px, never crop smaller than the palm detector's input
+ROI_SNAP = 32           # px grid the crop is snapped to so it doesn't jitter every frame
+ROI_MAX_COVERAGE = 0.7  # if the crop would cover more of the frame than this, run full-frame
+ROI_KEEP_MARGIN = 0.1   # the crop stays put while the hands keep this fraction of its side from every edge
+ROI_SHRINK = 0.6        # ...and still need at least this fraction of its side
+
+
+# -------------------- ROI / Downscaled Hands --------------------
+class RoiHands:
+    """
+    Drop-in wrapper around mp_hands.Hands.process().
+
+    mode="roi": crops a padded box around the previous frame's hands and runs the model on the
+    crop only, falling back to full-frame detection when tracking is lost. Crops go to
+    `crop_hands`, a second streaming Hands. Its landmark tracking works in the crop's normalized
+    coordinates, so the box is sticky: it only moves when the hands get close to its edges or
+    need a much smaller box, and MediaPipe keeps tracking (no palm detection) in between.
+    The `hands` instance only ever sees full frames, so its tracking stays valid as well.
+    scale < 1: full-frame passes run on a downscaled copy of the frame.
+
+    Landmarks are always returned normalized to the full frame, so `x * w` / `y * h` pixel
+    maths (20-200 px volume mapping, Pinch/Open cut-offs) keeps working unchanged.
+    """
+
+    def __init__(self, hands, mode="roi", scale=1.0, padding=ROI_PADDING, min_size=ROI_MIN_SIZE, crop_hands=None):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"mode must be one of {INFERENCE_MODES}, got {mode!r}")
+        if mode == "roi" and crop_hands is None:
+            raise ValueError("mode='roi' needs crop_hands, a second Hands instance for the crops")
+        self.hands = hands
+        self.crop_hands = crop_hands
+        self.mode = mode
+        self.scale = scale
+        self.padding = padding
+        self.min_size = min_size
+        self.box = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+        self.moves = 0   # times the crop box moved or resized (each costs the crop model a re-detection)
+
+    def process(self, rgb):
+        H, W = rgb.shape[:2]
+        if self.mode == "roi" and self.box is not None:
+            x0, y0, x1, y1 = self.box
+            crop = np.ascontiguousarray(rgb[y0:y1, x0:x1])
+            result = self.crop_hands.process(crop)
+            if result.multi_hand_landmarks:
+                self.roi_frames += 1
+                _remap_landmarks(result.multi_hand_landmarks, x0, y0, x1 - x0, y1 - y0, W, H)
+                self.update_box(result, W, H)
+                return result
+            # Tracking lost inside the crop: re-detect on the whole frame
+            self.fallbacks += 1
+            self.box = None
+
+        self.full_frames += 1
+        if self.scale < 1.0:
+            # Normalized landmarks don't depend on resolution, so no remap is needed
+            small = cv2.resize(rgb, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+            result = self.hands.process(small)
+        else:
+            result = self.hands.process(rgb)
+        self.update_box(result, W, H)
+        return result
+
+    def reset(self):
+        self.box = None
+
+    def stats(self):
+        return {"mode": self.mode, "scale": self.scale, "roi_frames": self.roi_frames,
+                "full_frames": self.full_frames, "fallbacks": self.fallbacks, "moves": self.moves}
+
+    def close(self):
+        self.hands.close()
+        if self.crop_hands is not None:
+            self.crop_hands.close()
+
+    def update_box(self, result, W, H):
+        if self.mode != "roi" or not result.multi_hand_landmarks:
+            self.box = None
+            return
+        landmarks = landmarks_to_array(result.multi_hand_landmarks)
+        if self.box is not None and box_holds(self.box, landmarks, W, H, self.padding, self.min_size):
+            return
+        self.box = roi_box(landmarks, W, H, self.padding, self.min_size)
+        self.moves += self.box is not None
+
+
+def box_holds(box, landmarks, W, H, padding=ROI_PADDING, min_size=ROI_MIN_SIZE):
+    """True while `box` still fits the hands: clear of its edges and not much larger than needed."""
+    x0, y0, x1, y1 = box
+    side = min(x1 - x0, y1 - y0)
+    xy = landmarks[..., :2].reshape(-1, 2) * np.array((W, H), dtype=np.float32)
+    (bx0, by0), (bx1, by1) = xy.min(axis=0), xy.max(axis=0)
+    margin = ROI_KEEP_MARGIN * side
+    if bx0 < x0 + margin or by0 < y0 + margin or bx1 > x1 - margin or by1 > y1 - margin:
+        return False
+    needed = max(max(bx1 - bx0, by1 - by0) * (1.0 + 2.0 * padding), min_size)
+    return needed >= ROI_SHRINK * side
+
+
+def roi_box(landmarks, W, H, padding=ROI_PADDING, min_size=ROI_MIN_SIZE):
+    """Square, grid-snapped pixel box (x0, y0, x1, y1) around all hands, or None if it would be ~full frame."""
+    xy = landmarks[..., :2].reshape(-1, 2) * np.array((W, H), dtype=np.float32)
+    (bx0, by0), (bx1, by1) = xy.min(axis=0), xy.max(axis=0)
+    side = max(bx1 - bx0, by1 - by0) * (1.0 + 2.0 * padding)
+    side = int(max(side, min_size))
+    side = -(-side // ROI_SNAP) * ROI_SNAP
+    if side * side >= ROI_MAX_COVERAGE * W * H or side >= min(W, H):
+        return None
+    cx, cy = (bx0 + bx1) / 2.0, (by0 + by1) / 2.0
+    x0 = int(np.clip(cx - side / 2.0, 0, W - side)) // ROI_SNAP * ROI_SNAP
+    y0 = int(np.clip(cy - side / 2.0, 0, H - side)) // ROI_SNAP * ROI_SNAP
+    return x0, y0, min(x0 + side, W), min(y0 + side, H)
+
+
+def _remap_landmarks(multi_hand_landmarks, x0, y0, cw, ch, W, H):
+    # In-place so the result stays a regular MediaPipe result for drawing_utils
+    sx, sy = cw / W, ch / H
+    ox, oy = x0 / W, y0 / H
+    for hand in multi_hand_landmarks:
+        for lm in hand.landmark:
+            lm.x = ox + lm.x * sx
+            lm.y = oy + lm.y * sy
+            lm.z = lm.z * sx
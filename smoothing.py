@@ -0,0 +1,187 @@
+import math
+
+from gesture_core import CLOSED, MAX_DISTANCE, MIN_DISTANCE, OPEN, PINCH, PINCH_RANGE
+
+# -------------------- Constants --------------------
+SMOOTHING_FILTERS = ("none", "one_euro", "kalman")
+ONE_EURO_MIN_CUTOFF = 1.0   # Hz, lower = smoother when the hand is still
+ONE_EURO_BETA = 0.02        # higher = less lag when the hand moves fast
+ONE_EURO_D_CUTOFF = 1.0     # Hz, cut-off for the speed estimate
+KALMAN_PROCESS_NOISE = 50.0
+KALMAN_MEASUREMENT_NOISE = 4.0
+VOLUME_BAND = 5             # % the volume must move past the last committed level
+GESTURE_BAND = 5.0          # px the distance must cross a cut-off by to switch gesture
+
+
+# -------------------- Filters (scalar, allocation-free) --------------------
+class OneEuroFilter:
+    __slots__ = ("min_cutoff", "beta", "d_cutoff", "_x", "_dx", "_t")
+
+    def __init__(self, min_cutoff=ONE_EURO_MIN_CUTOFF, beta=ONE_EURO_BETA, d_cutoff=ONE_EURO_D_CUTOFF):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._dx = 0.0
+        self._t = None
+
+    def __call__(self, x, t):
+        if self._x is None or t <= self._t:
+            self._x, self._t = x, t
+            return x
+        dt = t - self._t
+        a_d = _alpha(self.d_cutoff, dt)
+        self._dx += a_d * ((x - self._x) / dt - self._dx)
+        a = _alpha(self.min_cutoff + self.beta * abs(self._dx), dt)
+        self._x += a * (x - self._x)
+        self._t = t
+        return self._x
+
+
+class KalmanFilter1D:
+    """Constant-velocity Kalman filter on one value; the 2x2 covariance is kept in four floats."""
+
+    __slots__ = ("q", "r", "_x", "_v", "_p00", "_p01", "_p11", "_t")
+
+    def __init__(self, process_noise=KALMAN_PROCESS_NOISE, measurement_noise=KALMAN_MEASUREMENT_NOISE):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._v = 0.0
+        self._p00 = self._p01 = self._p11 = 0.0
+        self._t = None
+
+    def __call__(self, z, t):
+        if self._x is None or t <= self._t:
+            self._x, self._t = z, t
+            self._v = 0.0
+            self._p00, self._p01, self._p11 = self.r, 0.0, self.r
+            return z
+        dt = t - self._t
+        self._t = t
+        # Predict
+        x = self._x + self._v * dt
+        p00 = self._p00 + dt * (2.0 * self._p01 + dt * self._p11) + self.q * dt ** 3 / 3.0
+        p01 = self._p01 + dt * self._p11 + self.q * dt ** 2 / 2.0
+        p11 = self._p11 + self.q * dt
+        # Update with the position measurement
+        s = p00 + self.r
+        k0, k1 = p00 / s, p01 / s
+        y = z - x
+        self._x = x + k0 * y
+        self._v += k1 * y
+        self._p00 = (1.0 - k0) * p00
+        self._p01 = (1.0 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        return self._x
+
+
+class PassThrough:
+    __slots__ = ()
+
+    def reset(self):
+        pass
+
+    def __call__(self, x, t):
+        return x
+
+
+def make_filter(kind="one_euro", **kwargs):
+    if kind == "one_euro":
+        return OneEuroFilter(**kwargs)
+    if kind == "kalman":
+        return KalmanFilter1D(**kwargs)
+    if kind == "none":
+        return PassThrough()
+    raise ValueError(f"filter must be one of {SMOOTHING_FILTERS}, got {kind!r}")
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+# -------------------- Filter + Hysteresis Stage --------------------
+class DistanceSmoother:
+    """
+    Sits between the landmark math and the volume/gesture decision for one hand.
+
+    update() filters the raw thumb-index distance, and returns the smoothed distance, the
+    committed volume level (moves only when the filtered level leaves the +/- volume_band
+    window) and the gesture (switches only when a cut-off is crossed by gesture_band px).
+    `suppressed` counts frames where the old raw >5% check would have actuated but this did not.
+    """
+
+    __slots__ = ("filter", "volume_band", "gesture_band", "pinch_range", "min_dist", "max_dist",
+                 "volume", "gesture", "actuations", "raw_actuations", "suppressed", "_raw_prev")
+
+    def __init__(self, filter=None, volume_band=VOLUME_BAND, gesture_band=GESTURE_BAND,
+                 pinch_range=PINCH_RANGE, min_dist=MIN_DISTANCE, max_dist=MAX_DISTANCE):
+        self.filter = filter if filter is not None else OneEuroFilter()
+        self.volume_band = volume_band
+        self.gesture_band = gesture_band
+        self.pinch_range = pinch_range
+        self.min_dist = min_dist
+        self.max_dist = max_dist
+        self.actuations = 0
+        self.raw_actuations = 0
+        self.suppressed = 0
+        self.reset()
+
+    def reset(self):
+        self.filter.reset()
+        self.volume = None
+        self.gesture = None
+        self._raw_prev = None
+
+    def update(self, raw_distance, t):
+        dist = self.filter(float(raw_distance), t)
+
+        raw_fired = self._raw_prev is not None and abs(self._volume(raw_distance) - self._raw_prev) > VOLUME_BAND
+        if self._raw_prev is None or raw_fired:
+            self._raw_prev = self._volume(raw_distance)
+
+        level = self._volume(dist)
+        fired = False
+        if self.volume is None:
+            self.volume = level
+        elif abs(level - self.volume) > self.volume_band:
+            self.volume = level
+            fired = True
+        self.raw_actuations += raw_fired
+        self.actuations += fired
+        self.suppressed += raw_fired and not fired
+
+        self.gesture = self._gesture(dist)
+        return dist, self.volume, self.gesture
+
+    def stats(self):
+        return {"actuations": self.actuations, "raw_actuations": self.raw_actuations,
+                "suppressed": self.suppressed}
+
+    def _volume(self, dist):
+        level = int(((dist - self.min_dist) / (self.max_dist - self.min_dist)) * 100)
+        return max(0, min(level, 100))
+
+    def _gesture(self, dist):
+        low, high = self.pinch_range
+        band = self.gesture_band
+        current = self.gesture
+        # Widen the current gesture's range by the band so it sticks near a cut-off
+        if current == OPEN and dist > high - band:
+            return OPEN
+        if current == CLOSED and dist < low + band:
+            return CLOSED
+        if current == PINCH and low - band <= dist <= high + band:
+            return PINCH
+        if dist > high:
+            return OPEN
+        if dist >= low:
+            return PINCH
+        return CLOSED
@@ -0,0 +1,206 @@
+"""
+Cold-start benchmark for the Streamlit pages.
+
+For every page, a fresh interpreter measures:
+  - paint-blocking imports: module-level imports that run before the layout can render
+  - deferred imports: imports the page only does once processing starts
+  - model imports: the modules behind the model (mediapipe, and the engine for milestone4)
+    that the page scripts did not already pull in, timed apart so every page attributes them alike
+  - model init: building mp_hands.Hands (or the GestureEngine with the app's ENGINE_CONFIG for milestone4)
+  - first frame: opening the source, reading one frame and processing it
+
+    python startup_bench.py --source recording.mp4 --output startup.json
+    python startup_bench.py --source recording.mp4 --baseline startup.json   # exit 1 on regressions
+"""
+import argparse
+import ast
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PAGES = {
+    "frontpage": {"file": "frontpage.py", "model": None},
+    "milestone1": {"file": "milestone1_hand_detection.py", "model": "hands"},
+    "milestone2": {"file": "milestone2_gesture_distance.py", "model": "hands"},
+    "milestone3": {"file": "milestone3_graph.py", "model": "hands"},
+    "milestone4": {"file": "milestone4.py", "model": "engine"},
+}
+# Modules each model kind needs before it can be built; imported (and timed) ahead of model init
+MODEL_IMPORTS = {
+    "hands": ("cv2", "mediapipe", "capture"),
+    "engine": ("cv2", "mediapipe", "capture", "actuator", "app_settings", "engine"),
+}
+DEFAULT_TOLERANCE = 1.25  # a metric regresses when it is this many times slower than the baseline
+COMPARED_METRICS = ("paint_imports_ms", "deferred_imports_ms", "model_imports_ms", "model_init_ms", "first_frame_ms")
+
+
+# -------------------- Import Discovery --------------------
+def page_imports(path):
+    """
+    (paint_blocking, deferred) module names imported by a page script. Paint-blocking imports
+    are the module-level ones that run before the page's first Streamlit call.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    first_paint = min(
+        (stmt.lineno for stmt in tree.body if not isinstance(stmt, (ast.Import, ast.ImportFrom)) and _calls_st(stmt)),
+        default=float("inf"),
+    )
+    paint, deferred = [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        target = paint if node in tree.body and node.lineno < first_paint else deferred
+        for name in names:
+            if name not in paint and name not in target:
+                target.append(name)
+    return paint, deferred
+
+
+def _calls_st(stmt):
+    return any(
+        isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute)
+        and isinstance(n.func.value, ast.Name) and n.func.value.id == "st"
+        for n in ast.walk(stmt)
+    )
+
+
+def _time_imports(names):
+    timings = {}
+    for name in names:
+        t0 = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = (time.perf_counter() - t0) * 1000.0
+    return timings
+
+
+# -------------------- Child: measure one page --------------------
+def measure_page(page, source):
+    spec = PAGES[page]
+    paint, deferred = page_imports(os.path.join(ROOT, spec["file"]))
+    paint_times = _time_imports(paint)
+    deferred_times = _time_imports(deferred)
+    report = {
+        "page": page,
+        "paint_imports_ms": sum(paint_times.values()),
+        "deferred_imports_ms": sum(deferred_times.values()),
+        "imports": {"paint": paint_times, "deferred": deferred_times},
+        "model_imports_ms": None,
+        "model_init_ms": None,
+        "first_frame_ms": None,
+    }
+    if spec["model"] is None:
+        return report
+
+    # Modules the page already imported cost ~0 here, so nothing is counted twice
+    model_times = _time_imports(MODEL_IMPORTS[spec["model"]])
+    report["imports"]["model"] = model_times
+    report["model_imports_ms"] = sum(model_times.values())
+
+    import cv2
+
+    t0 = time.perf_counter()
+    if spec["model"] == "engine":
+        from actuator import MockBackend
+        from app_settings import ENGINE_CONFIG
+        from engine import GestureEngine
+        engine = GestureEngine(backend=MockBackend(), **ENGINE_CONFIG)
+        process = engine.process_frame
+    else:
+        import mediapipe as mp
+        hands = mp.solutions.hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+        process = lambda frame: hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    report["model_init_ms"] = (time.perf_counter() - t0) * 1000.0
+
+    from capture import open_capture
+    t0 = time.perf_counter()
+    cap = open_capture(source)
+    ret, frame = cap.read()
+    if ret:
+        process(frame)
+        report["first_frame_ms"] = (time.perf_counter() - t0) * 1000.0
+    cap.release()
+    return report
+
+
+# -------------------- Parent: one fresh interpreter per page --------------------
+def run_all(pages, source):
+    results = {}
+    for page in pages:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", page, "--source", source],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if out.returncode != 0:
+            results[page] = {"page": page, "error": out.stderr.strip().splitlines()[-1:] or ["failed"]}
+            continue
+        results[page] = json.loads(out.stdout.strip().splitlines()[-1])
+    return results
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for page, current in results.items():
+        previous = baseline.get("pages", {}).get(page)
+        if not previous:
+            continue
+        for key in COMPARED_METRICS:
+            now, before = current.get(key), previous.get(key)
+            if now is not None and before and now > before * tolerance:
+                regressions.append(f"{page}.{key}: {before:.0f} ms -> {now:.0f} ms")
+    return regressions
+
+
+def _fmt(ms):
+    return "      -" if ms is None else f"{ms:7.0f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the Streamlit pages")
+    parser.add_argument("--source", default="0", help="camera index, video file or frame directory")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--output", default=None, help="write JSON results to this file")
+    parser.add_argument("--baseline", default=None, help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        print(json.dumps(measure_page(args.child, args.source)))
+        return 0
+
+    results = run_all(args.pages, args.source)
+    print(f"{'page':<12} {'paint':>7} {'deferred':>8} {'mod-imp':>7} {'model':>7} {'frame':>7}  (ms)")
+    for page, r in results.items():
+        if "error" in r:
+            print(f"{page:<12} error: {r['error'][0]}")
+            continue
+        print(f"{page:<12} {_fmt(r['paint_imports_ms'])} {_fmt(r['deferred_imports_ms']):>8} "
+              f"{_fmt(r.get('model_imports_ms'))} {_fmt(r['model_init_ms'])} {_fmt(r['first_frame_ms'])}")
+
+    report = {"timestamp": time.time(), "source": args.source, "pages": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_hand(cx, cy, spread=0.05, pinch=0.1, seed=0):
+    """(21, 3) normalized landmarks around palm centre (cx, cy), thumb-index tips `pinch` apart."""
+    rng = np.random.default_rng(seed)
+    hand = np.zeros((21, 3), dtype=np.float32)
+    hand[:, :2] = (cx, cy) + rng.uniform(-spread, spread, (21, 2))
+    hand[4, :2] = (cx - pinch / 2, cy - 0.1)
+    hand[8, :2] = (cx + pinch / 2, cy - 0.1)
+    return hand
+
+
+def make_frame(*hands):
+    return np.stack(hands) if hands else np.empty((0, 21, 3), dtype=np.float32)
@@ -0,0 +1,57 @@
+import time
+
+from actuator import MockBackend, VolumeActuator
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_targets_coalesce_to_the_newest():
+    backend = MockBackend(absolute=True)
+    actuator = VolumeActuator(backend, min_interval=0.0)
+    actuator.drive(50)  # baseline only
+    for level in (60, 70, 80):
+        actuator.set_target(level)
+    assert actuator.stats()["coalesced"] == 2
+
+    actuator.start()
+    try:
+        assert wait_for(lambda: actuator.level == 80)
+    finally:
+        actuator.stop()
+    assert [c[:2] for c in backend.calls] == [("set", 80)]
+
+
+def test_first_target_only_sets_the_baseline_and_deadband_holds():
+    backend = MockBackend()
+    actuator = VolumeActuator(backend, min_interval=0.0)
+    actuator.drive(40)
+    actuator.drive(44)
+    assert backend.calls == []
+    assert actuator.level == 40
+
+
+def test_key_steps_are_rate_limited():
+    backend = MockBackend(step_pct=2)
+    actuator = VolumeActuator(backend, min_interval=0.02)
+    actuator.drive(0)
+    actuator.drive(20)
+    assert [c[0] for c in backend.calls] == ["volumeup"] * 10
+    gaps = [b[1] - a[1] for a, b in zip(backend.calls, backend.calls[1:])]
+    assert min(gaps) >= 0.02 * 0.95
+    assert actuator.level == 20
+
+
+def test_backend_calls_are_timed():
+    from perf_metrics import LatencyTracker
+    metrics = LatencyTracker()
+    actuator = VolumeActuator(MockBackend(absolute=True), min_interval=0.0, metrics=metrics)
+    actuator.drive(0)
+    actuator.drive(50)
+    assert metrics.summary()["stages"]["actuation_os"]["count"] == 1
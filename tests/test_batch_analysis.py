@@ -0,0 +1,26 @@
+import numpy as np
+
+from batch_analysis import COLUMNS, merge
+
+
+def segment(start, hand_ids):
+    n = len(hand_ids)
+    out = {name: np.full(n, -1, dtype=np.int32) for name in COLUMNS}
+    out["frame"][:] = np.arange(start, start + n)
+    out["hand_id"][:] = hand_ids
+    return start, out
+
+
+def test_merge_keeps_frame_order():
+    table = merge([segment(3, [0, 0]), segment(0, [0, -1, 1])])
+    assert list(table["frame"]) == [0, 1, 2, 3, 4]
+
+
+def test_merge_keeps_ids_unique_across_segments():
+    busy = list(range(150))  # more tracks in one segment than any fixed per-segment stride
+    parts = [segment(0, [0, -1, 1]), segment(3, busy), segment(153, [-1, -1]), segment(155, [0, 2])]
+    ids = merge(parts)["hand_id"]
+    assert list(ids[:3]) == [0, -1, 1]
+    assert list(ids[3:153]) == list(range(2, 152))
+    assert list(ids[153:155]) == [-1, -1]     # no hand: still unknown
+    assert list(ids[155:]) == [152, 154]      # after the largest ID so far
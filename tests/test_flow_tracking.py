@@ -0,0 +1,62 @@
+import types
+
+import numpy as np
+
+from conftest import make_hand
+from flow_tracking import FlowTrackedHands
+
+W, H = 320, 240
+
+
+class FakeDetector:
+    """One hand, always at the same place, with a confident handedness score."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, rgb):
+        self.calls += 1
+        points = [types.SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in make_hand(0.5, 0.5)]
+        handedness = types.SimpleNamespace(classification=[types.SimpleNamespace(score=0.99, label="Right")])
+        return types.SimpleNamespace(multi_hand_landmarks=[types.SimpleNamespace(landmark=points)],
+                                     multi_handedness=[handedness])
+
+    def close(self):
+        pass
+
+
+def frames(n):
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 256, (H, W, 3), dtype=np.uint8)  # something for the flow to lock onto
+    return [texture.copy() for _ in range(n)]
+
+
+def test_interval_one_detects_every_frame_without_gray_frames():
+    detector = FakeDetector()
+    flow = FlowTrackedHands(detector, interval=1)
+    for rgb in frames(5):
+        flow.process(rgb)
+    assert detector.calls == 5 and flow.tracked == 0
+    assert flow._prev_gray is None and flow._spare_gray is None  # never converted
+
+
+def test_longer_interval_tracks_between_detections():
+    detector = FakeDetector()
+    flow = FlowTrackedHands(detector, interval=3, max_interval=3)
+    for rgb in frames(6):
+        result = flow.process(rgb)
+        assert result.multi_hand_landmarks
+    assert detector.calls == 2 and flow.tracked == 4
+
+
+def test_interval_can_be_changed_from_outside():
+    detector = FakeDetector()
+    flow = FlowTrackedHands(detector, interval=1, max_interval=4)
+    stream = frames(6)
+    for rgb in stream[:2]:
+        flow.process(rgb)
+    flow.interval = 2  # what the governor does on a level change
+    flow.reset()
+    for rgb in stream[2:]:
+        flow.process(rgb)
+    assert detector.calls == 2 + 2 and flow.tracked == 2
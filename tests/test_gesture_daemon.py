@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+import pytest
+
+from gesture_daemon import run_daemon
+from perf_metrics import LatencyTracker
+from pipeline import FramePipeline
+
+
+class ListSink:
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, payload):
+        self.messages.extend(json.loads(line) for line in payload.splitlines())
+
+
+class FileSource:
+    """Stands in for a video file Capture: `frames` frames, then end of stream."""
+
+    kind = "file"
+
+    def __init__(self, frames):
+        self.left = frames
+
+    def read(self, image=None):
+        if self.left == 0:
+            return False, None
+        self.left -= 1
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+
+class PipelineEngine:
+    """The slice of GestureEngine that run_daemon uses, over a real FramePipeline."""
+
+    def __init__(self, source, outputs):
+        # Queues deep enough that no packet is dropped before run_daemon sees it
+        depth = max(1, len(outputs))
+        outputs = iter(outputs)
+        self.metrics = LatencyTracker()
+        self.pipeline = FramePipeline(source, lambda frame: next(outputs),
+                                      capture_queue_size=depth, result_queue_size=depth)
+
+    def resume(self):
+        self.pipeline.start()
+        return True
+
+    @property
+    def active(self):
+        return self.pipeline.running
+
+    @property
+    def error(self):
+        return self.pipeline.error
+
+    @property
+    def exhausted(self):
+        return self.pipeline.exhausted
+
+    def get(self, timeout=None):
+        return self.pipeline.get(timeout)
+
+    def release(self, packet):
+        pass
+
+
+def output(hand_id, volume=0, distance=0, gesture=None):
+    return {"hands": 0 if hand_id is None else 1, "hand_id": hand_id, "volume_level": volume,
+            "dist_val": distance, "gesture": gesture}
+
+
+def test_file_source_ends_cleanly_and_empty_frames_have_no_volume():
+    outputs = [output(None), output(0, 42, 95, "Open Hand"), output(None)]
+    engine = PipelineEngine(FileSource(len(outputs)), outputs)
+    sink = ListSink()
+    run_daemon(engine, [sink], state_hz=0)  # unthrottled
+    states = [m for m in sink.messages if m["type"] == "state"]
+    assert len(states) == len(outputs)
+    assert states[0]["volume"] is None and states[0]["distance"] is None
+    assert any(s["volume"] == 42 and s["distance"] == 95 for s in states)
+    assert states[-1]["volume"] is None
+
+
+def test_camera_failure_still_raises():
+    source = FileSource(0)
+    source.kind = "camera"
+    engine = PipelineEngine(source, [])
+    with pytest.raises(RuntimeError, match="Failed to capture frame"):
+        run_daemon(engine, [ListSink()])
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from gesture_train import load_dataset, split_holdout
+
+
+def write_recording(path, code, n):
+    landmarks = np.random.default_rng(n).random((n, 21, 3), dtype=np.float32)
+    np.savez_compressed(path, landmarks=landmarks, labels=np.full(n, code, dtype=np.int8))
+
+
+def test_holdout_keeps_recordings_whole(tmp_path):
+    for i, (code, n) in enumerate([(0, 30), (0, 25), (1, 40), (1, 20), (1, 35), (2, 50)]):
+        write_recording(tmp_path / f"rec{i}.npz", code, n)
+    landmarks, labels, groups = load_dataset([str(tmp_path)])
+    assert len(landmarks) == len(labels) == len(groups) == 200
+
+    train_idx, eval_idx = split_holdout(labels, groups, 0.2, seed=0)
+    assert len(train_idx) + len(eval_idx) == 200
+    assert not set(groups[train_idx]) & set(groups[eval_idx])
+    # One held-out recording each for the gestures recorded more than once; the single
+    # Closed Hand recording stays in training
+    held = np.unique(groups[eval_idx])
+    assert sorted(np.bincount(labels[groups == g]).argmax() for g in held) == [0, 1]
+
+
+def test_holdout_needs_a_second_recording(tmp_path):
+    write_recording(tmp_path / "open.npz", 0, 30)
+    write_recording(tmp_path / "pinch.npz", 1, 30)
+    _, labels, groups = load_dataset([str(tmp_path)])
+    with pytest.raises(SystemExit):
+        split_holdout(labels, groups, 0.2, seed=0)
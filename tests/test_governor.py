@@ -0,0 +1,76 @@
+from governor import LatencyGovernor
+
+TARGET = 30.0
+WINDOW = 10
+COOLDOWN = 2.0
+
+
+def governor(**kwargs):
+    return LatencyGovernor(TARGET, window=WINDOW, cooldown_s=COOLDOWN, **kwargs)
+
+
+def feed(gov, frame_ms, t, windows=1, dt=0.1):
+    """`windows` full windows of `frame_ms` frames, `dt` seconds apart; returns (changes, next t)."""
+    changed = []
+    for _ in range(windows * WINDOW):
+        changed.append(gov.observe(frame_ms, t))
+        t += dt
+    return sum(changed), t
+
+
+def test_steps_down_after_sustained_breach():
+    gov = governor()
+    changes, t = feed(gov, 45.0, 0.0)
+    assert changes == 1 and gov.level == 1
+    assert gov.level_ms[0] == 45.0
+
+
+def test_single_slow_frame_does_not_step_down():
+    gov = governor()
+    for i in range(WINDOW):
+        assert not gov.observe(80.0 if i == 3 else 20.0, i * 0.1)  # p90 stays under the target
+    assert gov.level == 0
+
+
+def test_no_oscillation_inside_the_hysteresis_band():
+    gov = governor()
+    _, t = feed(gov, 45.0, 0.0)
+    assert gov.level == 1
+    # Between UPGRADE_MARGIN x target and the target: hold the point, window after window
+    changes, t = feed(gov, 0.8 * TARGET, t + COOLDOWN, windows=20)
+    assert changes == 0 and gov.level == 1
+
+
+def test_cooldown_is_respected():
+    gov = governor()
+    _, t = feed(gov, 45.0, 0.0)
+    assert gov.level == 1
+    # Still too slow, but the next windows end inside the cooldown: no judgement yet
+    changes, t = feed(gov, 45.0, t, windows=1, dt=COOLDOWN / (2 * WINDOW))
+    assert changes == 0 and gov.level == 1
+    changes, t = feed(gov, 45.0, t + COOLDOWN)
+    assert changes == 1 and gov.level == 2
+
+
+def test_steps_back_up_once_headroom_returns():
+    gov = governor(retry_s=5.0)
+    _, t = feed(gov, 45.0, 0.0)
+    assert gov.level == 1
+    # Headroom right away: level 0 missed the SLO within retry_s, so stay put
+    changes, t = feed(gov, 10.0, t + COOLDOWN)
+    assert changes == 0 and gov.level == 1
+    # Once the miss at level 0 is older than retry_s it is tried again
+    changes, t = feed(gov, 10.0, t + 5.0)
+    assert changes == 1 and gov.level == 0
+    assert gov.changes == 2
+
+
+def test_never_leaves_the_point_table():
+    gov = governor()
+    t = 0.0
+    for _ in range(2 * len(gov.points)):
+        _, t = feed(gov, 100.0, t + COOLDOWN)
+    assert gov.level == len(gov.points) - 1
+    for _ in range(2 * len(gov.points)):
+        _, t = feed(gov, 1.0, t + gov.retry_s)
+    assert gov.level == 0
@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import make_frame, make_hand
+from hand_tracker import MAX_MISSED, HandTracker
+from smoothing import DistanceSmoother, make_filter
+
+
+def tracker(policy="first"):
+    return HandTracker(lambda: DistanceSmoother(make_filter("none")), policy=policy)
+
+
+def test_ids_follow_hands_not_detection_order():
+    t = tracker()
+    a, b = make_hand(0.2, 0.5, seed=1), make_hand(0.8, 0.5, seed=2)
+    first = t.update(make_frame(a, b))
+    ids = {round(float(tr.anchor[0]), 1): tr.id for tr in first}
+
+    moved_a, moved_b = make_hand(0.23, 0.52, seed=1), make_hand(0.77, 0.49, seed=2)
+    second = t.update(make_frame(moved_b, moved_a))  # MediaPipe reordered the hands
+    assert second[0].id == ids[0.8]
+    assert second[1].id == ids[0.2]
+    assert t.next_id == 2
+
+
+def test_control_is_sticky_and_survives_short_dropouts():
+    t = tracker()
+    a, b = make_hand(0.2, 0.5, seed=1), make_hand(0.8, 0.5, seed=2)
+    t.update(make_frame(a, b))
+    controller = t.controller.id
+    for _ in range(MAX_MISSED):
+        t.update(make_frame(b))  # hand a out of view for a few frames
+    assert t.controller.id != controller
+    t.update(make_frame(a, b))
+    assert {tr.id for tr in t.tracks} == {0, 1}  # a kept its ID
+    assert t.switches == 1  # control went to b once and stayed there
+
+
+def test_dropped_track_gets_a_new_id():
+    t = tracker()
+    t.update(make_frame(make_hand(0.5, 0.5)))
+    for _ in range(MAX_MISSED + 1):
+        t.update(make_frame())
+    assert t.tracks == []
+    assert t.update(make_frame(make_hand(0.5, 0.5)))[0].id == 1
+
+
+def test_right_policy_prefers_the_right_hand():
+    import numpy as np
+    t = tracker("right")
+    left, right = make_hand(0.2, 0.5, seed=1), make_hand(0.8, 0.5, seed=2)
+    t.update(make_frame(left), np.array([0], dtype=np.int8))
+    t.update(make_frame(left, right), np.array([0, 1], dtype=np.int8))
+    assert t.controller.handedness == 1
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        tracker("nearest")
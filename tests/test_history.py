@@ -0,0 +1,82 @@
+import numpy as np
+
+from history import ChartFeed, RingHistory, lttb
+
+
+class FakeChart:
+    """Records what a Streamlit chart element would be sent."""
+
+    def __init__(self, rows=None):
+        self.rows = [] if rows is None else [rows]
+        self.children = []
+
+    def add_rows(self, frame):
+        self.rows.append(frame)
+
+    def line_chart(self, frame):
+        child = FakeChart(frame)
+        self.children.append(child)
+        return child
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.float64), rng.normal(size=n).cumsum()
+
+
+def test_lttb_keeps_the_first_and_last_points():
+    x, y = series(1000)
+    keep = lttb(x, y, 50)
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_returns_exactly_the_target_count():
+    x, y = series(1000)
+    for n_out in (3, 10, 97, 500, 999):
+        assert len(lttb(x, y, n_out)) == n_out
+
+
+def test_lttb_keeps_extremes():
+    x, y = series(1000, seed=1)
+    y[333], y[666] = 100.0, -100.0  # a spike and a dip, far outside the walk
+    keep = lttb(x, y, 40)
+    assert 333 in keep and 666 in keep
+
+
+def test_lttb_passes_short_inputs_through():
+    x, y = series(20)
+    assert np.array_equal(lttb(x, y, 20), np.arange(20))
+    assert np.array_equal(lttb(x, y, 50), np.arange(20))
+    assert len(lttb(x[:0], y[:0], 10)) == 0
+
+
+def test_chart_feed_only_appends_new_rows():
+    history = RingHistory(("distance", "volume"), capacity=1000)
+    chart = FakeChart()
+    feed = ChartFeed(chart, history, max_points=100)
+    for i in range(30):
+        history.append(float(i), i, i)
+    assert feed.push() == 30
+    assert feed.push() == 0  # nothing new, nothing sent
+    for i in range(30, 45):
+        history.append(float(i), i, i)
+    assert feed.push() == 15
+    assert [len(f) for f in chart.rows] == [30, 15]
+    assert list(chart.rows[1]["volume"]) == list(range(30, 45))
+    assert feed.redraws == 0 and not chart.children
+
+
+def test_chart_feed_redraws_once_the_chart_is_full():
+    history = RingHistory(("distance", "volume"), capacity=1000)
+    chart = FakeChart()
+    feed = ChartFeed(chart, history, max_points=10)
+    for i in range(25):
+        history.append(float(i), i, i)
+    feed.push()
+    assert feed.redraws == 1 and len(chart.children[0].rows[0]) == 10
+    assert feed.stride == 2
+    for i in range(25, 29):
+        history.append(float(i), i, i)
+    assert feed.push() == 2  # two complete buckets of two samples, appended to the new chart
+    assert len(chart.children[0].rows) == 2 and not chart.rows
@@ -0,0 +1,75 @@
+import numpy as np
+
+from conftest import make_frame, make_hand
+from gesture_core import hand_metrics
+from hand_tracker import HandTracker
+from landmark_trace import TraceReader, TraceWriter, replay
+from smoothing import DistanceSmoother, make_filter
+
+W, H = 640, 480
+
+
+def tracker():
+    return HandTracker(lambda: DistanceSmoother(make_filter("one_euro")))
+
+
+def session(n=23):
+    """Frames with 0, 1 and 2 hands and a pinch that opens and closes."""
+    frames = []
+    for i in range(n):
+        pinch = 0.05 + 0.25 * abs(np.sin(i / 4))
+        hands = [make_hand(0.3, 0.5, pinch=pinch, seed=1)]
+        if i % 5 == 0:
+            hands = []
+        elif i % 3 == 0:
+            hands.append(make_hand(0.75, 0.5, pinch=0.2, seed=2))
+        frames.append((i / 30.0, make_frame(*hands)))
+    return frames
+
+
+def test_trace_round_trip_and_replay(tmp_path):
+    live = tracker()
+    volumes, gestures = [], []
+    # A chunk smaller than the session exercises appends across several flushes
+    with TraceWriter(str(tmp_path), W, H, chunk_frames=4, smoothing_filter="one_euro") as writer:
+        for t, landmarks in session():
+            handedness = np.full(len(landmarks), 1, dtype=np.int8)
+            tracks = live.update(landmarks, handedness)
+            for track, raw in zip(tracks, hand_metrics(landmarks, W, H).distance):
+                track.update(raw, t)
+            control = live.controller
+            volume = -1 if control is None else control.volume
+            gesture = -1 if control is None else control.gesture
+            writer.record(t, landmarks, handedness, None, volume, gesture,
+                          0.0 if control is None else control.distance)
+            volumes.append(volume)
+            gestures.append(gesture)
+
+    reader = TraceReader(str(tmp_path))
+    assert len(reader) == len(volumes)
+    assert reader.meta["settings"] == {"smoothing_filter": "one_euro"}
+    for i, (t, landmarks) in enumerate(session()):
+        frame = reader.frame(i)
+        assert frame["t"] == t
+        np.testing.assert_array_equal(frame["landmarks"], landmarks)
+    np.testing.assert_array_equal(reader["frames_volume"], volumes)
+
+    volume, gesture = replay(reader, tracker(), chunk=7)
+    np.testing.assert_array_equal(volume, volumes)
+    np.testing.assert_array_equal(gesture, gestures)
+
+
+def test_recorded_frames_are_readable_before_close(tmp_path):
+    writer = TraceWriter(str(tmp_path / "timer"), W, H, flush_interval=1e-9)
+    for t, landmarks in session(5):
+        writer.record(t, landmarks)
+    assert len(TraceReader(str(tmp_path / "timer"))) == 5  # written on the timer, no close() yet
+    writer.close()
+
+    writer = TraceWriter(str(tmp_path / "pause"), W, H, flush_interval=0)
+    for t, landmarks in session(5):
+        writer.record(t, landmarks)
+    assert len(TraceReader(str(tmp_path / "pause"))) == 0
+    writer.flush()  # what GestureEngine.pause() does
+    assert len(TraceReader(str(tmp_path / "pause"))) == 5
+    writer.close()
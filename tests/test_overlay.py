@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from conftest import make_frame, make_hand
+from gesture_core import hand_metrics
+from overlay import DEFAULT_STYLE, TIP_COLORS, draw_overlay
+
+W, H = 320, 240
+HIGHLIGHT = DEFAULT_STYLE._replace(thumb=(255, 0, 0), index=(0, 255, 0), pinch_line=(0, 0, 255))
+
+
+@pytest.mark.parametrize("level", ["fingertips", "full"])
+@pytest.mark.parametrize("hands", [1, 2])
+def test_draws_every_hand_with_tip_highlight(level, hands):
+    landmarks = make_frame(*[make_hand(0.25 + 0.5 * i, 0.5, seed=i) for i in range(hands)])
+    points = hand_metrics(landmarks, W, H).points
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    assert draw_overlay(frame, points, level, HIGHLIGHT) is frame
+    for hand in points:
+        for x, y in hand[[4, 8]]:  # thumb and index tips
+            assert frame[y, x].any()
+
+
+def test_strided_points_are_accepted():
+    landmarks = make_frame(make_hand(0.25, 0.5, seed=1), make_hand(0.75, 0.5, seed=2))
+    points = hand_metrics(landmarks, W, H).points
+    wide = np.zeros(points.shape[:2] + (3,), dtype=np.int32)
+    wide[..., :2] = points
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    draw_overlay(frame, wide[::-1], "full", HIGHLIGHT)
+    assert frame.any()
+
+
+def test_no_hands_leaves_the_frame_untouched():
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    draw_overlay(frame, np.empty((0, 21, 2), dtype=np.int32), "full", HIGHLIGHT)
+    assert not frame.any()
+
+
+def test_default_style_fingertips_falls_back_to_tip_colors():
+    landmarks = make_frame(make_hand(0.25, 0.5, seed=1), make_hand(0.75, 0.5, seed=2))
+    points = hand_metrics(landmarks, W, H).points
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    draw_overlay(frame, points, "fingertips", DEFAULT_STYLE)
+    for hand in points:
+        assert tuple(frame[hand[4][1], hand[4][0]]) == TIP_COLORS[0]
+        assert tuple(frame[hand[8][1], hand[8][0]]) == TIP_COLORS[1]
+
+
+def test_default_style_full_keeps_the_plain_skeleton():
+    points = hand_metrics(make_frame(make_hand(0.5, 0.5, seed=1)), W, H).points
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    draw_overlay(frame, points, "full", DEFAULT_STYLE)
+    colors = {tuple(c) for c in frame.reshape(-1, 3)}
+    assert TIP_COLORS[0] not in colors and TIP_COLORS[1] not in colors
+    assert frame.any()
@@ -0,0 +1,105 @@
+from pipeline import LatestQueue
+
+
+def test_latest_queue_drops_oldest():
+    dropped = []
+    queue = LatestQueue("test", maxsize=2, on_drop=dropped.append)
+    for item in (1, 2, 3, 4):
+        queue.put(item)
+    assert dropped == [1, 2]
+    assert queue.stats() == {"depth": 2, "dropped": 2, "passed": 4}
+    assert queue.get(timeout=0) == 3
+    assert queue.get(timeout=0) == 4
+    assert queue.get(timeout=0) is None
+
+
+def test_closed_queue_drains_then_reports_closed():
+    dropped = []
+    queue = LatestQueue("test", maxsize=1, on_drop=dropped.append)
+    queue.put("a")
+    queue.close()
+    queue.put("b")  # rejected, but still handed back for recycling
+    assert dropped == ["b"]
+    assert not queue.closed
+    assert queue.get(timeout=0) == "a"
+    assert queue.closed
+
+
+def test_clear_recycles_queued_items():
+    dropped = []
+    queue = LatestQueue("test", maxsize=2, on_drop=dropped.append)
+    queue.put(1)
+    queue.put(2)
+    queue.clear()
+    assert dropped == [1, 2]
+    assert queue.get(timeout=0) is None
+
+
+def test_pause_drops_queued_frames():
+    import threading
+
+    import numpy as np
+
+    from pipeline import FramePipeline
+
+    class Source:
+        def read(self, image=None):
+            return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    started = threading.Event()
+    release = threading.Event()
+    processed = []
+
+    def process(frame):
+        started.set()
+        release.wait(2.0)
+        processed.append(frame)
+        return {}
+
+    released = []
+    pipeline = FramePipeline(Source(), process, release=released.append).start()
+    try:
+        assert started.wait(2.0)
+        pipeline.pause()  # one frame in process(), one or none waiting in the capture queue
+        release.set()
+        assert pipeline.get(timeout=0.2) is None
+        assert len(processed) == 1
+        assert len(released) == 1  # the in-flight frame finished after pause and was released
+    finally:
+        release.set()
+        pipeline.stop()
+
+
+def test_packet_finished_after_pause_is_dropped_without_release():
+    import threading
+
+    import numpy as np
+
+    from pipeline import FramePipeline
+
+    class Source:
+        def read(self, image=None):
+            return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def process(frame):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            started.set()
+            release.wait(2.0)
+        return {"call": calls[-1]}
+
+    pipeline = FramePipeline(Source(), process).start()  # no release callback
+    try:
+        assert started.wait(2.0)
+        pipeline.pause()
+        pipeline.resume()  # paused and resumed while the first frame was in process()
+        release.set()
+        packet = pipeline.get(timeout=1.0)
+        assert packet is not None and packet.output["call"] > 0  # the stale first frame never shows up
+    finally:
+        release.set()
+        pipeline.stop()
@@ -0,0 +1,88 @@
+import types
+
+import numpy as np
+import pytest
+
+from conftest import make_hand
+from roi_inference import RoiHands
+
+W, H = 640, 480
+
+
+class FakeHands:
+    """Stands in for mp_hands.Hands: reports one hand at a fixed full-frame position, in the
+    coordinates of whatever image it is given, and records the shape of every image."""
+
+    def __init__(self, scene):
+        self.scene = scene      # callable -> (21, 3) full-frame normalized landmarks, or None
+        self.origin = (0, 0)    # where the image given to process() sits in the full frame
+        self.shapes = []
+
+    def process(self, image):
+        self.shapes.append(image.shape[:2])
+        hand = self.scene()
+        if hand is None:
+            return types.SimpleNamespace(multi_hand_landmarks=None)
+        h, w = image.shape[:2]
+        ox, oy = self.origin
+        points = [types.SimpleNamespace(x=(x * W - ox) / w, y=(y * H - oy) / h, z=z) for x, y, z in hand]
+        return types.SimpleNamespace(multi_hand_landmarks=[types.SimpleNamespace(landmark=points)])
+
+    def close(self):
+        pass
+
+
+def test_full_mode_never_crops():
+    hands = FakeHands(lambda: make_hand(0.5, 0.5))
+    roi = RoiHands(hands, mode="full")
+    for _ in range(3):
+        roi.process(np.zeros((H, W, 3), dtype=np.uint8))
+    assert hands.shapes == [(H, W)] * 3
+    assert roi.box is None
+
+
+def test_roi_needs_a_crop_model():
+    with pytest.raises(ValueError):
+        RoiHands(FakeHands(lambda: None), mode="roi")
+
+
+def test_crop_box_is_sticky_and_landmarks_map_back():
+    position = {"cx": 0.5}
+    scene = lambda: make_hand(position["cx"], 0.5, spread=0.03, seed=3)
+    full, crop = FakeHands(scene), FakeHands(scene)
+    roi = RoiHands(full, mode="roi", crop_hands=crop)
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+
+    roi.process(frame)  # first frame: full-frame detection sets the box
+    box = roi.box
+    assert box is not None and roi.moves == 1
+    for cx in (0.5, 0.505, 0.51, 0.505):  # small moves stay inside the crop
+        position["cx"] = cx
+        crop.origin = roi.box[:2]
+        result = roi.process(frame)
+        assert roi.box == box
+    assert roi.moves == 1
+    assert roi.roi_frames == 4 and roi.full_frames == 1
+    assert len(set(crop.shapes)) == 1  # the crop model saw one stable image geometry
+
+    # Landmarks come back normalized to the full frame
+    lm = result.multi_hand_landmarks[0].landmark
+    np.testing.assert_allclose([(p.x, p.y) for p in lm], scene()[:, :2], atol=1e-5)
+
+    position["cx"] = 0.8  # the hand leaves the crop's inner area: the box follows
+    crop.origin = roi.box[:2]
+    roi.process(frame)
+    assert roi.box != box and roi.moves == 2
+
+
+def test_lost_hand_falls_back_to_full_frame():
+    visible = {"on": True}
+    scene = lambda: make_hand(0.5, 0.5, spread=0.03) if visible["on"] else None
+    full, crop = FakeHands(scene), FakeHands(scene)
+    roi = RoiHands(full, mode="roi", crop_hands=crop)
+    frame = np.zeros((H, W, 3), dtype=np.uint8)
+    roi.process(frame)
+    visible["on"] = False
+    crop.origin = roi.box[:2]
+    roi.process(frame)
+    assert roi.fallbacks == 1 and roi.box is None and roi.full_frames == 2
@@ -0,0 +1,41 @@
+from gesture_core import CLOSED, OPEN, PINCH
+from smoothing import DistanceSmoother, make_filter
+
+
+def smoother(**kwargs):
+    return DistanceSmoother(make_filter("none"), volume_band=5, gesture_band=5.0, pinch_range=(20, 80), **kwargs)
+
+
+def test_volume_only_moves_past_the_band():
+    s = smoother()
+    _, volume, _ = s.update(110, 0.0)   # (110 - 20) / 180 -> 50 %
+    assert volume == 50
+    assert s.update(115, 0.1)[1] == 50  # 52 %: inside the band
+    assert s.update(101, 0.2)[1] == 50  # 45 %: inside the band
+    assert s.update(130, 0.3)[1] == 61  # 61 %: past it, committed
+    assert s.actuations == 1
+
+
+def test_gesture_sticks_near_cut_offs():
+    s = smoother()
+    assert s.update(70, 0.0)[2] == PINCH
+    assert s.update(84, 0.1)[2] == PINCH   # above 80 but within the band
+    assert s.update(90, 0.2)[2] == OPEN
+    assert s.update(77, 0.3)[2] == OPEN    # below 80 but within the band
+    assert s.update(70, 0.4)[2] == PINCH
+    assert s.update(17, 0.5)[2] == PINCH   # below 20 but within the band
+    assert s.update(10, 0.6)[2] == CLOSED
+    assert s.update(23, 0.7)[2] == CLOSED
+
+
+def test_suppressed_counts_raw_jitter():
+    s = smoother()
+    for i, d in enumerate((110, 122, 110, 122, 110)):  # level alternates 50 % / 56 %
+        s.update(d, i * 0.1)
+    assert s.raw_actuations == 4
+    assert s.actuations == 4
+    s2 = DistanceSmoother(make_filter("none"), volume_band=10, pinch_range=(20, 80))
+    for i, d in enumerate((110, 122, 110, 122, 110)):
+        s2.update(d, i * 0.1)
+    assert s2.actuations == 0
+    assert s2.suppressed == 4
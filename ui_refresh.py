@@ -0,0 +1,44 @@
+import time
+
+_MISSING = object()
+
+
+# -------------------- Refresh Rate Limiter --------------------
+class RateLimiter:
+    """ready() is True at most `rate_hz` times per second (always True when rate_hz is 0/None)."""
+
+    def __init__(self, rate_hz):
+        self.interval = 1.0 / rate_hz if rate_hz else 0.0
+        self._next = 0.0
+
+    def ready(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if now < self._next:
+            return False
+        self._next = now + self.interval
+        return True
+
+
+# -------------------- Change-Driven Widget Updates --------------------
+class ChangeDrivenUI:
+    """Calls a widget's render function only when the value it would display has changed."""
+
+    def __init__(self):
+        self._last = {}
+        self.pushes = 0
+        self.skipped = 0
+
+    def update(self, key, value, render):
+        if self._last.get(key, _MISSING) == value:
+            self.skipped += 1
+            return False
+        render(value)
+        self._last[key] = value
+        self.pushes += 1
+        return True
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._last.clear()
+        else:
+            self._last.pop(key, None)